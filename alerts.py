@@ -0,0 +1,309 @@
+"""
+쉴드 해제 알림 스케줄러
+
+파싱된 만료 시각을 힙에 넣어두고 "해제 N분 전" 알림을 정해진 시각에 발송.
+  - 새 덤프가 오면 바뀐 커맨더만 힙에 다시 넣음 (O(log n)), 이전 항목은 버전으로 무효 처리
+  - 매 틱마다 전체를 훑지 않고 힙 맨 앞만 확인
+  - 알림은 싱크(stdout / 파일 / 웹훅)로 보냄
+
+사용 예:
+    python alerts.py --watch ./new.txt --rule 10 --rule 30:hq>=30 --sink stdout --sink file:alerts.log
+"""
+import heapq
+import json
+import os
+import sys
+import time
+
+from main import BASE_TZ, TEXT_FILE, _same_shield, parse_base_time, parse_txt_lines
+
+########################################
+# 설정값
+########################################
+
+DEFAULT_RULES = ["10"]  # 해제 10분 전 알림
+POLL_SEC = 5  # 덤프 파일 변경 확인 주기
+
+
+########################################
+# 규칙
+########################################
+
+def parse_rule(spec):
+    """
+    "10"               -> 해제 10분 전, 전체
+    "10:hq>=30"        -> HQ 30 이상만
+    "30:hq>=29:RlRS"   -> HQ 29 이상 + 연맹 RlRS 만
+    return: {"spec", "lead_sec", "min_hq", "alliance"}
+    """
+    parts = spec.split(":")
+    rule = {"spec": spec, "lead_sec": int(parts[0]) * 60, "min_hq": None, "alliance": None}
+    for part in parts[1:]:
+        if part.startswith("hq>="):
+            rule["min_hq"] = int(part[4:])
+        elif part:
+            rule["alliance"] = part
+    return rule
+
+
+def rule_matches(rule, row):
+    if rule["min_hq"] is not None and (row.get("hq") or 0) < rule["min_hq"]:
+        return False
+    if rule["alliance"] is not None and row.get("alliance") != rule["alliance"]:
+        return False
+    return True
+
+
+def format_alert(rule, row):
+    lead_min = rule["lead_sec"] // 60
+    hq = f"HQ{row['hq']} " if row.get("hq") else ""
+    return f"{hq}{row['name']} [{row.get('alliance', '')}] ({row['x']}, {row['y']}) 쉴드 {lead_min}분 후 해제"
+
+
+########################################
+# 싱크
+########################################
+
+class StdoutSink:
+    def send(self, alert):
+        print(f"[알림] {alert['message']}", flush=True)
+
+
+class FileSink:
+    """알림을 JSON 한 줄씩 파일에 추가"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, alert):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(alert, ensure_ascii=False) + "\n")
+
+
+class WebhookSink:
+    """알림 JSON 을 URL 로 POST (로컬 웹훅 대용 서버 등). 실패해도 스케줄러는 계속 돎"""
+
+    def __init__(self, url, timeout=3):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, alert):
+        import urllib.request
+
+        req = urllib.request.Request(
+            self.url,
+            data=json.dumps(alert, ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as res:
+                res.read()
+        except OSError as e:
+            print(f"웹훅 전송 실패: {self.url}: {e}", file=sys.stderr)
+
+
+def parse_sink(spec):
+    """"stdout" / "file:경로" / "webhook:URL" -> 싱크 객체"""
+    kind, _, arg = spec.partition(":")
+    if kind == "stdout":
+        return StdoutSink()
+    if kind == "file":
+        return FileSink(arg)
+    if kind == "webhook":
+        return WebhookSink(arg)
+    raise ValueError(f"알 수 없는 싱크: {spec}")
+
+
+########################################
+# 스케줄러
+########################################
+
+class AlertScheduler:
+    """
+    힙 항목: (발송 시각, 순번, 커맨더 키, 규칙 번호, 버전)
+    커맨더마다 현재 버전을 들고 있고, 만료 시각이 바뀌면 버전을 올려 이전 항목을 무효화(지연 삭제)
+    커맨더 키는 식별 인덱스의 안정 ID (개명해도 같은 키). 만료 시각 비교는 델타와 같은 허용 오차
+    (기준 시각이 파일 수정 시각이라 같은 내용을 다시 덤프해도 몇 초씩 밀림)
+    이미 보낸 (키, 규칙) 은 그 만료 시각과 함께 기억해서, 같은 쉴드의 지난 알림을 다시 넣지 않음
+    """
+
+    def __init__(self, rules, sinks):
+        self.rules = rules
+        self.sinks = sinks
+        self.heap = []
+        self.rows = {}  # 키 -> row
+        self.versions = {}  # 키 -> 버전
+        self.fired = {}  # (키, 규칙 번호) -> 보낼 때의 만료 시각
+        self._seq = 0
+
+    @staticmethod
+    def key_of(row):
+        return row.get("id", row["name"])
+
+    def _schedule(self, key, row, now_ts):
+        version = self.versions.get(key, 0) + 1
+        self.versions[key] = version
+        expire_ts = row["expire_ts"]
+        if expire_ts is None or expire_ts <= now_ts:
+            return
+        for rule_idx, rule in enumerate(self.rules):
+            if not rule_matches(rule, row):
+                continue
+            fire_ts = expire_ts - rule["lead_sec"]
+            sent_for = self.fired.get((key, rule_idx))
+            if fire_ts <= now_ts and sent_for is not None and _same_shield(sent_for, expire_ts):
+                continue  # 이 쉴드의 알림은 이미 보냄
+            self._seq += 1
+            heapq.heappush(self.heap, (fire_ts, self._seq, key, rule_idx, version))
+
+    def update(self, rows, now_ts):
+        """
+        새 덤프 반영. 만료 시각이 (허용 오차 안에서) 그대로인 커맨더는 건드리지 않음.
+        return: 다시 스케줄한 커맨더 수
+        """
+        # 이미 만료된 쉴드의 발송 기록은 더 쓸 일이 없음
+        self.fired = {pair: ts for pair, ts in self.fired.items() if ts > now_ts}
+        changed = 0
+        seen = set()
+        for row in rows:
+            key = self.key_of(row)
+            seen.add(key)
+            old = self.rows.get(key)
+            self.rows[key] = row
+            if old is not None and _same_shield(old["expire_ts"], row["expire_ts"]):
+                continue
+            self._schedule(key, row, now_ts)
+            changed += 1
+        # 덤프에서 빠진 커맨더는 버전만 올려 남은 알림을 무효화
+        for key in [k for k in self.rows if k not in seen]:
+            del self.rows[key]
+            self.versions[key] = self.versions.get(key, 0) + 1
+            changed += 1
+        return changed
+
+    def next_fire_ts(self):
+        """다음 유효 알림 시각 (없으면 None). 무효 항목은 여기서 버림"""
+        heap = self.heap
+        while heap:
+            fire_ts, _, key, _, version = heap[0]
+            if self.versions.get(key) == version:
+                return fire_ts
+            heapq.heappop(heap)
+        return None
+
+    def fire_due(self, now_ts):
+        """now_ts 까지 도래한 알림을 모두 발송. return: 발송한 알림 리스트"""
+        fired = []
+        heap = self.heap
+        while heap and heap[0][0] <= now_ts:
+            fire_ts, _, key, rule_idx, version = heapq.heappop(heap)
+            if self.versions.get(key) != version:
+                continue
+            row = self.rows[key]
+            rule = self.rules[rule_idx]
+            alert = {
+                "rule": rule["spec"],
+                "name": row["name"],
+                "alliance": row.get("alliance"),
+                "hq": row.get("hq"),
+                "x": row["x"],
+                "y": row["y"],
+                "expire_ts": row["expire_ts"],
+                "fire_ts": int(fire_ts),
+                "message": format_alert(rule, row),
+            }
+            for sink in self.sinks:
+                sink.send(alert)
+            self.fired[(key, rule_idx)] = row["expire_ts"]
+            fired.append(alert)
+        return fired
+
+
+def build_schedule(rows, rules, now_ts):
+    """
+    rows 의 앞으로 올 알림 전체를 발송 시각 순으로 (보내지 않고 목록만)
+    return: fire_due 의 알림 dict 리스트
+    """
+    scheduler = AlertScheduler(rules, [])
+    scheduler.update(rows, now_ts)
+    return scheduler.fire_due(float("inf"))
+
+
+########################################
+# 덤프 감시 루프
+########################################
+
+def load_dump(path, base_time=None, tz=BASE_TZ, identity=None):
+    """
+    덤프 파일 -> rows. base_time 이 없으면 파일 수정 시각을 기준 시각으로 씀
+    (남은시간은 붙여넣은 시점 기준이므로)
+    identity: identity.IdentityIndex 를 주면 rows 에 안정 ID 를 붙임 (덤프 사이에 같은 인덱스를 계속 씀)
+    """
+    if base_time is None:
+        from datetime import datetime, timezone
+        base = datetime.fromtimestamp(int(os.path.getmtime(path)), timezone.utc)
+    else:
+        base = parse_base_time(base_time, tz)
+    with open(path, "r", encoding="utf-8") as f:
+        rows = parse_txt_lines(f, base)
+    if identity is not None:
+        identity.resolve(rows, int(base.timestamp()))
+    return rows
+
+
+def watch(path, scheduler, base_time=None, tz=BASE_TZ, poll_sec=POLL_SEC, now=time.time, sleep=time.sleep,
+          max_wait=None):
+    """
+    덤프 파일이 바뀔 때마다 스케줄러 갱신, 알림 시각이 되면 발송.
+    다음 알림 시각과 다음 파일 확인 시각 중 이른 쪽까지 잠듦.
+    max_wait: 이 시간(초)이 지나면 종료 (None 이면 계속)
+    """
+    from identity import IdentityIndex
+
+    identity = IdentityIndex()
+    started = now()
+    last_mtime = None
+    while max_wait is None or now() - started < max_wait:
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        if mtime is not None and mtime != last_mtime:
+            last_mtime = mtime
+            rows = load_dump(path, base_time, tz, identity)
+            changed = scheduler.update(rows, now())
+            print(f"덤프 반영: {path} ({len(rows)}명, 변경 {changed})", file=sys.stderr)
+
+        scheduler.fire_due(now())
+
+        wake = now() + poll_sec
+        next_fire = scheduler.next_fire_ts()
+        if next_fire is not None and next_fire < wake:
+            wake = next_fire
+        sleep(max(0.0, wake - now()))
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="쉴드 해제 알림 스케줄러")
+    parser.add_argument("--watch", default=TEXT_FILE, help="감시할 덤프 txt (기본: %(default)s)")
+    parser.add_argument("--rule", action="append", help="알림 규칙 '분[:hq>=N][:연맹]' (여러 번 가능, 기본: 10)")
+    parser.add_argument("--sink", action="append", help="stdout / file:경로 / webhook:URL (여러 번 가능, 기본: stdout)")
+    parser.add_argument("-t", "--base-time", default=None, help="덤프 기준 시각 (기본: 파일 수정 시각)")
+    parser.add_argument("--tz", default=BASE_TZ, help="기준 시각의 시간대 (기본: %(default)s)")
+    parser.add_argument("--poll", type=float, default=POLL_SEC, help="파일 확인 주기, 초 (기본: %(default)s)")
+    args = parser.parse_args(argv)
+
+    rules = [parse_rule(spec) for spec in (args.rule or DEFAULT_RULES)]
+    sinks = [parse_sink(spec) for spec in (args.sink or ["stdout"])]
+    scheduler = AlertScheduler(rules, sinks)
+    try:
+        watch(args.watch, scheduler, args.base_time, args.tz, args.poll)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
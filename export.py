@@ -0,0 +1,228 @@
+"""
+파싱 결과 내보내기 (CSV / NDJSON / Parquet / Arrow)
+
+HTML 을 다시 긁지 않고 분석용 데이터로 받기 위한 스트리밍 내보내기.
+  - 토크나이저 레코드를 한 줄씩 받아 타입이 정해진 열로 바꿈
+  - EXPORT_BATCH_ROWS 개씩 모아서 쓰고 버림 -> 덤프가 아무리 커도 메모리는 배치 하나 분량
+  - Parquet / Arrow 는 pyarrow 가 있을 때만
+
+열: name(str), alliance(str), hq(int, 없으면 null), x(int), y(int),
+    expire_ts(int, UTC epoch 초, 만료면 null), status("active" / "critical" / "expired")
+
+사용 예:
+    python export.py -i ./new.txt -o shields.csv
+    python export.py -i ./new.txt -o shields.parquet -t "2025-11-05 09:52:30"
+    python export.py -i ./new.txt -o targets.csv --where "hq>=29 and expires<45m"
+"""
+import json
+import os
+import sys
+
+from main import (BASE_TIME_STR, BASE_TZ, CRITICAL_SEC, TEXT_FILE, coord_int, iter_records, parse_base_time,
+                  parse_duration)
+
+########################################
+# 설정값
+########################################
+
+EXPORT_BATCH_ROWS = 10000  # 한 번에 쓰는 행 수
+COLUMNS = ("name", "alliance", "hq", "x", "y", "expire_ts", "status")
+EXPORT_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".parquet": "parquet",
+                  ".arrow": "arrow", ".feather": "arrow"}
+
+
+########################################
+# 행 스트림
+########################################
+
+def iter_export_rows(lines, base_time, issues=None):
+    """lines -> (name, alliance, hq, x, y, expire_ts, status) 튜플 제너레이터"""
+    base_ts = int(base_time.timestamp())
+    for _, name, alliance, hq, x, y, duration in iter_records(lines, issues):
+        if duration is None:
+            yield name, alliance, hq, coord_int(x), coord_int(y), None, "expired"
+            continue
+        remaining = parse_duration(duration)
+        status = "critical" if remaining < CRITICAL_SEC else "active"
+        yield name, alliance, hq, coord_int(x), coord_int(y), base_ts + remaining, status
+
+
+def rows_to_export(rows):
+    """이미 파싱된 rows(parse_txt_lines 결과) -> iter_export_rows 와 같은 튜플 (다시 파싱하지 않을 때)"""
+    for r in rows:
+        if r["is_expired"]:
+            status = "expired"
+        else:
+            status = "critical" if r["total_seconds"] < CRITICAL_SEC else "active"
+        yield (r["name"], r["alliance"], r["hq"], coord_int(r["x"]), coord_int(r["y"]),
+               None if r["is_expired"] else r["expire_ts"], status)
+
+
+def filter_export_rows(rows, query, base_time):
+    """iter_export_rows 결과 중 query(query.Query) 에 맞는 것만 (한 줄씩 흘려보냄)"""
+    test = query.test
+    now = int(base_time.timestamp())
+    for row in rows:
+        name, alliance, hq, x, y, expire_ts, _ = row
+        if test(name, alliance, hq, x, y, expire_ts, now):
+            yield row
+
+
+def iter_batches(rows, batch_size=EXPORT_BATCH_ROWS):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+########################################
+# 쓰기
+########################################
+
+def _write_csv(batches, f):
+    import csv
+
+    writer = csv.writer(f)
+    writer.writerow(COLUMNS)
+    for batch in batches:
+        writer.writerows(batch)
+
+
+def _write_ndjson(batches, f):
+    for batch in batches:
+        f.write("".join(json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + "\n" for row in batch))
+
+
+def _arrow_schema():
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise RuntimeError("pyarrow 가 없어 Parquet/Arrow 로 내보낼 수 없음 (pip install pyarrow)") from None
+    return pa, pa.schema([
+        ("name", pa.string()),
+        ("alliance", pa.string()),
+        ("hq", pa.int16()),
+        ("x", pa.int32()),
+        ("y", pa.int32()),
+        ("expire_ts", pa.int64()),
+        ("status", pa.string()),
+    ])
+
+
+def _to_record_batch(pa, schema, batch):
+    columns = zip(*batch)
+    return pa.record_batch([pa.array(col, type=field.type) for col, field in zip(columns, schema)], schema=schema)
+
+
+def _write_parquet(batches, path):
+    pa, schema = _arrow_schema()
+    import pyarrow.parquet as pq
+
+    with pq.ParquetWriter(path, schema) as writer:
+        for batch in batches:
+            writer.write_table(pa.Table.from_batches([_to_record_batch(pa, schema, batch)]))
+
+
+def _write_arrow(batches, path):
+    pa, schema = _arrow_schema()
+
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for batch in batches:
+            writer.write_batch(_to_record_batch(pa, schema, batch))
+
+
+def export_rows(rows, output_path, fmt=None, batch_size=EXPORT_BATCH_ROWS):
+    """
+    rows: iter_export_rows 결과 (튜플 이터러블)
+    output_path: 파일 경로 ("-" 이면 표준출력, csv/ndjson 만)
+    fmt: "csv" / "ndjson" / "parquet" / "arrow" (None 이면 확장자로)
+    return: 쓴 행 수
+    """
+    if fmt is None:
+        fmt = EXPORT_FORMATS.get(os.path.splitext(output_path)[1].lower(), "csv")
+    count = 0
+
+    def counted(batches):
+        nonlocal count
+        for batch in batches:
+            count += len(batch)
+            yield batch
+
+    batches = counted(iter_batches(rows, batch_size))
+    if fmt in ("parquet", "arrow"):
+        if output_path == "-":
+            raise ValueError(f"{fmt} 는 표준출력으로 쓸 수 없음")
+        (_write_parquet if fmt == "parquet" else _write_arrow)(batches, output_path)
+        return count
+
+    writer = _write_csv if fmt == "csv" else _write_ndjson
+    if output_path == "-":
+        writer(batches, sys.stdout)
+        sys.stdout.flush()
+    else:
+        with open(output_path, "w", encoding="utf-8", newline="") as f:
+            writer(batches, f)
+    return count
+
+
+def export_dump(input_path=TEXT_FILE, output_path="./baad_shield.csv", base_time=BASE_TIME_STR, tz=BASE_TZ,
+                fmt=None, batch_size=EXPORT_BATCH_ROWS, where=None):
+    """
+    덤프 txt 를 한 줄씩 읽어 바로 내보냄 (전체를 메모리에 올리지 않음). return: (행 수, issues)
+    where: 질의 문자열 (query.py 문법) -> 맞는 행만
+    """
+    query = None
+    if where:
+        from query import Query
+        query = Query(where)
+    if isinstance(base_time, str):
+        base_time = parse_base_time(base_time, tz)
+    issues = []
+    if input_path == "-":
+        import io
+        f = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+    else:
+        f = open(input_path, "r", encoding="utf-8")
+    with f:
+        rows = iter_export_rows(f, base_time, issues)
+        if query is not None:
+            rows = filter_export_rows(rows, query, base_time)
+        count = export_rows(rows, output_path, fmt, batch_size)
+    return count, issues
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="쉴드/좌표 덤프를 CSV / NDJSON / Parquet / Arrow 로 내보내기")
+    parser.add_argument("-i", "--input", default=TEXT_FILE, help="입력 txt (- 이면 표준입력, 기본: %(default)s)")
+    parser.add_argument("-o", "--output", default="-", help="출력 파일 (- 이면 표준출력, 기본: %(default)s)")
+    parser.add_argument("-f", "--format", choices=["csv", "ndjson", "parquet", "arrow"],
+                        help="출력 형식 (기본: 확장자로 판단, 모르면 csv)")
+    parser.add_argument("-t", "--base-time", default=BASE_TIME_STR, help="기준 시각 (기본: %(default)s)")
+    parser.add_argument("--tz", default=BASE_TZ, help="기준 시각의 시간대 (기본: %(default)s)")
+    parser.add_argument("--batch-rows", type=int, default=EXPORT_BATCH_ROWS, help="배치 행 수 (기본: %(default)s)")
+    parser.add_argument("--where", help='이 질의에 맞는 행만, 예: "hq>=29 and status=active and expires<45m"')
+    args = parser.parse_args(argv)
+
+    try:
+        count, issues = export_dump(args.input, args.output, args.base_time, args.tz, args.format, args.batch_rows,
+                                    args.where)
+    except (RuntimeError, ValueError) as e:
+        sys.exit(f"오류: {e}")
+    except BrokenPipeError:
+        # 표준출력을 읽던 쪽이 먼저 끝남 (| head 등): 트레이스백 없이 종료
+        # 종료하면서 stdout 을 다시 flush 하다 같은 오류가 나지 않게 devnull 로 바꿔 끼움
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    for line_no, message in issues:
+        print(f"경고: {args.input}:{line_no}: {message}", file=sys.stderr)
+    print(f"완료: {count}행 -> {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+한 번 파싱해서 여러 산출물을 동시에 만드는 팬아웃 파이프라인
+
+main.py 는 읽기 -> 파싱 -> HTML -> 쓰기를 한 줄로 해서 산출물 하나만 냄.
+같은 덤프로 페이지 / 데이터 JSON / 내보내기 / 알림 스케줄을 다 만들 때 각각 따로 돌리면 파싱을 매번 다시 함.
+  - 파싱 + 커맨더 식별은 한 번만, 결과는 읽기 전용 행 표(MappingProxyType 튜플)로 모든 단계가 공유
+  - 출력 단계는 스레드 또는 프로세스 풀에서 동시에 (프로세스 풀은 워커마다 행 표를 한 번만 받음)
+  - 단계마다 임시 파일에 다 쓴 뒤 바꿔 끼움 -> 실패한 단계는 이전 산출물을 그대로 둠
+  - 단계별 시작/소요 시간 리포트: 전체 벽시계 시간이 단계 합이 아니라 가장 느린 단계 근처인지 확인
+
+단계:
+    html                         대시보드 (+ 상태/델타, 서비스 워커 ...; publish_dashboard)
+    json                         커맨더 목록 JSON      -> <출력>.data.json
+    csv / ndjson / parquet / arrow  내보내기           -> <출력>.csv ...
+    alerts                       앞으로 올 알림 목록   -> <출력>.alerts.json
+
+사용 예:
+    python fanout.py -i ./new.txt -o ./baad_shield_output.html
+    python fanout.py -i ./new.txt -o ./out.html -s html -s parquet -s alerts --rule 10 --rule "30:hq>=30" --pool thread
+"""
+import os
+import sys
+import time
+from types import MappingProxyType
+
+from main import (BASE_TIME_STR, BASE_TZ, IDENTITY_JSON, OFFLINE_SHELL, OUTPUT_HTML, PAGE_TITLE, TEXT_FILE,
+                  _derived_path, parse_base_time, parse_txt_lines, read_input_lines, write_atomic)
+
+########################################
+# 설정값
+########################################
+
+FANOUT_STAGES = ["html", "json", "csv", "alerts"]  # 기본으로 만드는 산출물
+FANOUT_POOL = "process"  # "process" / "thread" (스레드는 GIL 때문에 CPU 를 많이 쓰는 단계끼리는 겹치지 않음)
+EXPORT_STAGES = {"csv": ".csv", "ndjson": ".ndjson", "parquet": ".parquet", "arrow": ".arrow"}
+
+
+########################################
+# 공유 행 표
+########################################
+
+def freeze_rows(rows):
+    """rows -> 읽기 전용 행 표 (단계가 실수로 행을 고치면 바로 TypeError)"""
+    return tuple(MappingProxyType(r) for r in rows)
+
+
+def load_table(input_path, base_time, identity_path=None):
+    """
+    덤프 -> (행 표, issues). 파싱과 커맨더 식별(ID 부여)은 여기서 한 번만
+    identity_path: 식별 인덱스 파일 (None 이면 인덱스 없이 새 ID)
+    """
+    from identity import assign_ids
+
+    issues = []
+    rows = parse_txt_lines(read_input_lines(input_path), base_time, issues)
+    assign_ids(rows, int(base_time.timestamp()), identity_path)
+    return rows, issues
+
+
+########################################
+# 단계
+########################################
+
+def stage_path(output_path, stage):
+    """출력 HTML 경로 + 단계 이름 -> 그 단계 산출물 경로"""
+    if stage == "html":
+        return output_path
+    root, _ = os.path.splitext(output_path)
+    if stage in EXPORT_STAGES:
+        return root + EXPORT_STAGES[stage]
+    return f"{root}.{'data' if stage == 'json' else stage}.json"
+
+
+def _export_atomic(table, path, fmt):
+    """내보내기는 파일에 직접 흘려 쓰므로 같은 디렉터리 임시 경로에 쓴 뒤 바꿔 끼움"""
+    import tempfile
+
+    from export import export_rows, rows_to_export
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".",
+                                    suffix=".tmp")
+    os.close(fd)
+    try:
+        count = export_rows(rows_to_export(table), tmp_path, fmt)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return f"{count}행"
+
+
+def run_stage(stage, table, base_time, path, options):
+    """
+    단계 하나 실행. options: {"html": publish_dashboard 키워드, "rules": 알림 규칙 문자열 리스트}
+    return: {"stage", "output", "started", "seconds", "detail", "log"} (started 는 time.time)
+        log: 단계가 남긴 메시지 리스트 (동시에 도는 단계끼리 출력이 섞이지 않게 리포트에서 모아 찍음)
+    """
+    import json
+
+    started = time.time()
+    t0 = time.perf_counter()
+    messages = []
+    if stage == "html":
+        from main import publish_dashboard
+
+        result = publish_dashboard(table, base_time, output_path=path, assign_identity=False, log=messages.append,
+                                   **options.get("html", {}))
+        detail = f"버전 {result['version']}"
+    elif stage == "json":
+        from main import build_rows_json_bytes
+
+        write_atomic(path, build_rows_json_bytes(table))
+        detail = f"{len(table)}명"
+    elif stage in EXPORT_STAGES:
+        detail = _export_atomic(table, path, stage)
+    elif stage == "alerts":
+        from alerts import DEFAULT_RULES, build_schedule, parse_rule
+
+        rules = [parse_rule(spec) for spec in options.get("rules") or DEFAULT_RULES]
+        schedule = build_schedule(table, rules, int(base_time.timestamp()))
+        write_atomic(path, json.dumps(schedule, ensure_ascii=False, indent=1))
+        detail = f"알림 {len(schedule)}건"
+    else:
+        raise ValueError(f"알 수 없는 단계: {stage}")
+    return {"stage": stage, "output": path, "started": started, "seconds": time.perf_counter() - t0,
+            "detail": detail, "log": messages}
+
+
+# 프로세스 풀 워커: 행 표는 워커마다 한 번만 받아서 얼림
+_worker_table = None
+_worker_base_time = None
+
+
+def _init_worker(rows, base_time):
+    global _worker_table, _worker_base_time
+    _worker_table = freeze_rows(rows)
+    _worker_base_time = base_time
+
+
+def _run_in_worker(args):
+    stage, path, options = args
+    return run_stage(stage, _worker_table, _worker_base_time, path, options)
+
+
+########################################
+# 파이프라인
+########################################
+
+def fan_out(input_path=TEXT_FILE, output_path=OUTPUT_HTML, stages=FANOUT_STAGES, base_time=BASE_TIME_STR,
+            tz=BASE_TZ, pool=FANOUT_POOL, workers=None, rules=None, identity_path=None, **html_options):
+    """
+    덤프를 한 번 파싱하고 stages 산출물을 동시에 만듦
+    pool: "thread" / "process", workers: 동시 단계 수 (None 이면 단계 수, 1 이면 순서대로)
+    rules: alerts 단계 규칙 (alerts.parse_rule 형식, None 이면 기본)
+    html_options: html 단계의 publish_dashboard 키워드 (title, production, offline, queries ...)
+    return: {"rows", "issues", "parse_seconds", "wall_seconds", "stages": [run_stage 결과 또는 {"stage", "error"}]}
+    """
+    if isinstance(base_time, str):
+        base_time = parse_base_time(base_time, tz)
+    if identity_path is None and output_path != "-":
+        identity_path = _derived_path(output_path, IDENTITY_JSON, "identity")
+
+    t0 = time.perf_counter()
+    rows, issues = load_table(input_path, base_time, identity_path)
+    parse_seconds = time.perf_counter() - t0
+
+    options = {"html": html_options, "rules": rules}
+    tasks = [(stage, stage_path(output_path, stage), options) for stage in stages]
+    workers = workers or len(tasks)
+
+    results = []
+    wall_start = time.time()
+    if workers == 1:
+        table = freeze_rows(rows)
+        for stage, path, opts in tasks:
+            try:
+                results.append(run_stage(stage, table, base_time, path, opts))
+            except Exception as e:
+                results.append({"stage": stage, "output": path, "error": f"{type(e).__name__}: {e}"})
+    else:
+        if pool == "process":
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rows, base_time))
+            submit = lambda task: executor.submit(_run_in_worker, task)
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            table = freeze_rows(rows)
+            executor = ThreadPoolExecutor(max_workers=workers)
+            submit = lambda task: executor.submit(run_stage, task[0], table, base_time, task[1], task[2])
+        with executor:
+            futures = [(task, submit(task)) for task in tasks]
+            for (stage, path, _), future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append({"stage": stage, "output": path, "error": f"{type(e).__name__}: {e}"})
+    wall_seconds = time.time() - wall_start
+
+    for result in results:
+        if "started" in result:
+            result["offset"] = result["started"] - wall_start
+    return {"rows": len(rows), "issues": issues, "parse_seconds": parse_seconds, "wall_seconds": wall_seconds,
+            "stages": results}
+
+
+def format_report(report):
+    """fan_out 결과 -> 단계별 시간 리포트 문자열"""
+    lines = [f"파싱: {report['parse_seconds']:.2f}초 ({report['rows']:,}행, 한 번)"]
+    width = max(len(r["stage"]) for r in report["stages"]) if report["stages"] else 0
+    done = [r for r in report["stages"] if "error" not in r]
+    for r in report["stages"]:
+        if "error" in r:
+            lines.append(f"  {r['stage']:<{width}}  실패: {r['error']} ({r['output']} 는 그대로)")
+            continue
+        lines.append(f"  {r['stage']:<{width}}  +{r['offset']:.2f}s 시작  {r['seconds']:6.2f}초  "
+                     f"{r['output']} ({r['detail']})")
+        lines.extend(f"  {'':<{width}}    {message}" for message in r.get("log", ()))
+    if done:
+        total = sum(r["seconds"] for r in done)
+        slowest = max(done, key=lambda r: r["seconds"])
+        lines.append(f"출력 단계: 벽시계 {report['wall_seconds']:.2f}초 / 단계 합 {total:.2f}초 / "
+                     f"가장 느린 단계 {slowest['stage']} {slowest['seconds']:.2f}초")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="덤프를 한 번 파싱해서 페이지 / JSON / 내보내기 / 알림 스케줄을 동시에")
+    parser.add_argument("-i", "--input", default=TEXT_FILE, help="입력 txt (- 이면 표준입력, 기본: %(default)s)")
+    parser.add_argument("-o", "--output", default=OUTPUT_HTML, help="출력 HTML (다른 산출물은 이 이름 옆, 기본: %(default)s)")
+    parser.add_argument("-s", "--stage", action="append",
+                        choices=["html", "json", "alerts", *EXPORT_STAGES],
+                        help=f"만들 산출물 (여러 번 가능, 기본: {' '.join(FANOUT_STAGES)})")
+    parser.add_argument("-t", "--base-time", default=BASE_TIME_STR, help="기준 시각 (기본: %(default)s)")
+    parser.add_argument("--tz", default=BASE_TZ, help="기준 시각의 시간대 (기본: %(default)s)")
+    parser.add_argument("--pool", choices=["thread", "process"], default=FANOUT_POOL, help="동시 실행 방식 (기본: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="동시 단계 수 (1 이면 순서대로)")
+    parser.add_argument("--rule", action="append", help="alerts 규칙 (alerts.py 와 같은 형식, 여러 번 가능)")
+    parser.add_argument("--title", default=PAGE_TITLE, help="페이지 제목")
+    parser.add_argument("--production", action="store_true", help="html 단계를 프로덕션 빌드로")
+    parser.add_argument("--offline", dest="offline", action="store_true", default=OFFLINE_SHELL,
+                        help="서비스 워커 / 매니페스트를 같이 씀")
+    parser.add_argument("--no-offline", dest="offline", action="store_false", help="서비스 워커 / 매니페스트를 만들지 않음")
+    parser.add_argument("--query", action="append", metavar="NAME:QUERY", help="페이지 필터 버튼 질의 (여러 번 가능)")
+    args = parser.parse_args(argv)
+
+    if args.output == "-":
+        parser.error("팬아웃은 파일 출력만 지원 (-o 에 HTML 경로)")
+    try:
+        report = fan_out(args.input, args.output, args.stage or FANOUT_STAGES, args.base_time, args.tz, args.pool,
+                         args.workers, args.rule, title=args.title, production=args.production,
+                         offline=args.offline, queries=args.query)
+    except (OSError, ValueError) as e:
+        sys.exit(f"오류: {e}")
+    for line_no, message in report["issues"]:
+        print(f"경고: {args.input}:{line_no}: {message}", file=sys.stderr)
+    print(format_report(report))
+    if any("error" in r for r in report["stages"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+커맨더 식별 인덱스
+
+덤프마다 이름 표기가 흔들리거나(공백/이모지/대소문자) 개명/이사를 해도 같은 커맨더에 같은 ID 를 붙임.
+  1) 정규화 이름 해시: NFKC + casefold + 글자/숫자만 남긴 키가 같으면 같은 사람 (여럿이면 가까운 좌표)
+  2) n-그램 퍼지 매칭: 1) 에서 남은 행만, 아직 안 잡힌 기존 커맨더의 2-그램 색인으로 후보를 뽑아
+     같은 연맹 안에서 다이스 계수 + 좌표 거리로 판정 (멀리 있으면 거의 같은 이름만)
+  3) 좌표: 같은 연맹/HQ 가 같은 자리에 그대로 있으면 개명으로 봄
+  4) 다 실패하면 새 ID
+대부분의 행은 1) 의 dict 조회 한 번으로 끝나서 10만 명도 1초 안쪽.
+"""
+import json
+import math
+import unicodedata
+
+from main import coord_int, write_atomic
+
+########################################
+# 설정값
+########################################
+
+INDEX_FORMAT = 1
+FUZZY_FAR_ACCEPT = 0.9  # 같은 연맹이고 이만큼 닮았으면 좌표가 멀어도(이사) 같은 사람
+FUZZY_NEAR_ACCEPT = 0.5  # 같은 연맹이고 좌표가 가까우면 이 정도 닮아도 같은 사람
+NEAR_DIST = 30  # "가까운 좌표" 기준 (좌표 단위)
+MAX_POSTING = 2000  # 이보다 흔한 n-그램은 후보 뽑기에 안 씀 (비용 제한)
+IDENTITY_TTL_SEC = 30 * 86400  # 이 기간 동안 안 보인 커맨더는 인덱스에서 지움
+
+
+########################################
+# 이름 정규화
+########################################
+
+def normalize_name(name):
+    """표기 흔들림을 없앤 비교용 키 (글자/숫자가 하나도 없으면 공백만 정리한 원문)"""
+    folded = unicodedata.normalize("NFKC", name).casefold()
+    key = "".join(ch for ch in folded if ch.isalnum())
+    return key or " ".join(folded.split())
+
+
+def name_grams(norm):
+    """정규화 키 -> 2-그램 집합 (한 글자면 그 글자)"""
+    if len(norm) < 2:
+        return {norm}
+    return {norm[i:i + 2] for i in range(len(norm) - 1)}
+
+
+def _coord(row):
+    x, y = coord_int(row["x"]), coord_int(row["y"])
+    if x is None or y is None:
+        return None
+    return x, y
+
+
+def _distance(a, b):
+    if a is None or b is None:
+        return math.inf
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+########################################
+# 인덱스
+########################################
+
+class IdentityIndex:
+    """
+    entries: ID -> {"name", "norm", "alliance", "hq", "x", "y", "seen"(마지막으로 본 epoch 초)}
+    resolve(rows) 가 각 row 에 "id" 를 채움
+    """
+
+    def __init__(self, entries=None, next_id=1):
+        self.entries = entries or {}
+        self.next_id = next_id
+
+    @classmethod
+    def load(cls, path):
+        """인덱스 파일 -> IdentityIndex (없거나 깨졌거나 형식이 다르면 빈 인덱스)"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(data, dict) or data.get("format") != INDEX_FORMAT:
+            return cls()
+        return cls(data["entries"], data["next_id"])
+
+    def save(self, path):
+        """임시 파일에 다 쓴 뒤 바꿔 끼움 (중간에 죽어도 깨진 인덱스로 모든 ID 가 새로 붙지 않게)"""
+        data = {"format": INDEX_FORMAT, "next_id": self.next_id, "entries": self.entries}
+        write_atomic(path, json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+
+    def _new_id(self):
+        cid = f"c{self.next_id}"
+        self.next_id += 1
+        return cid
+
+    def _fuzzy_pools(self, claimed):
+        """아직 안 잡힌 기존 커맨더 -> (2-그램 색인, 좌표 색인)"""
+        gram_index = {}
+        coord_index = {}
+        for cid, ent in self.entries.items():
+            if cid in claimed:
+                continue
+            for gram in name_grams(ent["norm"]):
+                gram_index.setdefault(gram, []).append(cid)
+            coord_index.setdefault((ent["x"], ent["y"]), []).append(cid)
+        return gram_index, coord_index
+
+    def _fuzzy_match(self, row, norm, gram_index, coord_index, claimed):
+        grams = name_grams(norm)
+        shared = {}
+        for gram in grams:
+            posting = gram_index.get(gram)
+            if posting is None or len(posting) > MAX_POSTING:
+                continue
+            for cid in posting:
+                if cid not in claimed:
+                    shared[cid] = shared.get(cid, 0) + 1
+
+        pos = _coord(row)
+        best = None
+        best_key = None
+        alliance = row.get("alliance")
+        for cid, n in shared.items():
+            ent = self.entries[cid]
+            if ent["alliance"] != alliance:
+                continue
+            dice = 2 * n / (len(grams) + len(name_grams(ent["norm"])))
+            dist = _distance(pos, _coord(ent))
+            if dice >= FUZZY_FAR_ACCEPT or (dice >= FUZZY_NEAR_ACCEPT and dist <= NEAR_DIST):
+                key = (-dice, dist)
+                if best_key is None or key < best_key:
+                    best, best_key = cid, key
+        if best is not None:
+            return best, "fuzzy"
+
+        for cid in coord_index.get((row["x"], row["y"]), ()):
+            ent = self.entries[cid]
+            if cid not in claimed and ent["alliance"] == row.get("alliance") and ent["hq"] == row.get("hq"):
+                return cid, "coord"
+        return None, "new"
+
+    def _claim(self, cid, row, norm, seen_ts):
+        row["id"] = cid
+        self.entries[cid] = {
+            "name": row["name"],
+            "norm": norm,
+            "alliance": row.get("alliance"),
+            "hq": row.get("hq"),
+            "x": row["x"],
+            "y": row["y"],
+            "seen": seen_ts,
+        }
+
+    def resolve(self, rows, seen_ts):
+        """
+        rows: parse_txt_lines 결과 (각 row 에 "id" 를 채움)
+        seen_ts: 이 덤프의 기준 시각 (UTC epoch 초)
+        return: {"exact", "fuzzy", "coord", "new", "pruned"} 건수
+        """
+        stats = {"exact": 0, "fuzzy": 0, "coord": 0, "new": 0, "pruned": 0}
+        by_norm = {}
+        for cid, ent in self.entries.items():
+            by_norm.setdefault(ent["norm"], []).append(cid)
+
+        claimed = set()
+        pending = []
+        for row in rows:
+            norm = normalize_name(row["name"])
+            cands = by_norm.get(norm)
+            cid = None
+            if cands:
+                free = [c for c in cands if c not in claimed]
+                if len(free) == 1:
+                    cid = free[0]
+                elif free:
+                    pos = _coord(row)
+                    cid = min(free, key=lambda c: _distance(pos, _coord(self.entries[c])))
+            if cid is None:
+                pending.append((row, norm))
+                continue
+            claimed.add(cid)
+            self._claim(cid, row, norm, seen_ts)
+            stats["exact"] += 1
+
+        if pending:
+            gram_index, coord_index = self._fuzzy_pools(claimed)
+            for row, norm in pending:
+                cid, how = self._fuzzy_match(row, norm, gram_index, coord_index, claimed)
+                if cid is None:
+                    cid = self._new_id()
+                claimed.add(cid)
+                self._claim(cid, row, norm, seen_ts)
+                stats[how] += 1
+
+        cutoff = seen_ts - IDENTITY_TTL_SEC
+        stale = [cid for cid, ent in self.entries.items() if ent["seen"] < cutoff]
+        for cid in stale:
+            del self.entries[cid]
+        stats["pruned"] = len(stale)
+        return stats
+
+
+def assign_ids(rows, seen_ts, path=None):
+    """
+    rows 에 안정 ID 를 붙임. path 를 주면 그 인덱스 파일을 읽고 갱신해서 다시 저장
+    return: resolve 통계
+    """
+    index = IdentityIndex.load(path) if path else IdentityIndex()
+    stats = index.resolve(rows, seen_ts)
+    if path:
+        index.save(path)
+    return stats
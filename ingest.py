@@ -0,0 +1,276 @@
+"""
+스풀 디렉터리 동시 수집
+
+여러 정찰병이 덤프 txt 를 스풀 디렉터리에 떨구면
+  - 스캐너 스레드가 새 파일을 크기 제한이 있는 큐에 넣음 (큐가 차면 스캔이 멈춤 = 백프레셔)
+  - 메인 루프가 큐에서 한 묶음(최대 BATCH_MAX 개)을 꺼내 프로세스 풀에서 동시에 파싱
+  - 결과를 관측 시각(파일 수정 시각) 순서로 현재 상태에 합침 (같은 커맨더는 더 최근 관측이 이김)
+  - 묶음마다 한 번만 HTML/상태/델타를 다시 만듦
+처리한 파일은 스풀 아래 done/ 으로, 읽다가 실패한 파일은 failed/ 로 옮김.
+
+사용 예:
+    python ingest.py ./spool -o ./baad_shield_output.html -j 4
+"""
+import os
+import queue
+import sys
+import threading
+import time
+
+from main import (BASE_TZ, IDENTITY_JSON, OUTPUT_HTML, _derived_path, parse_txt_lines, publish_dashboard,
+                  rebase_rows, resolve_tz, write_atomic)
+
+########################################
+# 설정값
+########################################
+
+QUEUE_SIZE = 32  # 파싱 대기 큐 크기 (차면 스캐너가 기다림)
+BATCH_MAX = 16  # 한 번에 파싱/반영하는 파일 수
+POLL_SEC = 2  # 스풀 디렉터리 확인 주기
+SETTLE_SEC = 1  # 수정된 지 이 시간이 안 된 파일은 아직 쓰는 중으로 보고 건너뜀
+MERGE_TTL_SEC = 24 * 3600  # 이 시간 동안 어떤 덤프에도 안 나온 커맨더는 합친 상태에서 뺌
+SPOOL_SUFFIX = ".txt"
+MERGED_JSON = "./baad_shield_merged.json"  # 합친 상태 (기본 출력 경로일 때)
+MERGED_FORMAT = 2  # 합친 상태 파일 형식 (2: 키 = 식별 인덱스 ID)
+
+
+########################################
+# 파싱 (워커 프로세스)
+########################################
+
+def parse_spool_file(path, tz=BASE_TZ):
+    """
+    덤프 파일 하나 -> (경로, 관측 시각 epoch 초, rows, issues)
+    남은시간은 붙여넣은 시점 기준이므로 파일 수정 시각을 기준 시각으로 씀
+    """
+    from datetime import datetime
+
+    observed = int(os.path.getmtime(path))
+    base_time = datetime.fromtimestamp(observed, resolve_tz(tz))
+    issues = []
+    with open(path, "r", encoding="utf-8") as f:
+        rows = parse_txt_lines(f, base_time, issues)
+    return path, observed, rows, issues
+
+
+########################################
+# 합친 상태
+########################################
+
+def merge_key(row):
+    """식별 인덱스가 붙인 안정 ID (대시보드/델타와 같은 커맨더 구분)"""
+    return row["id"]
+
+
+class MergedState:
+    """
+    커맨더 ID -> (관측 시각, row). 여러 덤프를 관측 시각 기준으로 합침
+    파일로 저장해 두면 재시작해도 이어서 합침 (형식이 다른 예전 파일은 버리고 새로 시작)
+    """
+
+    def __init__(self, entries=None):
+        self.entries = entries or {}
+
+    @classmethod
+    def load(cls, path):
+        import json
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(data, dict) or data.get("format") != MERGED_FORMAT:
+            return cls()
+        return cls({key: (obs, row) for key, (obs, row) in data["entries"].items()})
+
+    def save(self, path):
+        import json
+
+        data = {"format": MERGED_FORMAT, "entries": self.entries}
+        write_atomic(path, json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+
+    def merge(self, observed, rows):
+        """한 덤프 반영. 이미 더 최근 관측이 있는 커맨더는 건드리지 않음. return: 바뀐 커맨더 수"""
+        entries = self.entries
+        changed = 0
+        for row in rows:
+            key = merge_key(row)
+            prev = entries.get(key)
+            if prev is not None and prev[0] > observed:
+                continue
+            entries[key] = (observed, row)
+            changed += 1
+        return changed
+
+    def rows_at(self, base_time):
+        """
+        합친 row 들을 base_time 기준으로 다시 계산 (덤프마다 기준 시각이 달라서)
+        MERGE_TTL_SEC 보다 오래된 관측은 버림
+        """
+        cutoff = int(base_time.timestamp()) - MERGE_TTL_SEC
+        for key in [k for k, (obs, _) in self.entries.items() if obs < cutoff]:
+            del self.entries[key]
+        return rebase_rows([row for _, row in self.entries.values()], base_time)
+
+
+########################################
+# 스풀 스캐너 / 수집 루프
+########################################
+
+def scan_spool(spool_dir, work_queue, stop, poll_sec=POLL_SEC):
+    """
+    스풀 디렉터리의 새 .txt 를 큐에 넣음. 큐가 차 있으면 자리가 날 때까지 기다림(백프레셔).
+    한 번 넣은 파일은 옮겨질 때까지 다시 넣지 않음
+    """
+    queued = set()
+    while not stop.is_set():
+        now = time.time()
+        try:
+            names = sorted(os.listdir(spool_dir))
+        except OSError:
+            names = []
+        present = set()
+        for name in names:
+            path = os.path.join(spool_dir, name)
+            if not name.endswith(SPOOL_SUFFIX) or not os.path.isfile(path):
+                continue
+            present.add(path)
+            try:
+                settling = now - os.path.getmtime(path) < SETTLE_SEC
+            except OSError:
+                continue
+            if path in queued or settling:
+                continue
+            while not stop.is_set():
+                try:
+                    work_queue.put(path, timeout=poll_sec)
+                    queued.add(path)
+                    break
+                except queue.Full:
+                    continue
+        queued &= present
+        stop.wait(poll_sec)
+
+
+def _move_into(path, subdir):
+    """path 를 스풀 아래 subdir 로 옮김. 그 사이 누가 지우거나 옮겼으면 건너뜀. return: 옮겼는지"""
+    target_dir = os.path.join(os.path.dirname(path), subdir)
+    os.makedirs(target_dir, exist_ok=True)
+    try:
+        os.replace(path, os.path.join(target_dir, os.path.basename(path)))
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _take_batch(work_queue, timeout):
+    """큐에서 한 묶음: 첫 파일은 timeout 까지 기다리고 나머지는 지금 있는 만큼 (최대 BATCH_MAX)"""
+    try:
+        batch = [work_queue.get(timeout=timeout)]
+    except queue.Empty:
+        return []
+    while len(batch) < BATCH_MAX:
+        try:
+            batch.append(work_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def run_ingest(spool_dir, output_path=OUTPUT_HTML, tz=BASE_TZ, workers=None, queue_size=QUEUE_SIZE,
+               poll_sec=POLL_SEC, once=False, merged_path=None, log=print, **publish_options):
+    """
+    spool_dir 를 감시하며 묶음 단위로 파싱 -> 합치기 -> 대시보드 재생성
+    once: True 면 지금 있는 파일만 처리하고 끝냄
+    merged_path: 합친 상태 파일 (None 이면 출력 경로에서 유도)
+    커맨더 구분은 대시보드와 같은 식별 인덱스(출력 경로에서 유도한 identity 파일)의 ID
+    publish_options: publish_dashboard 에 그대로 넘김 (title, production, plan_from ...)
+    return: 처리한 묶음 수
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from datetime import datetime
+
+    from identity import IdentityIndex
+
+    merged_path = merged_path or _derived_path(output_path, MERGED_JSON, "merged")
+    identity_path = publish_options.pop("identity_path", None) or _derived_path(output_path, IDENTITY_JSON,
+                                                                                "identity")
+    state = MergedState.load(merged_path)
+    identity = IdentityIndex.load(identity_path)
+    work_queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    scanner = threading.Thread(target=scan_spool, args=(spool_dir, work_queue, stop, poll_sec), daemon=True)
+    scanner.start()
+
+    batches = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                batch = _take_batch(work_queue, poll_sec * 2 if once else poll_sec)
+                if not batch:
+                    if once:
+                        break
+                    continue
+
+                futures = [pool.submit(parse_spool_file, path, tz) for path in batch]
+                results = []
+                for path, future in zip(batch, futures):
+                    try:
+                        results.append(future.result())
+                    except (OSError, UnicodeDecodeError) as e:
+                        log(f"읽기 실패: {path}: {e}")
+                        if not _move_into(path, "failed"):
+                            log(f"건너뜀: {path} (처리 전에 사라짐)")
+
+                # 관측 시각 순서로 합쳐서 같은 커맨더는 가장 최근 관측이 남도록
+                results.sort(key=lambda res: res[1])
+                changed = 0
+                for path, observed, rows, issues in results:
+                    for line_no, message in issues:
+                        log(f"경고: {path}:{line_no}: {message}")
+                    identity.resolve(rows, observed)
+                    changed += state.merge(observed, rows)
+
+                if results:
+                    latest = max(observed for _, observed, _, _ in results)
+                    base_time = datetime.fromtimestamp(latest, resolve_tz(tz))
+                    rows = state.rows_at(base_time)
+                    publish_dashboard(rows, base_time, output_path=output_path, assign_identity=False, log=log,
+                                      **publish_options)
+                    identity.save(identity_path)
+                    state.save(merged_path)
+                    for path, *_ in results:
+                        _move_into(path, "done")
+                    log(f"묶음 반영: 파일 {len(results)}개, 변경 {changed}명, 전체 {len(rows)}명")
+                batches += 1
+    finally:
+        stop.set()
+        scanner.join()
+    return batches
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="스풀 디렉터리의 덤프들을 모아 대시보드 생성")
+    parser.add_argument("spool", help="덤프 txt 를 떨구는 디렉터리")
+    parser.add_argument("-o", "--output", default=OUTPUT_HTML, help="출력 HTML (기본: %(default)s)")
+    parser.add_argument("--tz", default=BASE_TZ, help="표시 시간대 (기본: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="파싱 워커 프로세스 수")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help="대기 큐 크기 (기본: %(default)s)")
+    parser.add_argument("--poll", type=float, default=POLL_SEC, help="스풀 확인 주기, 초 (기본: %(default)s)")
+    parser.add_argument("--once", action="store_true", help="지금 있는 파일만 처리하고 종료")
+    parser.add_argument("--production", action="store_true", help="프로덕션 빌드 (인라인 CSS + 압축 산출물)")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.spool, exist_ok=True)
+    try:
+        run_ingest(args.spool, output_path=args.output, tz=args.tz, workers=args.workers,
+                   queue_size=args.queue_size, poll_sec=args.poll, once=args.once, production=args.production)
+    except KeyboardInterrupt:
+        print("중단됨", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
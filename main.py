@@ -1,1274 +1,1781 @@
-import html
-from datetime import datetime, timedelta
-
-########################################
-# 설정값: 여기만 수정해서 재사용하면 됨
-########################################
-
-TEXT_FILE = "./new.txt"  # 쉴드/좌표 목록 txt
-BASE_TIME_STR = "2025-11-05 09:52:30"  # 기준 시각 (KST 기준이라고 가정)
-OUTPUT_HTML = "./baad_shield_output.html"  # 만들어질 HTML 파일 경로
-
-PAGE_TITLE = "🐑 사냥"
-HEADER_BADGE = "🏰"
-SECTION_TITLE = "🐑🏠"
-
-
-########################################
-# 유틸 함수들
-########################################
-
-WEEKDAY_KR = ['월', '화', '수', '목', '금', '토', '일']
-
-
-def parse_duration(duration_text):
-    """
-    "1h 38m" -> (1, 38)
-    "26m" -> (0, 26)
-    "18m" -> (0, 18)
-    "5h 23m" -> (5, 23)
-    빈 문자열이나 이상한 값 -> (0,0)
-    """
-    duration_text = duration_text.strip()
-    if not duration_text:
-        return (0, 0)
-
-    hours = 0
-    minutes = 0
-    parts = duration_text.split()
-    for p in parts:
-        p = p.strip()
-        if p.endswith("h"):
-            # "19h"
-            try:
-                hours = int(p[:-1])
-            except ValueError:
-                hours = 0
-        elif p.endswith("m"):
-            # "38m"
-            try:
-                minutes = int(p[:-1])
-            except ValueError:
-                minutes = 0
-    return (hours, minutes)
-
-
-def format_expire_info(base_time, hours, minutes):
-    """
-    기준 시각 + 남은시간 -> 만료 예정 시각, 화면용 날짜/시간(오전/오후 HH:MM),
-    남은시간 표시("X시간 Y분" 또는 "Z분 0초"), total_minutes(정렬용)
-    """
-    expire_dt = base_time + timedelta(hours=hours, minutes=minutes)
-
-    # yyyy-mm-ddTHH:MM:SS (초는 00으로 맞춤)
-    iso_dt = expire_dt.replace(second=0)
-
-    # "10/27 (월)"
-    mon = expire_dt.month
-    day = expire_dt.day
-    weekday = WEEKDAY_KR[expire_dt.weekday()]
-    date_disp = f"{mon:02d}/{day:02d} ({weekday})"
-
-    # "오전/오후 HH:MM"
-    hour24 = expire_dt.hour
-    minute = expire_dt.minute
-    ampm = "오전" if hour24 < 12 else "오후"
-    hour12 = hour24 % 12
-    if hour12 == 0:
-        hour12 = 12
-    time_disp = f"{ampm} {hour12:02d}:{minute:02d}"
-
-    # 남은시간 표기
-    if hours == 0:
-        countdown = f"{minutes}분 0초"
-    else:
-        countdown = f"{hours}시간 {minutes}분"
-
-    total_minutes = hours * 60 + minutes
-
-    return {
-        "iso_dt": iso_dt,
-        "date_disp": date_disp,
-        "time_disp": time_disp,
-        "countdown": countdown,
-        "total_minutes": total_minutes,
-    }
-
-
-def build_row_html(row):
-    """
-    row dict -> <tr>...</tr> HTML
-    row keys:
-      name, coord, is_expired(bool)
-      if expired:
-          countdown='지남', date_disp/time_disp='-', iso_dt=None
-      else:
-          date_disp, time_disp, countdown, iso_dt
-    """
-    esc_name = html.escape(row["name"])
-    coord_txt = f"{row['x']}, {row['y']}"
-
-    if row["is_expired"]:
-        date_html = '<div class="text-xs text-gray-400">만료</div>'
-        time_html = '<div class="text-gray-400">-</div>'
-        cd_class = "text-gray-400"
-        cd_text = html.escape(row["countdown"])
-        data_dt_attr = ""
-        time_block_class = "text-gray-400"
-        data_status = "expired"
-        data_minutes = "-1"
-    else:
-        date_html = f'<div class="text-xs text-gray-500">{html.escape(row["date_disp"])}</div>'
-        time_html = f'<div>{html.escape(row["time_disp"])}</div>'
-        cd_class = "text-red-600 font-bold"
-        cd_text = html.escape(row["countdown"])
-        data_dt_attr = row["iso_dt"].strftime("%Y-%m-%dT%H:%M:%S")
-        time_block_class = "text-gray-600"
-        data_status = "active"
-        data_minutes = str(row["total_minutes"])
-
-    return f'''<tr class="hover:bg-gray-50 commander-row" data-datetime="{data_dt_attr}" data-status="{data_status}" data-minutes="{data_minutes}" data-name="{esc_name.lower()}" data-x="{row['x']}" data-y="{row['y']}">
-  <td class="px-6 py-4 text-sm text-gray-900 font-medium">{esc_name}</td>
-  <td class="px-6 py-4 text-sm text-blue-600 cursor-pointer hover:text-blue-800 hover:underline" onclick="copyCoordinates('{coord_txt}')">({coord_txt})</td>
-  <td class="px-6 py-4 text-sm">
-    <div class="flex items-center justify-between">
-      <div class="time-display {time_block_class}">
-        {date_html}
-        {time_html}
-      </div>
-      <span class="countdown-display text-xs font-mono ml-4 {cd_class}">{cd_text}</span>
-    </div>
-  </td>
-</tr>'''
-
-
-########################################
-# 파서: txt를 읽어서 row 리스트로 변환
-########################################
-
-def parse_txt_lines(lines, base_time):
-    """
-    lines: txt 전체 라인 리스트
-    base_time: datetime 기준 시각
-    return: rows(list of dict)
-        {
-          "name": str,
-          "x": str,
-          "y": str,
-          "is_expired": bool,
-          "countdown": str,           # "지남" or "X시간 Y분" 등
-          "date_disp": ...,
-          "time_disp": ...,
-          "iso_dt": datetime or None,
-          "total_minutes": int        # 정렬용 (만료는 -1)
-        }
-    """
-    rows = []
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        if not line:
-            i += 1
-            continue
-
-        # 좌표가 들어간 main 라인인지 판별
-        # 예: "BAA 자이언트\tBAAD\t30\t(122, 513)\t"
-        # 또는 "Just Uh Casual\tBAAD\t30\t(942, 65)\t-"
-        if "(" in line and ")" in line and "\t" in line:
-            parts = line.split("\t")
-            # 기대형식:
-            # parts[0] = 이름
-            # parts[1] = "BAAD"
-            # parts[2] = HQ 레벨
-            # parts[3] = "(x, y)"
-            # parts[4] = "-" or "" (있을수도 없을수도)
-            if len(parts) < 4:
-                i += 1
-                continue
-
-            name = parts[0].strip()
-            coord_part = parts[3].strip()
-
-            # 좌표 파싱 "(x, y)" -> x, y
-            if coord_part.startswith("(") and coord_part.endswith(")"):
-                coord_part_inner = coord_part[1:-1]
-            else:
-                coord_part_inner = coord_part
-            xy_split = coord_part_inner.split(",")
-            if len(xy_split) == 2:
-                x = xy_split[0].strip()
-                y = xy_split[1].strip()
-            else:
-                x = ""
-                y = ""
-
-            # 실드 만료 여부
-            last_col = ""
-            if len(parts) >= 5:
-                last_col = parts[4].strip()
-
-            if last_col == "-":
-                # 이미 만료된 상태
-                rows.append({
-                    "name": name,
-                    "x": x,
-                    "y": y,
-                    "is_expired": True,
-                    "countdown": "지남",
-                    "date_disp": "-",
-                    "time_disp": "-",
-                    "iso_dt": None,
-                    "total_minutes": -1,
-                })
-                i += 1
-                continue
-            else:
-                # 방어막 남아있음:
-                # 다음 줄은 "🛡️", 그 다음 줄은 남은시간 예: "1h 38m"
-                remaining_text = ""
-                if i + 2 < len(lines):
-                    # i+1 은 🛡️, i+2 는 "1h 38m"
-                    remaining_text = lines[i + 2].strip()
-                hours, minutes = parse_duration(remaining_text)
-                info = format_expire_info(base_time, hours, minutes)
-
-                rows.append({
-                    "name": name,
-                    "x": x,
-                    "y": y,
-                    "is_expired": False,
-                    "countdown": info["countdown"],
-                    "date_disp": info["date_disp"],
-                    "time_disp": info["time_disp"],
-                    "iso_dt": info["iso_dt"],
-                    "total_minutes": info["total_minutes"],
-                })
-
-                i += 3
-                continue
-
-        # 기본적으로 조건 안 맞으면 다음 라인
-        i += 1
-
-    return rows
-
-
-########################################
-# HTML 생성
-########################################
-
-def build_html(rows, base_time):
-    """
-    rows: parse_txt_lines 결과
-    base_time: datetime
-    -> 최종 HTML 문자열
-    """
-    # 정렬: 만료(-1)먼저, 그 다음 남은시간(total_minutes) 오름차순
-    sorted_rows = sorted(rows, key=lambda r: r["total_minutes"])
-
-    table_rows_html = "\n".join(build_row_html(r) for r in sorted_rows)
-
-    base_time_disp = base_time.strftime("%Y-%m-%d %H:%M:%S")
-
-    # 통계 계산
-    total_count = len(rows)
-    expired_count = sum(1 for r in rows if r["is_expired"])
-    active_count = total_count - expired_count
-    critical_count = sum(1 for r in rows if not r["is_expired"] and r["total_minutes"] <= 30)
-
-    # 지도용 데이터 생성 (JSON)
-    map_data = []
-    for r in sorted_rows:
-        map_data.append({
-            "name": r["name"],
-            "x": int(r["x"]) if r["x"].isdigit() else 0,
-            "y": int(r["y"]) if r["y"].isdigit() else 0,
-            "is_expired": r["is_expired"],
-            "total_minutes": r["total_minutes"],
-            "countdown": r["countdown"],
-            "date_disp": r.get("date_disp", "-"),
-            "time_disp": r.get("time_disp", "-")
-        })
-
-    import json
-    map_data_json = json.dumps(map_data)
-
-    html_out = f"""<!DOCTYPE html>
-<html lang="ko">
-<head>
-  <meta charset="UTF-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>{html.escape(PAGE_TITLE)}</title>
-  <script src="https://cdn.tailwindcss.com"></script>
-  <style>
-    body {{ box-sizing: border-box; }}
-    .tab-active {{
-      background-color: rgb(59 130 246);
-      color: white;
-    }}
-    .filter-active {{
-      background-color: rgb(59 130 246);
-      color: white;
-    }}
-    #mapView {{
-      position: relative;
-      background: linear-gradient(to bottom right, #f0f9ff, #e0e7ff);
-      border-radius: 0.5rem;
-    }}
-    #mapSvg {{
-      cursor: grab;
-    }}
-    #mapSvg.dragging {{
-      cursor: grabbing;
-    }}
-    .map-marker {{
-      cursor: pointer;
-      transition: opacity 0.2s;
-    }}
-    .map-marker:hover {{
-      opacity: 0.8;
-    }}
-    .map-marker.selected {{
-      filter: drop-shadow(0 0 4px rgba(59, 130, 246, 0.8));
-    }}
-    .map-info-card {{
-      position: absolute;
-      top: 20px;
-      right: 20px;
-      background: white;
-      padding: 16px;
-      border-radius: 12px;
-      box-shadow: 0 10px 25px -5px rgba(0, 0, 0, 0.2), 0 10px 10px -5px rgba(0, 0, 0, 0.1);
-      z-index: 1000;
-      min-width: 280px;
-      max-width: 90%;
-      display: none;
-      border: 2px solid rgb(59 130 246);
-    }}
-    .map-info-card.show {{
-      display: block;
-      animation: slideIn 0.2s ease-out;
-    }}
-    @keyframes slideIn {{
-      from {{
-        opacity: 0;
-        transform: translateY(-10px);
-      }}
-      to {{
-        opacity: 1;
-        transform: translateY(0);
-      }}
-    }}
-    .coord-copy-btn {{
-      cursor: pointer;
-      transition: all 0.2s;
-    }}
-    .coord-copy-btn:hover {{
-      background-color: rgb(59 130 246);
-      color: white;
-    }}
-    .coord-copy-btn:active {{
-      transform: scale(0.95);
-    }}
-    .zoom-controls {{
-      position: absolute;
-      bottom: 20px;
-      right: 20px;
-      display: flex;
-      flex-direction: column;
-      gap: 8px;
-      z-index: 100;
-    }}
-    .zoom-btn {{
-      width: 40px;
-      height: 40px;
-      background: white;
-      border: 2px solid rgb(59 130 246);
-      border-radius: 8px;
-      display: flex;
-      align-items: center;
-      justify-content: center;
-      cursor: pointer;
-      font-size: 20px;
-      font-weight: bold;
-      color: rgb(59 130 246);
-      box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-      transition: all 0.2s;
-      user-select: none;
-    }}
-    .zoom-btn:hover:not([style*="cursor: default"]) {{
-      background: rgb(59 130 246);
-      color: white;
-    }}
-    .zoom-btn:active:not([style*="cursor: default"]) {{
-      transform: scale(0.95);
-    }}
-    #zoomLevel {{
-      min-width: 48px;
-      font-family: monospace;
-      letter-spacing: 0.5px;
-    }}
-    @media (max-width: 768px) {{
-      .stats-grid {{ grid-template-columns: repeat(2, 1fr) !important; }}
-
-      /* 모바일 컨테이너 패딩 줄이기 */
-      .container {{
-        padding-left: 0.5rem !important;
-        padding-right: 0.5rem !important;
-      }}
-
-      /* 모바일 지도 컨테이너 - 화면에 맞춤 */
-      .map-container {{
-        aspect-ratio: auto !important;
-        width: 100% !important;
-        height: 400px !important;
-        max-height: none !important;
-        margin-left: 0;
-        margin-right: 0;
-      }}
-
-      /* 모바일 지도 뷰 섹션 */
-      #mapView {{
-        padding-left: 0.5rem !important;
-        padding-right: 0.5rem !important;
-      }}
-
-      /* 모바일 정보 카드 - 바텀시트 스타일 */
-      .map-info-card {{
-        top: auto;
-        bottom: 0;
-        left: 0;
-        right: 0;
-        transform: none;
-        min-width: auto;
-        width: 100%;
-        max-width: none;
-        border-radius: 16px 16px 0 0;
-        max-height: 50vh;
-        overflow-y: auto;
-        box-shadow: 0 -4px 20px rgba(0, 0, 0, 0.15);
-      }}
-      .map-info-card.show {{
-        animation: slideUpMobile 0.3s ease-out;
-      }}
-
-      /* 모바일 줌 컨트롤 - 더 작고 투명하게 */
-      .zoom-controls {{
-        bottom: 10px;
-        right: 10px;
-        gap: 6px;
-      }}
-      .zoom-btn {{
-        width: 36px;
-        height: 36px;
-        font-size: 18px;
-        background: rgba(255, 255, 255, 0.9);
-        backdrop-filter: blur(8px);
-      }}
-      #zoomLevel {{
-        min-width: 42px;
-        font-size: 11px;
-      }}
-
-    }}
-    @keyframes slideUpMobile {{
-      from {{
-        opacity: 0;
-        transform: translateY(100%);
-      }}
-      to {{
-        opacity: 1;
-        transform: translateY(0);
-      }}
-    }}
-    @keyframes slideInMobile {{
-      from {{
-        opacity: 0;
-        transform: translateX(-50%) translateY(-20px);
-      }}
-      to {{
-        opacity: 1;
-        transform: translateX(-50%) translateY(0);
-      }}
-    }}
-  </style>
-</head>
-<body class="bg-gradient-to-br from-blue-50 to-indigo-100 min-h-screen font-sans">
-  <div class="container mx-auto px-4 py-8 max-w-7xl">
-    <!-- Header -->
-    <header class="text-center mb-8">
-      <h1 class="text-4xl font-bold text-gray-800 mb-2">{html.escape(PAGE_TITLE)}</h1>
-      <p class="text-gray-600">기준 시각: <span id="baseTime">{html.escape(base_time_disp)}</span> (KST)</p>
-      <p class="text-gray-500 text-sm">실시간 카운트다운 업데이트 중</p>
-    </header>
-
-    <!-- Statistics Dashboard -->
-    <div class="grid grid-cols-4 gap-4 mb-6 stats-grid">
-      <div class="bg-white rounded-lg shadow-md p-4 text-center">
-        <div class="text-3xl font-bold text-blue-600">{total_count}</div>
-        <div class="text-sm text-gray-600 mt-1">전체</div>
-      </div>
-      <div class="bg-white rounded-lg shadow-md p-4 text-center">
-        <div class="text-3xl font-bold text-green-600" id="statActive">{active_count}</div>
-        <div class="text-sm text-gray-600 mt-1">보호막 활성</div>
-      </div>
-      <div class="bg-white rounded-lg shadow-md p-4 text-center">
-        <div class="text-3xl font-bold text-gray-400" id="statExpired">{expired_count}</div>
-        <div class="text-sm text-gray-600 mt-1">만료됨</div>
-      </div>
-      <div class="bg-white rounded-lg shadow-md p-4 text-center">
-        <div class="text-3xl font-bold text-red-600" id="statCritical">{critical_count}</div>
-        <div class="text-sm text-gray-600 mt-1">30분 이하</div>
-      </div>
-    </div>
-
-    <!-- Filter Controls -->
-    <div class="bg-white rounded-lg shadow-md p-4 mb-6">
-      <div class="flex flex-wrap gap-3 items-center">
-        <div class="flex gap-2 flex-wrap">
-          <button onclick="filterRows('all')" class="filter-btn filter-active px-4 py-2 rounded-md bg-gray-200 hover:bg-blue-500 hover:text-white transition" data-filter="all">
-            전체
-          </button>
-          <button onclick="filterRows('active')" class="filter-btn px-4 py-2 rounded-md bg-gray-200 hover:bg-blue-500 hover:text-white transition" data-filter="active">
-            보호막 있음
-          </button>
-          <button onclick="filterRows('expired')" class="filter-btn px-4 py-2 rounded-md bg-gray-200 hover:bg-blue-500 hover:text-white transition" data-filter="expired">
-            보호막 없음
-          </button>
-          <button onclick="filterRows('critical')" class="filter-btn px-4 py-2 rounded-md bg-gray-200 hover:bg-blue-500 hover:text-white transition" data-filter="critical">
-            30분 이하
-          </button>
-        </div>
-        <div class="flex-1 min-w-[200px]">
-          <input type="text" id="searchInput" placeholder="커맨더 이름 검색..."
-                 class="w-full px-4 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
-                 oninput="searchCommanders()">
-        </div>
-      </div>
-    </div>
-
-    <!-- View Toggle Tabs -->
-    <div class="bg-white rounded-t-lg shadow-md">
-      <div class="flex border-b border-gray-200">
-        <button onclick="switchView('list')" class="tab-btn tab-active px-6 py-3 font-semibold focus:outline-none" data-view="list">
-          📋 리스트형
-        </button>
-        <button onclick="switchView('map')" class="tab-btn px-6 py-3 font-semibold focus:outline-none" data-view="map">
-          🗺️ 지도형
-        </button>
-      </div>
-    </div>
-
-    <!-- List View -->
-    <div id="listView" class="bg-white rounded-b-lg shadow-md overflow-hidden">
-      <div class="overflow-x-auto">
-        <table class="w-full">
-          <thead class="bg-blue-50 text-left sticky top-0">
-            <tr>
-              <th class="px-6 py-3 text-xs font-semibold text-gray-700 uppercase tracking-wider">Commander</th>
-              <th class="px-6 py-3 text-xs font-semibold text-gray-700 uppercase tracking-wider">좌표</th>
-              <th class="px-6 py-3 text-xs font-semibold text-gray-700 uppercase tracking-wider">방어막 종료 / 남은시간</th>
-            </tr>
-          </thead>
-          <tbody id="commanderTableBody">
-{table_rows_html}
-          </tbody>
-        </table>
-      </div>
-      <div id="noResults" class="hidden text-center py-12 text-gray-500">
-        검색 결과가 없습니다.
-      </div>
-    </div>
-
-    <!-- Map View -->
-    <div id="mapView" class="bg-white rounded-b-lg shadow-md p-6 hidden">
-      <div class="mb-4 flex justify-between items-center flex-wrap gap-3">
-        <h3 class="text-lg font-semibold text-gray-800">라스트워 시즌1 맵 (1000x1000)</h3>
-        <div class="text-sm text-gray-600">
-          <span class="inline-block w-3 h-3 rounded-full bg-green-500 mr-1"></span> 활성
-          <span class="inline-block w-3 h-3 rounded-full bg-red-500 ml-3 mr-1"></span> 긴급
-          <span class="inline-block w-3 h-3 rounded-full bg-gray-400 ml-3 mr-1"></span> 만료
-        </div>
-      </div>
-      <div class="relative border-2 border-gray-300 rounded overflow-hidden map-container" style="aspect-ratio: 1/1; max-height: 700px;">
-        <svg id="mapSvg" class="w-full h-full" viewBox="0 0 1000 1000" preserveAspectRatio="xMidYMid meet" style="display: block;">
-          <!-- Grid lines -->
-          <defs>
-            <pattern id="grid" width="100" height="100" patternUnits="userSpaceOnUse">
-              <path d="M 100 0 L 0 0 0 100" fill="none" stroke="rgba(0,0,0,0.05)" stroke-width="1"/>
-            </pattern>
-          </defs>
-          <rect width="1000" height="1000" fill="url(#grid)" />
-
-          <!-- Markers will be inserted here -->
-          <g id="markers"></g>
-        </svg>
-
-        <!-- Zoom Controls -->
-        <div class="zoom-controls">
-          <div id="zoomLevel" class="zoom-btn" style="font-size: 12px; font-weight: normal; cursor: default; background: rgba(255,255,255,0.95);">×1.0</div>
-          <button class="zoom-btn" onclick="zoomIn()" title="확대">+</button>
-          <button class="zoom-btn" onclick="zoomOut()" title="축소">−</button>
-          <button class="zoom-btn" onclick="resetZoom()" title="초기화" style="font-size: 16px;">⟲</button>
-        </div>
-
-        <!-- Info Card -->
-        <div id="mapInfoCard" class="map-info-card">
-          <!-- 모바일 바텀시트 핸들 -->
-          <div class="md:hidden w-12 h-1 bg-gray-300 rounded-full mx-auto mb-3"></div>
-
-          <div class="flex justify-between items-start mb-3">
-            <h4 class="text-lg font-bold text-gray-800" id="infoName"></h4>
-            <button onclick="closeInfoCard()" class="text-gray-400 hover:text-gray-600 text-xl leading-none">&times;</button>
-          </div>
-          <div class="space-y-2">
-            <div class="text-sm text-gray-600">
-              <span class="font-semibold">상태:</span>
-              <span id="infoStatus" class="ml-2"></span>
-            </div>
-            <div id="infoExpireTime" class="text-sm text-gray-600" style="display: none;">
-              <span class="font-semibold">종료시각:</span>
-              <span id="infoExpireTimeValue" class="ml-2"></span>
-            </div>
-            <div class="text-sm text-gray-600">
-              <span class="font-semibold">남은시간:</span>
-              <span id="infoCountdown" class="ml-2"></span>
-            </div>
-            <div class="pt-2 border-t border-gray-200">
-              <div class="text-xs text-gray-500 mb-1">좌표 (클릭하여 복사)</div>
-              <button id="coordCopyBtn" class="coord-copy-btn w-full px-4 py-2 bg-gray-100 text-gray-800 rounded-md font-mono text-sm font-semibold hover:bg-blue-500 hover:text-white transition">
-              </button>
-            </div>
-          </div>
-        </div>
-      </div>
-    </div>
-
-  </div>
-
-  <script>
-    const BASE_TIME = new Date('{base_time.strftime("%Y-%m-%dT%H:%M:%S")}');
-    const MAP_DATA = {map_data_json};
-    let currentFilter = 'all';
-    let currentView = 'list';
-
-    // 줌 관련 변수
-    let currentZoom = 1;
-    let currentPanX = 0;
-    let currentPanY = 0;
-    let selectedMarker = null;
-
-    // 드래그 관련 변수
-    let isDragging = false;
-    let dragStartX = 0;
-    let dragStartY = 0;
-    let dragStartPanX = 0;
-    let dragStartPanY = 0;
-
-    // 좌표 복사
-    function copyCoordinates(coords) {{
-      if (navigator.clipboard) {{
-        navigator.clipboard.writeText(coords).then(function() {{
-          alert('좌표 ' + coords + ' 복사됨');
-        }}, function() {{
-          alert('복사 실패');
-        }});
-      }} else {{
-        alert('클립보드 권한 없음');
-      }}
-    }}
-
-    // 뷰 전환
-    function switchView(view) {{
-      currentView = view;
-      const listView = document.getElementById('listView');
-      const mapView = document.getElementById('mapView');
-      const tabs = document.querySelectorAll('.tab-btn');
-
-      tabs.forEach(tab => {{
-        if (tab.dataset.view === view) {{
-          tab.classList.add('tab-active');
-        }} else {{
-          tab.classList.remove('tab-active');
-        }}
-      }});
-
-      if (view === 'list') {{
-        listView.classList.remove('hidden');
-        mapView.classList.add('hidden');
-      }} else {{
-        listView.classList.add('hidden');
-        mapView.classList.remove('hidden');
-        // 지도형으로 전환 시에만 렌더링
-        setTimeout(() => renderMap(), 50); // 약간의 딜레이로 중복 방지
-      }}
-    }}
-
-    // 필터 적용
-    function filterRows(filter) {{
-      currentFilter = filter;
-      const rows = document.querySelectorAll('.commander-row');
-      const filterBtns = document.querySelectorAll('.filter-btn');
-      let visibleCount = 0;
-
-      filterBtns.forEach(btn => {{
-        if (btn.dataset.filter === filter) {{
-          btn.classList.add('filter-active');
-        }} else {{
-          btn.classList.remove('filter-active');
-        }}
-      }});
-
-      rows.forEach(row => {{
-        const status = row.dataset.status;
-        const minutes = parseInt(row.dataset.minutes);
-        let show = false;
-
-        if (filter === 'all') show = true;
-        else if (filter === 'active') show = status === 'active';
-        else if (filter === 'expired') show = status === 'expired';
-        else if (filter === 'critical') show = status === 'active' && minutes <= 30;
-
-        if (show) {{
-          row.style.display = '';
-          visibleCount++;
-        }} else {{
-          row.style.display = 'none';
-        }}
-      }});
-
-      document.getElementById('noResults').classList.toggle('hidden', visibleCount > 0);
-      updateStats();
-      if (currentView === 'map') renderMap();
-    }}
-
-    // 검색
-    function searchCommanders() {{
-      const searchTerm = document.getElementById('searchInput').value.toLowerCase();
-      const rows = document.querySelectorAll('.commander-row');
-      let visibleCount = 0;
-
-      rows.forEach(row => {{
-        const name = row.dataset.name;
-        const matchesSearch = name.includes(searchTerm);
-        const status = row.dataset.status;
-        const minutes = parseInt(row.dataset.minutes);
-        let matchesFilter = false;
-
-        if (currentFilter === 'all') matchesFilter = true;
-        else if (currentFilter === 'active') matchesFilter = status === 'active';
-        else if (currentFilter === 'expired') matchesFilter = status === 'expired';
-        else if (currentFilter === 'critical') matchesFilter = status === 'active' && minutes <= 30;
-
-        if (matchesSearch && matchesFilter) {{
-          row.style.display = '';
-          visibleCount++;
-        }} else {{
-          row.style.display = 'none';
-        }}
-      }});
-
-      document.getElementById('noResults').classList.toggle('hidden', visibleCount > 0);
-      if (currentView === 'map') renderMap();
-    }}
-
-    // 통계 업데이트
-    function updateStats() {{
-      const rows = document.querySelectorAll('.commander-row');
-      let active = 0, expired = 0, critical = 0;
-
-      rows.forEach(row => {{
-        const status = row.dataset.status;
-        const minutes = parseInt(row.dataset.minutes);
-
-        if (status === 'active') {{
-          active++;
-          if (minutes <= 30) critical++;
-        }} else {{
-          expired++;
-        }}
-      }});
-
-      document.getElementById('statActive').textContent = active;
-      document.getElementById('statExpired').textContent = expired;
-      document.getElementById('statCritical').textContent = critical;
-    }}
-
-    // 줌 레벨 표시 업데이트
-    function updateZoomDisplay() {{
-      const zoomLevelEl = document.getElementById('zoomLevel');
-      if (zoomLevelEl) {{
-        zoomLevelEl.textContent = `×${{currentZoom.toFixed(1)}}`;
-        // 확대 상태 시각적 표시
-        if (currentZoom > 1) {{
-          zoomLevelEl.style.background = 'rgb(59 130 246)';
-          zoomLevelEl.style.color = 'white';
-          zoomLevelEl.style.fontWeight = 'bold';
-        }} else {{
-          zoomLevelEl.style.background = 'rgba(255,255,255,0.95)';
-          zoomLevelEl.style.color = 'rgb(59 130 246)';
-          zoomLevelEl.style.fontWeight = 'normal';
-        }}
-      }}
-    }}
-
-    // 줌 기능
-    function updateViewBox() {{
-      const svg = document.getElementById('mapSvg');
-      const size = 1000 / currentZoom;
-      const x = currentPanX - size / 2;
-      const y = currentPanY - size / 2;
-      svg.setAttribute('viewBox', `${{x}} ${{y}} ${{size}} ${{size}}`);
-      updateZoomDisplay();
-    }}
-
-    function zoomIn() {{
-      if (currentZoom < 5) {{
-        currentZoom *= 1.5;
-        if (currentZoom > 5) currentZoom = 5;
-        updateViewBox();
-      }}
-    }}
-
-    function zoomOut() {{
-      if (currentZoom > 1) {{
-        currentZoom /= 1.5;
-        if (currentZoom < 1) currentZoom = 1;
-        updateViewBox();
-      }}
-    }}
-
-    function resetZoom() {{
-      currentZoom = 1;
-      currentPanX = 500;
-      currentPanY = 500;
-      updateViewBox();
-    }}
-
-    // 정보 카드 표시
-    function showInfoCard(commander) {{
-      const infoCard = document.getElementById('mapInfoCard');
-      const infoName = document.getElementById('infoName');
-      const infoStatus = document.getElementById('infoStatus');
-      const infoExpireTime = document.getElementById('infoExpireTime');
-      const infoExpireTimeValue = document.getElementById('infoExpireTimeValue');
-      const infoCountdown = document.getElementById('infoCountdown');
-      const coordCopyBtn = document.getElementById('coordCopyBtn');
-
-      infoName.textContent = commander.name;
-
-      // 상태 표시
-      if (commander.is_expired) {{
-        infoStatus.innerHTML = '<span class="text-gray-500">🔴 만료됨</span>';
-        infoExpireTime.style.display = 'none';
-      }} else if (commander.total_minutes <= 30) {{
-        infoStatus.innerHTML = '<span class="text-red-600">⚠️ 긴급 (30분 이하)</span>';
-        infoExpireTime.style.display = 'block';
-        infoExpireTimeValue.textContent = `${{commander.date_disp}} ${{commander.time_disp}}`;
-      }} else {{
-        infoStatus.innerHTML = '<span class="text-green-600">✅ 활성</span>';
-        infoExpireTime.style.display = 'block';
-        infoExpireTimeValue.textContent = `${{commander.date_disp}} ${{commander.time_disp}}`;
-      }}
-
-      infoCountdown.textContent = commander.countdown;
-
-      const coords = `${{commander.x}}, ${{commander.y}}`;
-      coordCopyBtn.textContent = `(${{coords}})`;
-      coordCopyBtn.onclick = () => {{
-        copyCoordinates(coords);
-        coordCopyBtn.textContent = '✓ 복사됨!';
-        setTimeout(() => {{
-          coordCopyBtn.textContent = `(${{coords}})`;
-        }}, 1500);
-      }};
-
-      infoCard.classList.add('show');
-    }}
-
-    // 정보 카드 닫기
-    function closeInfoCard() {{
-      document.getElementById('mapInfoCard').classList.remove('show');
-    }}
-
-    // 지도 렌더링 - DOM 데이터 기반 (실시간 반영)
-    function renderMap() {{
-      const markersGroup = document.getElementById('markers');
-      if (!markersGroup) return; // 마커 그룹이 없으면 중단
-
-      const searchTerm = document.getElementById('searchInput').value.toLowerCase();
-
-      // 기존 마커 완전히 제거 (중복 방지)
-      while (markersGroup.firstChild) {{
-        markersGroup.removeChild(markersGroup.firstChild);
-      }}
-
-      // 지도 재렌더링 시 선택 초기화
-      selectedMarker = null;
-
-      // DOM의 row 데이터를 사용 (실시간으로 업데이트되는 데이터)
-      const rows = document.querySelectorAll('.commander-row');
-
-      rows.forEach(row => {{
-        // DOM에서 실시간 데이터 읽기
-        const name = row.querySelector('td:first-child').textContent.trim();
-        const x = parseInt(row.dataset.x);
-        const y = parseInt(row.dataset.y);
-        const status = row.dataset.status; // 'active' or 'expired'
-        const minutes = parseInt(row.dataset.minutes);
-        const datetime = row.dataset.datetime;
-
-        // 좌표가 유효하지 않으면 스킵
-        if (isNaN(x) || isNaN(y)) return;
-
-        // 필터 체크
-        const matchesSearch = name.toLowerCase().includes(searchTerm);
-        let matchesFilter = false;
-
-        if (currentFilter === 'all') matchesFilter = true;
-        else if (currentFilter === 'active') matchesFilter = status === 'active';
-        else if (currentFilter === 'expired') matchesFilter = status === 'expired';
-        else if (currentFilter === 'critical') matchesFilter = status === 'active' && minutes <= 30;
-
-        if (!matchesSearch || !matchesFilter) return;
-
-        // 색상 결정 - 실시간 상태 기반
-        let color;
-        if (status === 'expired') {{
-          color = '#9CA3AF'; // gray
-        }} else if (minutes <= 30) {{
-          color = '#EF4444'; // red
-        }} else {{
-          color = '#10B981'; // green
-        }}
-
-        // 카운트다운 텍스트 가져오기
-        const countdownEl = row.querySelector('.countdown-display');
-        const countdown = countdownEl ? countdownEl.textContent : '정보 없음';
-
-        // 날짜/시간 정보 가져오기
-        const timeDisplayEl = row.querySelector('.time-display');
-        let dateDisp = '-';
-        let timeDisp = '-';
-        if (timeDisplayEl) {{
-          const dateEl = timeDisplayEl.querySelector('.text-xs');
-          const timeEl = timeDisplayEl.querySelector('div:not(.text-xs)');
-          if (dateEl) dateDisp = dateEl.textContent.trim();
-          if (timeEl) timeDisp = timeEl.textContent.trim();
-        }}
-
-        const circle = document.createElementNS('http://www.w3.org/2000/svg', 'circle');
-        circle.setAttribute('cx', x);
-        circle.setAttribute('cy', 1000 - y); // Y축 반전
-
-        // 모바일에서 마커 크기 증가
-        const isMobile = window.innerWidth <= 768;
-        circle.setAttribute('r', isMobile ? '10' : '8');
-        circle.setAttribute('stroke-width', isMobile ? '3' : '2');
-
-        circle.setAttribute('fill', color);
-        circle.setAttribute('stroke', 'white');
-        circle.classList.add('map-marker');
-        circle.dataset.name = name;
-
-        circle.addEventListener('click', (e) => {{
-          e.stopPropagation();
-
-          // 이전 선택된 마커 하이라이트 제거
-          if (selectedMarker) {{
-            selectedMarker.classList.remove('selected');
-          }}
-
-          // 현재 마커 하이라이트
-          circle.classList.add('selected');
-          selectedMarker = circle;
-
-          // 실시간 데이터로 정보 카드 표시
-          const commanderData = {{
-            name: name,
-            x: x,
-            y: y,
-            is_expired: status === 'expired',
-            total_minutes: minutes,
-            countdown: countdown,
-            date_disp: dateDisp,
-            time_disp: timeDisp
-          }};
-
-          showInfoCard(commanderData);
-
-          // 클릭한 마커로 부드럽게 이동 (확대 없이)
-          // 확대된 상태일 때만 센터링
-          if (currentZoom > 1) {{
-            currentPanX = x;
-            currentPanY = 1000 - y;
-            updateViewBox();
-          }}
-        }});
-
-        markersGroup.appendChild(circle);
-      }});
-    }}
-
-    // 맵 영역 클릭 시 정보 카드 닫기 및 줌 초기화
-    document.addEventListener('DOMContentLoaded', () => {{
-      const mapSvg = document.getElementById('mapSvg');
-      const mapContainer = mapSvg.parentElement;
-
-      if (mapSvg) {{
-        let clickTimeout = null;
-        let isClick = true;
-
-        mapSvg.addEventListener('mousedown', (e) => {{
-          // 마커 클릭이 아닐 때만 드래그 시작
-          if (e.target === mapSvg || e.target.tagName === 'rect' || e.target.tagName === 'g') {{
-            isDragging = true;
-            isClick = true;
-            dragStartX = e.clientX;
-            dragStartY = e.clientY;
-            dragStartPanX = currentPanX;
-            dragStartPanY = currentPanY;
-            mapSvg.classList.add('dragging');
-          }}
-        }});
-
-        mapSvg.addEventListener('mousemove', (e) => {{
-          if (isDragging) {{
-            isClick = false;
-            const rect = mapSvg.getBoundingClientRect();
-            const scaleX = 1000 / currentZoom / rect.width;
-            const scaleY = 1000 / currentZoom / rect.height;
-            const dx = (e.clientX - dragStartX) * scaleX;
-            const dy = (e.clientY - dragStartY) * scaleY;
-
-            currentPanX = dragStartPanX - dx;
-            currentPanY = dragStartPanY - dy;
-
-            // 맵 경계 제한
-            const halfSize = 500 / currentZoom;
-            currentPanX = Math.max(halfSize, Math.min(1000 - halfSize, currentPanX));
-            currentPanY = Math.max(halfSize, Math.min(1000 - halfSize, currentPanY));
-
-            updateViewBox();
-          }}
-        }});
-
-        mapSvg.addEventListener('mouseup', (e) => {{
-          if (isDragging) {{
-            isDragging = false;
-            mapSvg.classList.remove('dragging');
-
-            // 드래그가 아니라 클릭이었다면
-            if (isClick) {{
-              closeInfoCard();
-              if (selectedMarker) {{
-                selectedMarker.classList.remove('selected');
-                selectedMarker = null;
-              }}
-            }}
-          }}
-        }});
-
-        mapSvg.addEventListener('mouseleave', () => {{
-          if (isDragging) {{
-            isDragging = false;
-            mapSvg.classList.remove('dragging');
-          }}
-        }});
-
-        // 터치 드래그 및 핀치 줌
-        let touchStartForDrag = null;
-        let touchStartDistance = 0;
-        let touchStartZoom = 1;
-
-        mapContainer.addEventListener('touchstart', (e) => {{
-          if (e.touches.length === 1) {{
-            // 단일 터치 - 드래그
-            const touch = e.touches[0];
-            if (e.target === mapSvg || e.target.tagName === 'rect' || e.target.tagName === 'g') {{
-              isDragging = true;
-              isClick = true;
-              touchStartForDrag = touch;
-              dragStartX = touch.clientX;
-              dragStartY = touch.clientY;
-              dragStartPanX = currentPanX;
-              dragStartPanY = currentPanY;
-            }}
-          }} else if (e.touches.length === 2) {{
-            // 핀치 줌
-            isDragging = false;
-            const dx = e.touches[0].clientX - e.touches[1].clientX;
-            const dy = e.touches[0].clientY - e.touches[1].clientY;
-            touchStartDistance = Math.sqrt(dx * dx + dy * dy);
-            touchStartZoom = currentZoom;
-          }}
-        }});
-
-        mapContainer.addEventListener('touchmove', (e) => {{
-          if (e.touches.length === 1 && isDragging) {{
-            // 단일 터치 드래그
-            e.preventDefault();
-            isClick = false;
-            const touch = e.touches[0];
-            const rect = mapSvg.getBoundingClientRect();
-            const scaleX = 1000 / currentZoom / rect.width;
-            const scaleY = 1000 / currentZoom / rect.height;
-            const dx = (touch.clientX - dragStartX) * scaleX;
-            const dy = (touch.clientY - dragStartY) * scaleY;
-
-            currentPanX = dragStartPanX - dx;
-            currentPanY = dragStartPanY - dy;
-
-            // 맵 경계 제한
-            const halfSize = 500 / currentZoom;
-            currentPanX = Math.max(halfSize, Math.min(1000 - halfSize, currentPanX));
-            currentPanY = Math.max(halfSize, Math.min(1000 - halfSize, currentPanY));
-
-            updateViewBox();
-          }} else if (e.touches.length === 2) {{
-            // 핀치 줌
-            e.preventDefault();
-            isDragging = false;
-            const dx = e.touches[0].clientX - e.touches[1].clientX;
-            const dy = e.touches[0].clientY - e.touches[1].clientY;
-            const distance = Math.sqrt(dx * dx + dy * dy);
-            const scale = distance / touchStartDistance;
-            const newZoom = touchStartZoom * scale;
-
-            if (newZoom >= 1 && newZoom <= 5) {{
-              currentZoom = newZoom;
-              updateViewBox();
-            }}
-          }}
-        }});
-
-        mapContainer.addEventListener('touchend', () => {{
-          if (isDragging && isClick) {{
-            // 클릭으로 간주
-            closeInfoCard();
-            if (selectedMarker) {{
-              selectedMarker.classList.remove('selected');
-              selectedMarker = null;
-            }}
-          }}
-          isDragging = false;
-        }});
-
-        // 마우스 휠로 줌
-        mapContainer.addEventListener('wheel', (e) => {{
-          e.preventDefault();
-          if (e.deltaY < 0) {{
-            zoomIn();
-          }} else {{
-            zoomOut();
-          }}
-        }});
-      }}
-
-      // 줌 초기화
-      currentPanX = 500;
-      currentPanY = 500;
-      updateZoomDisplay();
-    }});
-
-    // 실시간 카운트다운 업데이트
-    function updateCountdowns() {{
-      const now = new Date();
-      const rows = document.querySelectorAll('.commander-row');
-      let needsStatsUpdate = false;
-
-      rows.forEach(row => {{
-        const datetime = row.dataset.datetime;
-        if (!datetime) return;
-
-        const expireTime = new Date(datetime);
-        const diff = expireTime - now;
-
-        if (diff <= 0) {{
-          const countdownEl = row.querySelector('.countdown-display');
-          if (countdownEl && !countdownEl.classList.contains('text-gray-400')) {{
-            countdownEl.textContent = '만료됨';
-            countdownEl.classList.remove('text-red-600', 'font-bold');
-            countdownEl.classList.add('text-gray-400');
-            row.dataset.status = 'expired';
-            row.dataset.minutes = '-1';
-            needsStatsUpdate = true;
-          }}
-        }} else {{
-          const totalMinutes = Math.floor(diff / 1000 / 60);
-          const hours = Math.floor(totalMinutes / 60);
-          const minutes = totalMinutes % 60;
-          const seconds = Math.floor((diff / 1000) % 60);
-
-          // 이전 값과 비교
-          const oldMinutes = parseInt(row.dataset.minutes);
-          if (oldMinutes !== totalMinutes) {{
-            // 30분 경계를 넘었는지 확인
-            if ((oldMinutes > 30 && totalMinutes <= 30) || (oldMinutes <= 30 && totalMinutes > 30)) {{
-              needsStatsUpdate = true;
-            }}
-            row.dataset.minutes = totalMinutes;
-          }}
-
-          const countdownEl = row.querySelector('.countdown-display');
-          if (countdownEl) {{
-            if (hours > 0) {{
-              countdownEl.textContent = `${{hours}}시간 ${{minutes}}분`;
-            }} else {{
-              countdownEl.textContent = `${{minutes}}분 ${{seconds}}초`;
-            }}
-          }}
-        }}
-      }});
-
-      // 통계 업데이트가 필요한 경우에만 실행
-      if (needsStatsUpdate) {{
-        updateStats();
-        // 지도형이 활성화되어 있으면 지도도 업데이트
-        if (currentView === 'map') {{
-          renderMap();
-        }}
-      }}
-    }}
-
-    // 1초마다 카운트다운 업데이트
-    setInterval(updateCountdowns, 1000);
-
-    // 초기 렌더링
-    updateCountdowns();
-    updateStats();
-  </script>
-</body>
-</html>
-"""
-    return html_out
-
-
-########################################
-# 메인 실행부
-########################################
-
-def main():
-    # 기준 시각 파싱
-    base_time = datetime.strptime(BASE_TIME_STR, "%Y-%m-%d %H:%M:%S")
-
-    # txt 읽기
-    with open(TEXT_FILE, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    # 파싱
-    rows = parse_txt_lines(lines, base_time)
-
-    # HTML 생성
-    html_result = build_html(rows, base_time)
-
-    # 저장
-    with open(OUTPUT_HTML, "w", encoding="utf-8") as f:
-        f.write(html_result)
-
-    print(f"완료: {OUTPUT_HTML} 에 HTML 생성됨")
-
-
-if __name__ == "__main__":
-    main()
-
+import functools
+import os
+import re
+from datetime import datetime, timedelta, timezone
+
+########################################
+# 설정값: CLI 인자를 안 줬을 때 쓰는 기본값
+########################################
+
+TEXT_FILE = "./new.txt"  # 쉴드/좌표 목록 txt
+BASE_TIME_STR = "2025-11-05 09:52:30"  # 기준 시각 (BASE_TZ 기준)
+BASE_TZ = "Asia/Seoul"  # 기준 시각의 시간대 (IANA 이름)
+OUTPUT_HTML = "./baad_shield_output.html"  # 만들어질 HTML 파일 경로
+STATE_JSON = "./baad_shield_state.json"  # 직전 파싱 결과 (다음 실행 때 델타 계산용)
+DELTA_JSON = "./baad_shield_delta.json"  # 직전 덤프 대비 변경분 (페이지가 폴링해서 적용)
+IDENTITY_JSON = "./baad_shield_identity.json"  # 덤프 사이 커맨더 식별 인덱스 (개명/이사해도 같은 ID)
+TARGETS_JSON = "./baad_shield_targets.json"  # 연맹원별 가까운 타겟 (--targets-for 를 줬을 때)
+PRODUCTION_BUILD = False  # True: Tailwind CDN 없이 인라인 CSS + 해시 파일명 .gz/.br 생성
+OFFLINE_SHELL = False  # True: 서비스 워커 + 웹 앱 매니페스트를 같이 씀 (재방문 때 네트워크 없이 바로 표시, --offline)
+PLAN_MARCH_SPEED = 60  # 공격 순서 플래너 행군 속도 (좌표 단위 / 분)
+PLAN_HORIZON_MIN = 60  # 플래너가 계획하는 시간 범위 (분)
+
+PAGE_TITLE = "🐑 사냥"
+HEADER_BADGE = "🏰"
+SECTION_TITLE = "🐑🏠"
+
+
+########################################
+# 유틸 함수들
+########################################
+
+WEEKDAY_KR = ['월', '화', '수', '목', '금', '토', '일']
+
+
+def escape_html(text):
+    """
+    html.escape(text, quote=True) 와 같은 결과
+    (html 패키지는 html.entities 까지 불러와서 기동이 느려지므로 직접 치환)
+    """
+    return (text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+            .replace('"', "&quot;").replace("'", "&#x27;"))
+
+
+def write_atomic(path, data):
+    """
+    data(bytes 또는 str) 를 같은 디렉터리의 임시 파일에 다 쓴 뒤 os.replace 로 바꿔 끼움
+    (읽는 쪽 - 브라우저 폴링, 정적 서버 - 이 반쯤 쓴 파일을 보는 일이 없음)
+    """
+    import tempfile
+
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".",
+                                    suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# tzdata 가 없는 환경(윈도우 등)용 대체 시간대
+KST = timezone(timedelta(hours=9), "KST")
+
+
+def parse_base_time(text, tz_name=BASE_TZ):
+    """
+    "2025-11-05 09:52:30" + "Asia/Seoul" -> 시간대가 붙은 datetime
+    zoneinfo 데이터가 없으면 Asia/Seoul 에 한해 고정 +09:00 으로 대체
+    """
+    # strptime 은 첫 호출 때 _strptime/locale 을 불러와서 느림
+    naive = datetime.fromisoformat(text)
+    return naive.replace(tzinfo=resolve_tz(tz_name))
+
+
+def resolve_tz(tz_name=BASE_TZ):
+    """IANA 이름 -> tzinfo (zoneinfo 데이터가 없으면 Asia/Seoul 에 한해 고정 +09:00)"""
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(tz_name)
+    except (ImportError, KeyError):
+        if tz_name != "Asia/Seoul":
+            raise
+        return KST
+
+
+# "2d 3h", "1h 38m", "45s" 의 한 토큰 (숫자 + 단위)
+DURATION_TOKEN_RE = re.compile(r"(\d+) *([dhms])")
+DURATION_TEXT_RE = re.compile(r"(?:\d+ *[dhms] *)*")
+DURATION_UNIT_SEC = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+
+
+@functools.lru_cache(maxsize=8192)
+def parse_duration(duration_text):
+    """
+    남은시간 문자열 -> 총 초
+    "1h 38m" -> 5880
+    "26m" -> 1560
+    "2d 3h" -> 183600
+    "45s" -> 45
+    빈 문자열이나 이상한 값 -> 0
+    덤프 안의 남은시간 문자열 종류는 적으므로 결과를 캐시해 둠
+    """
+    duration_text = duration_text.strip()
+    if not duration_text or not DURATION_TEXT_RE.fullmatch(duration_text):
+        return 0
+    return sum(int(num) * DURATION_UNIT_SEC[unit] for num, unit in DURATION_TOKEN_RE.findall(duration_text))
+
+
+def format_countdown(total_seconds):
+    """남은 초 -> "X시간 Y분" (1시간 이상) 또는 "Y분 Z초" (페이지 카운트다운과 같은 형식)"""
+    hours, rem = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(rem, 60)
+    if hours == 0:
+        return f"{minutes}분 {seconds}초"
+    return f"{hours}시간 {minutes}분"
+
+
+def format_expire_info(base_time, total_seconds):
+    """
+    기준 시각(시간대 포함) + 남은시간(초) -> 만료 시각(UTC epoch 초), 화면용 날짜/시간(오전/오후 HH:MM),
+    남은시간 표시("X시간 Y분" 또는 "Y분 Z초"), total_seconds / total_minutes(정렬용)
+    화면용 날짜/시간은 기준 시각의 시간대로 만든 기본값이고, 페이지에서 보는 사람 시간대로 다시 표시함
+    """
+    expire_ts = int(base_time.timestamp()) + total_seconds
+    expire_dt = datetime.fromtimestamp(expire_ts, base_time.tzinfo)
+
+    # "10/27 (월)"
+    mon = expire_dt.month
+    day = expire_dt.day
+    weekday = WEEKDAY_KR[expire_dt.weekday()]
+    date_disp = f"{mon:02d}/{day:02d} ({weekday})"
+
+    # "오전/오후 HH:MM"
+    hour24 = expire_dt.hour
+    minute = expire_dt.minute
+    ampm = "오전" if hour24 < 12 else "오후"
+    hour12 = hour24 % 12
+    if hour12 == 0:
+        hour12 = 12
+    time_disp = f"{ampm} {hour12:02d}:{minute:02d}"
+
+    return {
+        "expire_ts": expire_ts,
+        "date_disp": date_disp,
+        "time_disp": time_disp,
+        "countdown": format_countdown(total_seconds),
+        "total_seconds": total_seconds,
+        "total_minutes": total_seconds // 60,
+    }
+
+
+def build_row_html(row, compact=False):
+    """
+    row dict -> <tr>...</tr> HTML
+    row keys:
+      name, id(없으면 name 을 키로), coord, is_expired(bool)
+      if expired:
+          countdown='지남', date_disp/time_disp='-', expire_ts=None
+      else:
+          date_disp, time_disp, countdown, expire_ts
+    compact=True 이면 반복되는 Tailwind 클래스 묶음을 짧은 클래스(COMPACT_ROW_CLASSES)로
+    바꾸고 줄바꿈/들여쓰기와 행마다 붙던 onclick 을 뺀다 (프로덕션 빌드용)
+    """
+    esc_name = escape_html(row["name"])
+    esc_key = escape_html(row.get("id", row["name"]))
+    coord_txt = f"{row['x']}, {row['y']}"
+
+    if row["is_expired"]:
+        date_html = '<div class="text-xs text-gray-400">만료</div>'
+        time_html = '<div class="text-gray-400">-</div>'
+        cd_class = "text-gray-400"
+        cd_text = escape_html(row["countdown"])
+        data_expire_attr = ""
+        time_block_class = "text-gray-400"
+        data_status = "expired"
+        data_minutes = "-1"
+    else:
+        date_html = f'<div class="text-xs text-gray-500">{escape_html(row["date_disp"])}</div>'
+        time_html = f'<div>{escape_html(row["time_disp"])}</div>'
+        cd_class = "text-red-600 font-bold"
+        cd_text = escape_html(row["countdown"])
+        data_expire_attr = str(row["expire_ts"])
+        time_block_class = "text-gray-600"
+        data_status = "active"
+        data_minutes = str(row["total_minutes"])
+
+    if compact:
+        x, y = row["x"], row["y"]
+        # 좌표 복사는 tbody 이벤트 위임(.cc)으로 처리
+        return (f'<tr class="commander-row" data-expire="{data_expire_attr}" data-status="{data_status}" '
+                f'data-minutes="{data_minutes}" data-key="{esc_key}" data-name="{esc_name.lower()}" data-x="{x}" data-y="{y}">'
+                f'<td class="cn">{esc_name}</td>'
+                f'<td class="cc">({coord_txt})</td>'
+                f'<td class="ct"><div class="cf"><div class="time-display {time_block_class}">{date_html}{time_html}</div>'
+                f'<span class="countdown-display cd {cd_class}">{cd_text}</span></div></td></tr>')
+
+    return f'''<tr class="hover:bg-gray-50 commander-row" data-expire="{data_expire_attr}" data-status="{data_status}" data-minutes="{data_minutes}" data-key="{esc_key}" data-name="{esc_name.lower()}" data-x="{row['x']}" data-y="{row['y']}">
+  <td class="px-6 py-4 text-sm text-gray-900 font-medium">{esc_name}</td>
+  <td class="px-6 py-4 text-sm text-blue-600 cursor-pointer hover:text-blue-800 hover:underline" onclick="copyCoordinates('{coord_txt}')">({coord_txt})</td>
+  <td class="px-6 py-4 text-sm">
+    <div class="flex items-center justify-between">
+      <div class="time-display {time_block_class}">
+        {date_html}
+        {time_html}
+      </div>
+      <span class="countdown-display text-xs font-mono ml-4 {cd_class}">{cd_text}</span>
+    </div>
+  </td>
+</tr>'''
+
+
+########################################
+# 파서: txt를 읽어서 row 리스트로 변환
+########################################
+
+# 메인 라인: "이름\t연맹\tHQ\t(x, y)\t-"  (마지막 칸 "-" 만료 / "" 쉴드 있음 / 없을 수도 있음)
+COORD_PATTERN = r"-?\d+"  # 좌표 숫자 한 칸 (음수 허용)
+RECORD_LINE_RE = re.compile(
+    r"\ufeff?(?P<name>[^\t]*)\t(?P<alliance>[^\t]*)\t(?P<hq>[^\t]*)\t"
+    r"\(? *(?P<x>" + COORD_PATTERN + r") *, *(?P<y>" + COORD_PATTERN + r") *\)? *(?:\t(?P<last>[^\t]*))?"
+)
+COORD_RE = re.compile(COORD_PATTERN)
+# 남은시간 라인: "1h 38m", "26m", "2d 3h", "45s" ...
+DURATION_LINE_RE = re.compile(r"(?:\d+ *[dhms] *)+$")
+SHIELD_MARK = "🛡"
+
+
+def coord_int(text):
+    """row 의 x/y 문자열 -> int. 파서의 좌표 형식(COORD_PATTERN)이 아니면 None"""
+    return int(text) if COORD_RE.fullmatch(text) else None
+
+
+class RecordTokenizer:
+    """
+    한 줄씩 넣으면 완성된 레코드를 돌려주는 상태 기계 (되돌아가서 다시 읽지 않음)
+
+    정상 형식:
+        메인 라인(마지막 칸 "-")            -> 만료 레코드 즉시 완성
+        메인 라인 / 🛡️ / 남은시간           -> 쉴드 레코드 완성
+    🛡️ 줄이 빠지거나 중복돼도 남은시간 줄이 오면 그대로 완성하고,
+    남은시간 없이 다음 메인 라인이 오면 이전 레코드는 버리고 새 레코드로 재동기화.
+    이상한 부분은 issues 에 (줄번호, 메시지) 로 기록 (줄번호는 1부터).
+
+    record: 튜플 (line_no, name, alliance, hq, x, y, duration)
+        hq 는 int or None, x/y 는 str, duration 은 남은시간 문자열 (만료면 None)
+    """
+
+    def __init__(self, issues=None):
+        self.issues = issues if issues is not None else []
+        self.line_no = 0
+        self._pending = None
+        self._pending_shield = False
+
+    def _drop_pending(self, reason):
+        pending = self._pending
+        self.issues.append((pending[0], f"{pending[1]}: {reason}"))
+        self._pending = None
+
+    def feed(self, raw_line):
+        """한 줄 처리 -> 이번 줄로 완성된 레코드 (없으면 None)"""
+        self.line_no += 1
+        line = raw_line.strip()
+        if not line:
+            return None
+
+        # 줄 종류 판별: 탭 있으면 메인 라인 후보, 없으면 첫 글자/남은시간 정규식 (줄마다 정규식 최대 1번)
+        if "\t" not in line:
+            if line.startswith(SHIELD_MARK):
+                if self._pending is None:
+                    self.issues.append((self.line_no, "레코드 없는 🛡️ 줄 (무시)"))
+                elif self._pending_shield:
+                    self.issues.append((self.line_no, f"{self._pending[1]}: 🛡️ 줄 중복 (무시)"))
+                self._pending_shield = True
+                return None
+
+            if DURATION_LINE_RE.match(line):
+                record = self._pending
+                if record is None:
+                    self.issues.append((self.line_no, f"레코드 없는 남은시간 줄 '{line}' (무시)"))
+                    return None
+                if not self._pending_shield:
+                    self.issues.append((record[0], f"{record[1]}: 🛡️ 줄 없음 (남은시간으로 복구)"))
+                self._pending = None
+                return record[:6] + (line,)
+
+            m = None
+        else:
+            m = RECORD_LINE_RE.match(line)
+
+        if m is None:
+            # 알 수 없는 줄: 레코드 중간이면 보고만 하고 다음 좌표 줄에서 재동기화
+            if self._pending is not None:
+                self.issues.append((self.line_no, f"{self._pending[1]}: 알 수 없는 줄 '{line[:40]}'"))
+            return None
+
+        name, alliance, hq, x, y, last = m.groups()
+
+        # 메인 라인
+        if self._pending is not None:
+            self._drop_pending("남은시간 줄 없이 다음 레코드 시작 (건너뜀)")
+        hq = hq.strip()
+        record = (self.line_no, name.strip(), alliance.strip(), int(hq) if hq.isdigit() else None, x, y, None)
+        if last is not None and last.strip() == "-":
+            return record
+        self._pending = record
+        self._pending_shield = False
+        return None
+
+    def close(self):
+        """입력 끝 처리 (남은시간 없이 끝난 레코드는 버리고 보고)"""
+        if self._pending is not None:
+            self._drop_pending("남은시간 줄 없이 입력 끝 (건너뜀)")
+
+
+def iter_records(lines, issues=None):
+    """lines -> 레코드 제너레이터 (RecordTokenizer 단일 패스)"""
+    tokenizer = RecordTokenizer(issues)
+    feed = tokenizer.feed
+    for line in lines:
+        record = feed(line)
+        if record is not None:
+            yield record
+    tokenizer.close()
+
+
+def record_to_row(record, base_time, expire_cache=None):
+    """
+    토크나이저 레코드 + 기준 시각 -> row dict
+    expire_cache: 남은시간 문자열 -> format_expire_info 결과 (같은 기준 시각 안에서 재사용)
+    """
+    _, name, alliance, hq, x, y, duration = record
+    if duration is None:
+        # 이미 만료된 상태
+        return {
+            "name": name,
+            "alliance": alliance,
+            "hq": hq,
+            "x": x,
+            "y": y,
+            "is_expired": True,
+            "countdown": "지남",
+            "date_disp": "-",
+            "time_disp": "-",
+            "expire_ts": None,
+            "total_seconds": -1,
+            "total_minutes": -1,
+        }
+
+    info = expire_cache.get(duration) if expire_cache is not None else None
+    if info is None:
+        info = format_expire_info(base_time, parse_duration(duration))
+        if expire_cache is not None:
+            expire_cache[duration] = info
+    return {
+        "name": name,
+        "alliance": alliance,
+        "hq": hq,
+        "x": x,
+        "y": y,
+        "is_expired": False,
+        "countdown": info["countdown"],
+        "date_disp": info["date_disp"],
+        "time_disp": info["time_disp"],
+        "expire_ts": info["expire_ts"],
+        "total_seconds": info["total_seconds"],
+        "total_minutes": info["total_minutes"],
+    }
+
+
+def parse_txt_lines(lines, base_time, issues=None):
+    """
+    lines: txt 전체 라인 리스트 (또는 라인 이터러블)
+    base_time: datetime 기준 시각 (시간대 포함, parse_base_time 결과)
+    issues: 리스트를 주면 형식이 깨진 부분을 (줄번호, 메시지) 로 채워줌
+    return: rows(list of dict)
+        {
+          "name": str,
+          "alliance": str,
+          "hq": int or None,
+          "x": str,
+          "y": str,
+          "is_expired": bool,
+          "countdown": str,           # "지남" or "X시간 Y분" 등
+          "date_disp": ...,
+          "time_disp": ...,
+          "expire_ts": int or None,   # 만료 시각 UTC epoch 초
+          "total_seconds": int,       # 정렬용 (만료는 -1)
+          "total_minutes": int        # total_seconds // 60 (만료는 -1)
+        }
+    """
+    rows = []
+    expire_cache = {}
+    tokenizer = RecordTokenizer(issues)
+    feed = tokenizer.feed
+    for line in lines:
+        record = feed(line)
+        if record is not None:
+            rows.append(record_to_row(record, base_time, expire_cache))
+    tokenizer.close()
+    return rows
+
+
+def rebase_rows(rows, base_time):
+    """
+    다른 기준 시각으로 파싱된 rows -> base_time 기준으로 다시 계산한 새 rows
+    (만료 시각 expire_ts 는 그대로, 그 시각에 이미 지났으면 만료로)
+    """
+    base_ts = int(base_time.timestamp())
+    out = []
+    for row in rows:
+        row = dict(row)
+        expire_ts = row["expire_ts"]
+        if expire_ts is None or expire_ts <= base_ts:
+            row.update(is_expired=True, countdown="지남", date_disp="-", time_disp="-",
+                       expire_ts=None, total_seconds=-1, total_minutes=-1)
+        else:
+            row.update(is_expired=False, **format_expire_info(base_time, expire_ts - base_ts))
+        out.append(row)
+    return out
+
+
+########################################
+# 지도 밀집도(히트맵) 레이어
+########################################
+
+MAP_SIZE = 1000  # 지도 좌표 범위 (0 ~ MAP_SIZE)
+DENSITY_BINS = 50  # 한 변의 칸 수 (50 -> 칸 하나가 20x20 좌표)
+CRITICAL_MINUTES = 30  # 남은 분(내림)이 이 이하면 긴급
+CRITICAL_SEC = (CRITICAL_MINUTES + 1) * 60  # 긴급 = 0 < 남은 초 < CRITICAL_SEC (표/지도/질의/스냅샷/페이지 공통)
+
+
+def build_density_grids(rows, bins=DENSITY_BINS):
+    """
+    rows -> 칸별 집계 (각각 길이 bins*bins 의 평탄화된 리스트, 인덱스 = by * bins + bx)
+        {"count": 전체 인원, "unshielded": 만료된 커맨더 HQ 합, "critical": 긴급 커맨더 HQ 합}
+    HQ 를 모르면 1로 셈. 좌표가 숫자가 아닌 행은 건너뜀, 지도 밖(음수 포함) 좌표는 가장자리 칸으로
+    """
+    size = bins * bins
+    count = [0] * size
+    unshielded = [0] * size
+    critical = [0] * size
+    scale = bins / MAP_SIZE
+    last = bins - 1
+    for r in rows:
+        x, y = coord_int(r["x"]), coord_int(r["y"])
+        if x is None or y is None:
+            continue
+        bx = min(max(int(x * scale), 0), last)
+        by = min(max(int(y * scale), 0), last)
+        idx = by * bins + bx
+        count[idx] += 1
+        if r["is_expired"]:
+            unshielded[idx] += r.get("hq") or 1
+        elif r["total_seconds"] < CRITICAL_SEC:
+            critical[idx] += r.get("hq") or 1
+    return {"bins": bins, "count": count, "unshielded": unshielded, "critical": critical}
+
+
+def encode_png_rgba(width, height, pixels):
+    """pixels: 위쪽 줄부터 RGBA bytes -> PNG bytes (zlib 만 씀)"""
+    import struct
+    import zlib
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    stride = width * 4
+    raw = b"".join(b"\x00" + pixels[i:i + stride] for i in range(0, height * stride, stride))
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 9)) + chunk(b"IEND", b"")
+
+
+def build_density_layer_html(grids):
+    """
+    만료 + 긴급 HQ 합을 색(노랑 -> 빨강)과 투명도로 칠한 PNG 를 SVG <image> 한 장으로.
+    지도는 y 축이 뒤집혀 있으므로(1000 - y) PNG 의 윗줄이 큰 y 칸
+    """
+    bins = grids["bins"]
+    weight = [u + c for u, c in zip(grids["unshielded"], grids["critical"])]
+    peak = max(weight) if weight else 0
+    pixels = bytearray(bins * bins * 4)
+    if peak:
+        for by in range(bins):
+            row_base = (bins - 1 - by) * bins * 4
+            for bx in range(bins):
+                w = weight[by * bins + bx]
+                if not w:
+                    continue
+                t = (w / peak) ** 0.5
+                p = row_base + bx * 4
+                pixels[p] = 250 - int(30 * t)
+                pixels[p + 1] = 204 - int(166 * t)
+                pixels[p + 2] = 21 + int(17 * t)
+                pixels[p + 3] = 70 + int(150 * t)
+    import base64
+    png_b64 = base64.b64encode(encode_png_rgba(bins, bins, bytes(pixels))).decode("ascii")
+    return (
+        f'<image href="data:image/png;base64,{png_b64}" x="0" y="0" width="{MAP_SIZE}" height="{MAP_SIZE}" '
+        f'preserveAspectRatio="none" style="pointer-events: none;"/>'
+    )
+
+
+########################################
+# 정렬 순열 (페이지에서 비교 없이 재정렬)
+########################################
+
+def name_sort_key(name):
+    """
+    이름 정렬 키: 표기 흔들림(대소문자/공백/기호)을 뺀 정규화 키 먼저, 같으면 원문
+    한글 음절은 유니코드 순서가 가나다 순이라 코드 포인트 비교로 사전 순이 됨 (숫자 < 영문 < 한글)
+    """
+    from identity import normalize_name
+    return normalize_name(name), name
+
+
+def _coord_sort_key(row):
+    """좌표 순 (x 먼저). 깨진 좌표는 맨 앞"""
+    x, y = coord_int(row["x"]), coord_int(row["y"])
+    if x is None or y is None:
+        return 0, 0, 0
+    return 1, x, y
+
+
+def build_sort_permutations(rows):
+    """
+    rows(테이블 순서 = 만료 순) -> 정렬 기준별 행 순열, 리틀 엔디언 정수 배열을 base64 로
+        {"width": 2 또는 4 (바이트), "name": ..., "hq": ..., "coord": ...,
+         "groups": {"expire": ..., "name": ..., "hq": ..., "coord": ...}}
+    같은 값끼리는 만료 순이 유지됨 (안정 정렬). 만료 순은 테이블 순서 그대로라 따로 안 넣음
+    groups: 오름차순 순열에서 값이 바뀌는(새 묶음이 시작하는) 자리의 비트맵 (k 번째 비트 = 바이트 k>>3 의 k&7 비트).
+    페이지는 내림차순을 묶음 단위로 뒤집어 만듦 -> 같은 값끼리는 내림차순에서도 만료 순 그대로
+    """
+    import array
+    import base64
+    import sys
+
+    n = len(rows)
+    typecode = "H" if n <= 0xFFFF else "I" if array.array("I").itemsize == 4 else "L"
+    keys = {
+        "expire": lambda i: rows[i]["total_seconds"],
+        "name": lambda i: name_sort_key(rows[i]["name"]),
+        "hq": lambda i: rows[i].get("hq") or 0,
+        "coord": lambda i: _coord_sort_key(rows[i]),
+    }
+    out = {"width": array.array(typecode).itemsize, "groups": {}}
+    for key, key_of in keys.items():
+        order = list(range(n)) if key == "expire" else sorted(range(n), key=key_of)
+        if key != "expire":
+            packed = array.array(typecode, order)
+            if sys.byteorder == "big":
+                packed.byteswap()
+            out[key] = base64.b64encode(packed.tobytes()).decode("ascii")
+        starts = bytearray((n + 7) // 8)
+        prev = object()
+        for k, i in enumerate(order):
+            value = key_of(i)
+            if value != prev:
+                starts[k >> 3] |= 1 << (k & 7)
+                prev = value
+        out["groups"][key] = base64.b64encode(bytes(starts)).decode("ascii")
+    return out
+
+
+########################################
+# 쉴드 해제 타임라인 (HQ 가중)
+########################################
+
+TIMELINE_HOURS = 72  # 타임라인 길이
+TIMELINE_WINDOW_MIN = 60  # "가장 많이 풀리는 창" 길이 (분)
+
+
+def build_unshield_timeline(rows, base_ts, hours=TIMELINE_HOURS, window_min=TIMELINE_WINDOW_MIN):
+    """
+    앞으로 hours 시간 동안 분 단위로 "쉴드가 없는 커맨더 HQ 합" (HQ 가 없으면 1)
+    만료 시각을 분 단위 이벤트로 바꿔 한 번 정렬하고 쓸어가며 누적 -> O(n log n), 분마다 다시 세지 않음
+    덤프에는 다시 쉴드를 켜는 정보가 없으므로 누적 값은 시간이 갈수록 늘기만 함
+    return: {
+        "minutes": 전체 분 수,
+        "steps": [[분, 그 분부터의 값], ...]  (값이 바뀌는 분만, 첫 항목은 [0, 지금 쉴드 없는 합]),
+        "best": [시작 분, 끝 분, 그 창에서 새로 풀리는 합] 또는 None (window_min 분 창 중 최대)
+    }
+    """
+    minutes = hours * 60
+    horizon = base_ts + minutes * 60
+    value = 0
+    events = []
+    for r in rows:
+        weight = r.get("hq") or 1
+        if r["is_expired"]:
+            value += weight
+        elif r["expire_ts"] < horizon:
+            # 분 m 의 시작(base + 60m)에 이미 만료면 m 부터 쉴드 없음
+            events.append((-(-(r["expire_ts"] - base_ts) // 60), weight))
+    events.sort()
+
+    steps = [[0, value]]
+    for minute, weight in events:
+        value += weight
+        if steps[-1][0] == minute:
+            steps[-1][1] = value
+        else:
+            steps.append([minute, value])
+
+    # 두 포인터: 창 [events[j] 분, +window_min) 안에 드는 이벤트 합의 최대
+    best = None
+    acc = 0
+    j = 0
+    for minute, weight in events:
+        acc += weight
+        while events[j][0] <= minute - window_min:
+            acc -= events[j][1]
+            j += 1
+        if best is None or acc > best[2]:
+            best = [events[j][0], events[j][0] + window_min, acc]
+    return {"minutes": minutes, "steps": steps, "best": best}
+
+
+########################################
+# 지도 LOD 쿼드트리 (축소 시 묶음 마커)
+########################################
+
+LOD_LEAF_CAP = 8  # 이 인원 이하인 노드는 묶지 않고 개별 마커로 그림
+LOD_MAX_DEPTH = 10  # 같은 좌표에 몰려도 더 쪼개지 않는 깊이 (1000 / 2^10 ≈ 1 좌표)
+
+
+def build_map_tree(rows, leaf_cap=LOD_LEAF_CAP, max_depth=LOD_MAX_DEPTH):
+    """
+    rows(지도 데이터와 같은 순서) -> 쿼드트리
+        {"leaf_cap": int,
+         "order": 노드 순회 순서로 늘어놓은 rows 인덱스 (각 노드 = order[start:end] 연속 구간),
+         "nodes": [[x0, y0, size, start, end, 활성, 긴급, 만료, 가장 이른 만료 epoch(없으면 0), 자식 인덱스...], ...]}
+    nodes[0] 이 루트. 좌표는 게임 좌표(y 위쪽이 큼), 집계는 기준 시각 기준
+    지도 밖(음수 포함) 좌표는 가장자리에 붙여서 넣음 (밀도 격자와 같은 규칙)
+    """
+    last = MAP_SIZE - 1
+    items = []
+    for i, r in enumerate(rows):
+        x, y = coord_int(r["x"]), coord_int(r["y"])
+        if x is not None and y is not None:
+            items.append((min(max(x, 0), last), min(max(y, 0), last), i))
+    nodes = []
+    order = []
+
+    def build(x0, y0, size, pts, depth):
+        idx = len(nodes)
+        nodes.append(None)
+        start = len(order)
+        children = []
+        if len(pts) <= leaf_cap or depth == max_depth:
+            active = critical = expired = 0
+            earliest = 0
+            for _, _, i in pts:
+                order.append(i)
+                r = rows[i]
+                if r["is_expired"]:
+                    expired += 1
+                    continue
+                active += 1
+                if r["total_seconds"] < CRITICAL_SEC:
+                    critical += 1
+                if not earliest or r["expire_ts"] < earliest:
+                    earliest = r["expire_ts"]
+        else:
+            half = size / 2
+            mx, my = x0 + half, y0 + half
+            quads = ([], [], [], [])
+            for p in pts:
+                quads[(p[0] >= mx) + 2 * (p[1] >= my)].append(p)
+            for q, q_pts in enumerate(quads):
+                if q_pts:
+                    children.append(build(x0 + half * (q & 1), y0 + half * (q >> 1), half, q_pts, depth + 1))
+            active = sum(nodes[c][5] for c in children)
+            critical = sum(nodes[c][6] for c in children)
+            expired = sum(nodes[c][7] for c in children)
+            earliest = min((nodes[c][8] for c in children if nodes[c][8]), default=0)
+        nodes[idx] = [x0, y0, size, start, len(order), active, critical, expired, earliest] + children
+        return idx
+
+    if items:
+        build(0, 0, MAP_SIZE, items, 0)
+    return {"leaf_cap": leaf_cap, "order": order, "nodes": nodes}
+
+
+########################################
+# HTML 생성
+########################################
+
+# 페이지 템플릿 파일: @@이름@@ 자리에 build_html_bytes 의 slots 값이 들어감
+# (파이썬 소스 밖에 둬서 스크립트 실행 때마다 큰 문자열을 다시 컴파일하지 않음)
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboard_template.html")
+SW_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "service_worker.js")
+
+# 템플릿 컴파일 결과 캐시 (디스크: __pycache__/page_template.<해시>.marshal, 메모리: 프로세스 안 재사용)
+TEMPLATE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__")
+_compiled_templates = {}
+
+
+def compile_template(source):
+    """
+    템플릿 bytes -> (정적 bytes, 슬롯 이름, 정적 bytes, 슬롯 이름, ..., 정적 bytes)
+    홀수 번째가 슬롯 이름(str). 정적 부분은 UTF-8 bytes 그대로
+    """
+    parts = re.split(rb"@@(\w+)@@", source)
+    return tuple(part.decode("ascii") if idx % 2 else part for idx, part in enumerate(parts))
+
+
+def load_compiled_template(path=TEMPLATE_PATH):
+    """
+    컴파일된 템플릿을 메모리 -> 디스크 캐시 순으로 찾고, 없으면 컴파일해서 디스크에 저장.
+    키는 템플릿 소스 해시라서 템플릿을 고치면 자동으로 새로 만듦
+    """
+    import hashlib
+    import marshal
+
+    with open(path, "rb") as f:
+        source = f.read()
+    key = hashlib.sha256(source).hexdigest()[:16]
+    segments = _compiled_templates.get(key)
+    if segments is not None:
+        return segments
+
+    cache_path = os.path.join(TEMPLATE_CACHE_DIR, f"page_template.{key}.marshal")
+    try:
+        with open(cache_path, "rb") as f:
+            segments = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        segments = compile_template(source)
+        try:
+            os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                marshal.dump(segments, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # 캐시 디렉터리에 못 쓰면 매번 컴파일
+
+    _compiled_templates[key] = segments
+    return segments
+
+
+def render_template(slots, path=TEMPLATE_PATH):
+    """슬롯 값 -> 템플릿을 채운 UTF-8 bytes (정적 부분은 캐시된 bytes 그대로 이어붙임)"""
+    out = list(load_compiled_template(path))
+    for idx in range(1, len(out), 2):
+        out[idx] = str(slots[out[idx]]).encode("utf-8")
+    return b"".join(out)
+
+
+def build_plan_panel_html(plan, start, speed, base_ts):
+    """planner.plan_route 결과 -> 공격 순서 패널 HTML (계획이 없으면 빈 문자열)"""
+    if plan is None:
+        return ""
+    items = []
+    for stop in plan:
+        coord_txt = f"{stop['x']}, {stop['y']}"
+        wait_txt = f" (대기 {stop['wait'] // 60}분)" if stop["wait"] >= 60 else ""
+        items.append(
+            f'<li class="flex justify-between gap-3">'
+            f'<span class="text-gray-900">{stop["order"]}. {escape_html(stop["name"])}</span>'
+            f'<span class="text-blue-600 cursor-pointer hover:underline" onclick="copyCoordinates(\'{coord_txt}\')">({coord_txt})</span>'
+            f'<span class="font-mono text-gray-600">+{(stop["ready"] - base_ts) // 60}분{wait_txt}</span></li>'
+        )
+    body = "".join(items) if items else '<li class="text-gray-500">시간 안에 칠 수 있는 타겟이 없습니다.</li>'
+    return f'''<!-- Attack Plan -->
+    <div class="bg-white rounded-lg shadow-md p-4 mb-6">
+      <h3 class="text-lg font-semibold text-gray-800 mb-3">🎯 공격 순서 (출발 ({start[0]}, {start[1]}) · 속도 {speed:g}/분 · {len(plan)}곳)</h3>
+      <ol class="text-sm space-y-2 max-h-64 overflow-y-auto">{body}</ol>
+    </div>
+'''
+
+
+def build_timeline_panel_html(timeline, base_ts, width=720, height=140):
+    """build_unshield_timeline 결과 -> 계단형 SVG 차트 패널 (가장 많이 풀리는 창은 음영, 마우스를 올리면 시각/값)"""
+    import json
+
+    minutes = timeline["minutes"]
+    steps = timeline["steps"]
+    peak = max(steps[-1][1], 1)
+
+    def sx(minute):
+        return round(minute * width / minutes, 1)
+
+    def sy(value):
+        return round(height - value * (height - 4) / peak, 1)
+
+    path = [f"M0,{sy(steps[0][1])}"]
+    for minute, value in steps[1:]:
+        path.append(f"H{sx(minute)}V{sy(value)}")
+    path.append(f"H{width}")
+
+    ticks = "".join(
+        f'<line x1="{sx(h * 60)}" y1="0" x2="{sx(h * 60)}" y2="{height}" stroke="#e5e7eb"/>'
+        f'<text x="{sx(h * 60) + 2}" y="{height - 4}" font-size="10" fill="#6b7280">+{h}h</text>'
+        for h in range(0, minutes // 60, 12)
+    )
+    best = timeline["best"]
+    best_html = ""
+    best_txt = ""
+    if best:
+        best_html = (f'<rect x="{sx(best[0])}" y="0" width="{max(1, sx(best[1]) - sx(best[0]))}" height="{height}" '
+                     f'fill="#fecaca" opacity="0.6"/>')
+        best_txt = (f' · 가장 많이 풀리는 {(best[1] - best[0])}분: '
+                    f'+{best[0] // 60}시간 {best[0] % 60}분부터 HQ {best[2]}')
+    data = json.dumps({"base": base_ts, "minutes": minutes, "steps": steps}, separators=(",", ":"))
+    return f'''<!-- Unshield Timeline -->
+    <div class="bg-white rounded-lg shadow-md p-4 mb-6">
+      <h3 class="text-lg font-semibold text-gray-800 mb-3">📈 쉴드 없는 HQ 합 (앞으로 {minutes // 60}시간)</h3>
+      <svg id="timelineChart" viewBox="0 0 {width} {height}" class="w-full" preserveAspectRatio="none"
+           onmousemove="timelineHover(event)" style="height: {height}px;">
+        {ticks}{best_html}<path d="{"".join(path)}" fill="none" stroke="#ef4444" stroke-width="2"/>
+      </svg>
+      <div class="text-sm text-gray-600 mt-1">지금 HQ {steps[0][1]} -> {minutes // 60}시간 뒤 HQ {steps[-1][1]}{best_txt}
+        <span id="timelineHoverText" class="font-mono ml-4"></span></div>
+      <script type="application/json" id="timelineData">{data}</script>
+    </div>
+'''
+
+
+def build_targets_panel_html(targets, alliance):
+    """targets.find_targets 결과 -> "내 타겟" 패널 HTML (없으면 빈 문자열). 목록은 페이지에서 고른 연맹원 것만 그림"""
+    if targets is None:
+        return ""
+    import json
+    from targets import targets_page_data
+
+    page_data = targets_page_data(targets)
+    data = json.dumps(page_data, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    options = "".join(f'<option value="{escape_html(m[1])}"></option>' for m in page_data["members"])
+    return f'''<!-- Member Targets -->
+    <div id="targetsPanel" class="bg-white rounded-lg shadow-md p-4 mb-6">
+      <h3 class="text-lg font-semibold text-gray-800 mb-3">🗡️ 내 타겟 ({escape_html(alliance)} · {len(targets)}명)</h3>
+      <input type="text" id="targetsMember" list="targetsMembers" placeholder="내 이름 입력..."
+             class="w-full px-4 py-2 mb-3 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-blue-500"
+             oninput="showTargets()">
+      <datalist id="targetsMembers">{options}</datalist>
+      <ol id="targetsList" class="text-sm space-y-2"></ol>
+      <script type="application/json" id="targetsData">{data}</script>
+    </div>
+'''
+
+
+def build_query_buttons_html(queries):
+    """[(이름, Query), ...] -> 필터 버튼들 (data-filter 'q0', 'q1', ... 은 페이지 QUERIES 순서)"""
+    return "".join(
+        f'<button onclick="filterRows(\'q{i}\')" class="filter-btn px-4 py-2 rounded-md bg-gray-200 hover:bg-blue-500 '
+        f'hover:text-white transition" data-filter="q{i}" title="{escape_html(query.text)}">{escape_html(label)}</button>'
+        for i, (label, query) in enumerate(queries)
+    )
+
+
+def parse_query_specs(specs):
+    """["이름:질의" 또는 "질의", ...] -> [(이름, Query), ...] (이름이 없으면 질의 자체가 버튼 이름)"""
+    from query import Query
+
+    out = []
+    for spec in specs or ():
+        label, sep, text = spec.partition(":")
+        if not sep:
+            label, text = spec, spec
+        out.append((label.strip(), Query(text)))
+    return out
+
+
+def build_rows_json_bytes(rows):
+    """rows -> 커맨더 목록 JSON bytes (서버 /data.json, fanout.py 의 json 출력)"""
+    import json
+
+    return json.dumps([{
+        "id": r.get("id", r["name"]),
+        "name": r["name"],
+        "alliance": r["alliance"],
+        "hq": r["hq"],
+        "x": r["x"],
+        "y": r["y"],
+        "is_expired": r["is_expired"],
+        "expire_ts": r["expire_ts"],
+        "countdown": r["countdown"],
+    } for r in rows], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def build_html_bytes(rows, base_time, production=False, data_version="", delta_url="", title=PAGE_TITLE,
+                     plan=None, plan_start=None, plan_speed=None, frozen=False, targets=None, targets_alliance="",
+                     queries=None, sw_url="", manifest_url=""):
+    """
+    rows: parse_txt_lines 결과
+    base_time: datetime (시간대 포함)
+    production: True 면 Tailwind CDN 대신 필요한 CSS만 인라인하고 행 마크업을 압축
+    data_version / delta_url: 주면 페이지가 delta_url 을 폴링해서 변경분을 제자리 적용
+    title: 페이지 제목
+    plan / plan_start / plan_speed: planner.plan_route 결과와 그 출발 좌표/속도 (공격 순서 패널)
+    frozen: True 면 페이지가 base_time 시점에 멈춰 있음 (스냅샷, 실시간 카운트다운 없음)
+    targets / targets_alliance: targets.find_targets 결과와 그 연맹 이름 ("내 타겟" 패널)
+    queries: [(이름, query.Query), ...] -> 필터 버튼 (페이지 행 상태 엔진에서 컴파일된 JS 식으로 거름)
+    sw_url / manifest_url: 주면 페이지가 서비스 워커를 등록하고 매니페스트를 링크 (write_offline_shell)
+    -> 최종 HTML (UTF-8 bytes)
+    """
+    # 정렬: 만료(-1)먼저, 그 다음 남은시간(total_seconds) 오름차순
+    sorted_rows = sorted(rows, key=lambda r: r["total_seconds"])
+
+    table_rows_html = "\n".join(build_row_html(r, compact=production) for r in sorted_rows)
+
+    base_time_disp = base_time.strftime("%Y-%m-%d %H:%M:%S") + f" ({base_time.tzname()})"
+    base_ts = int(base_time.timestamp())
+
+    # 통계 계산
+    total_count = len(rows)
+    expired_count = sum(1 for r in rows if r["is_expired"])
+    active_count = total_count - expired_count
+    critical_count = sum(1 for r in rows if not r["is_expired"] and r["total_seconds"] < CRITICAL_SEC)
+
+    # 지도용 데이터 생성 (JSON)
+    map_data = []
+    for r in sorted_rows:
+        map_data.append({
+            "id": r.get("id", r["name"]),
+            "name": r["name"],
+            "alliance": r.get("alliance", ""),
+            "hq": r.get("hq"),
+            "x": coord_int(r["x"]) or 0,
+            "y": coord_int(r["y"]) or 0,
+            "is_expired": r["is_expired"],
+            "expire_ts": r["expire_ts"],
+            "total_seconds": r["total_seconds"],
+            "total_minutes": r["total_minutes"],
+            "countdown": r["countdown"],
+            "date_disp": r.get("date_disp", "-"),
+            "time_disp": r.get("time_disp", "-")
+        })
+
+    import json
+    map_data_json = json.dumps(map_data)
+
+    slots = {
+        "title": escape_html(title),
+        "head_assets": INLINE_CSS_MARKER if production else f'<script src="{TAILWIND_CDN_URL}"></script>',
+        "pwa_head": build_pwa_head_html(manifest_url),
+        "sw_url_json": json.dumps(sw_url),
+        "base_time_disp": escape_html(base_time_disp),
+        "total_count": total_count,
+        "active_count": active_count,
+        "expired_count": expired_count,
+        "critical_count": critical_count,
+        "table_rows": table_rows_html,
+        "base_ts": base_ts,
+        "critical_sec": CRITICAL_SEC,
+        "map_data_json": map_data_json,
+        "map_tree_json": json.dumps(build_map_tree(sorted_rows), separators=(",", ":")),
+        "sort_perms_json": json.dumps(build_sort_permutations(sorted_rows), separators=(",", ":")),
+        "data_version_json": json.dumps(data_version),
+        "delta_url_json": json.dumps(delta_url),
+        "plan_panel": build_plan_panel_html(plan, plan_start, plan_speed, base_ts),
+        "timeline_panel": build_timeline_panel_html(build_unshield_timeline(rows, base_ts), base_ts),
+        "targets_panel": build_targets_panel_html(targets, targets_alliance),
+        "density_layer": build_density_layer_html(build_density_grids(rows)),
+        "frozen_json": json.dumps(frozen),
+        "query_buttons": build_query_buttons_html(queries or ()),
+        "queries_json": json.dumps([query.js for _, query in queries or ()], ensure_ascii=False).replace("</", "<\\/"),
+    }
+    page = render_template(slots)
+
+    if production:
+        text = page.decode("utf-8")
+        text = text.replace(INLINE_CSS_MARKER, f"<style>{build_inline_css(text)}</style>", 1)
+        page = text.encode("utf-8")
+    return page
+
+
+def build_pwa_head_html(manifest_url):
+    """매니페스트 링크 + 테마 색 (오프라인 셸을 안 쓰면 빈 문자열)"""
+    if not manifest_url:
+        return ""
+    return f'<link rel="manifest" href="{escape_html(manifest_url)}">\n  <meta name="theme-color" content="{PWA_THEME_COLOR}">'
+
+
+def build_html(rows, base_time, **options):
+    """build_html_bytes 와 같고 str 로 돌려줌"""
+    return build_html_bytes(rows, base_time, **options).decode("utf-8")
+
+
+########################################
+# 델타: 직전 덤프 대비 변경분
+########################################
+
+# 상태 파일 형식 버전 (바뀌면 이전 상태는 버리고 델타 없이 새로 시작)
+STATE_FORMAT = 3
+
+# 덤프마다 기준 시각이 달라 분 단위 반올림 오차가 생기므로 이 정도 차이는 같은 쉴드로 봄
+RESHIELD_TOLERANCE_SEC = 120
+
+
+def build_state(rows, base_time):
+    """
+    rows -> 다음 실행에서 비교할 상태(dict)
+        {
+          "format": STATE_FORMAT,
+          "version": str,       # rows 내용 해시 (페이지의 DATA_VERSION)
+          "base_time": str,
+          "rows": [{"id", "name", "x", "y", "expire"(UTC epoch 초 or None)}, ...]
+        }
+    id 는 식별 인덱스가 붙인 안정 ID (없으면 name)
+    """
+    import hashlib
+    import json
+
+    records = []
+    for r in rows:
+        records.append({
+            "id": r.get("id", r["name"]),
+            "name": r["name"],
+            "x": r["x"],
+            "y": r["y"],
+            "expire": r["expire_ts"],
+        })
+    records.sort(key=lambda rec: rec["id"])
+
+    canonical = json.dumps(
+        [(rec["id"], rec["name"], rec["x"], rec["y"], rec["expire"]) for rec in records],
+        ensure_ascii=False, separators=(",", ":"),
+    )
+    return {
+        "format": STATE_FORMAT,
+        "version": hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12],
+        "base_time": base_time.isoformat(),
+        "rows": records,
+    }
+
+
+def load_state(path):
+    """저장된 상태 파일 -> dict, 없거나 깨졌거나 형식이 다르면 None"""
+    import json
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("format") != STATE_FORMAT:
+        return None
+    return state
+
+
+def _same_shield(prev_expire, cur_expire):
+    if prev_expire is None or cur_expire is None:
+        return prev_expire == cur_expire
+    return abs(cur_expire - prev_expire) <= RESHIELD_TOLERANCE_SEC
+
+
+def compute_delta(prev_state, cur_state):
+    """
+    두 상태(build_state 결과) -> 델타 문서 (행 키 = 안정 ID)
+        {
+          "base": 이전 version, "version": 현재 version,
+          "added":      [전체 레코드],
+          "removed":    [id],
+          "renamed":    [{"id", "name"}],
+          "moved":      [{"id", "x", "y"}],
+          "reshielded": [{"id", "expire"}],          # 새 쉴드 / 만료시각 변경 (UTC epoch 초)
+          "expired":    [{"id", "expire": None}],    # 쉴드 -> 만료
+        }
+    """
+    prev_by_id = {rec["id"]: rec for rec in prev_state["rows"]}
+    cur_by_id = {rec["id"]: rec for rec in cur_state["rows"]}
+
+    delta = {
+        "base": prev_state["version"],
+        "version": cur_state["version"],
+        "added": [],
+        "removed": [cid for cid in prev_by_id if cid not in cur_by_id],
+        "renamed": [],
+        "moved": [],
+        "reshielded": [],
+        "expired": [],
+    }
+
+    for cid, cur in cur_by_id.items():
+        prev = prev_by_id.get(cid)
+        if prev is None:
+            delta["added"].append(cur)
+            continue
+
+        if prev["name"] != cur["name"]:
+            delta["renamed"].append({"id": cid, "name": cur["name"]})
+
+        if (prev["x"], prev["y"]) != (cur["x"], cur["y"]):
+            delta["moved"].append({"id": cid, "x": cur["x"], "y": cur["y"]})
+
+        if _same_shield(prev["expire"], cur["expire"]):
+            continue
+        if cur["expire"] is None:
+            delta["expired"].append({"id": cid, "expire": None})
+        else:
+            delta["reshielded"].append({"id": cid, "expire": cur["expire"]})
+
+    return delta
+
+
+def write_delta_outputs(cur_state, state_path, delta_path, log=print):
+    """
+    직전 상태와 비교해 델타 파일을 쓰고, 현재 상태를 다음 실행용으로 저장.
+    직전 상태가 없으면 델타는 만들지 않음.
+    return: 델타 dict or None
+    """
+    import json
+
+    prev_state = load_state(state_path)
+    delta = None
+    if prev_state is not None and prev_state.get("version") != cur_state["version"]:
+        delta = compute_delta(prev_state, cur_state)
+        write_atomic(delta_path, json.dumps(delta, ensure_ascii=False, separators=(",", ":")))
+        log(
+            f"델타: 추가 {len(delta['added'])} / 제거 {len(delta['removed'])} / 개명 {len(delta['renamed'])} / "
+            f"이동 {len(delta['moved'])} / "
+            f"재쉴드 {len(delta['reshielded'])} / 만료 {len(delta['expired'])} -> {delta_path}"
+        )
+
+    write_atomic(state_path, json.dumps(cur_state, ensure_ascii=False, separators=(",", ":")))
+
+    return delta
+
+
+########################################
+# 프로덕션 빌드: 인라인 CSS + 압축/해시 산출물
+########################################
+
+INLINE_CSS_MARKER = "<!--inline-css-->"
+TAILWIND_CDN_URL = "https://cdn.tailwindcss.com"
+
+# Tailwind 기본 리셋(preflight) 중 이 페이지가 실제로 기대하는 부분만
+PREFLIGHT_CSS = (
+    "*,::before,::after{box-sizing:border-box;border:0 solid #e5e7eb}"
+    "html{line-height:1.5;-webkit-text-size-adjust:100%;"
+    "font-family:ui-sans-serif,system-ui,-apple-system,'Segoe UI',Roboto,'Noto Sans KR',sans-serif}"
+    "body{margin:0;line-height:inherit}"
+    "h1,h3,h4,p{margin:0;font-size:inherit;font-weight:inherit}"
+    "table{border-collapse:collapse;text-indent:0;border-color:inherit}"
+    "th{text-align:inherit;font-weight:inherit}"
+    "button,input{font-family:inherit;font-size:100%;font-weight:inherit;line-height:inherit;color:inherit;margin:0;padding:0}"
+    "button{background-color:transparent;background-image:none;cursor:pointer;text-transform:none}"
+    "input::placeholder{color:#9ca3af}"
+    "svg{display:block;vertical-align:middle}"
+    "[hidden]{display:none}"
+)
+
+# 페이지(템플릿 + 스크립트)에서 쓰는 Tailwind 유틸리티 클래스 -> 선언
+UTILITY_CSS = {
+    "container": "width:100%",
+    "relative": "position:relative",
+    "sticky": "position:sticky",
+    "top-0": "top:0",
+    "mx-auto": "margin-left:auto;margin-right:auto",
+    "mb-1": "margin-bottom:.25rem",
+    "mb-2": "margin-bottom:.5rem",
+    "mb-3": "margin-bottom:.75rem",
+    "mb-4": "margin-bottom:1rem",
+    "mb-6": "margin-bottom:1.5rem",
+    "mb-8": "margin-bottom:2rem",
+    "ml-2": "margin-left:.5rem",
+    "ml-3": "margin-left:.75rem",
+    "ml-4": "margin-left:1rem",
+    "mr-1": "margin-right:.25rem",
+    "mt-1": "margin-top:.25rem",
+    "block": "display:block",
+    "inline-block": "display:inline-block",
+    "flex": "display:flex",
+    "grid": "display:grid",
+    "hidden": "display:none",
+    "h-1": "height:.25rem",
+    "h-3": "height:.75rem",
+    "h-full": "height:100%",
+    "min-h-screen": "min-height:100vh",
+    "w-3": "width:.75rem",
+    "w-12": "width:3rem",
+    "w-full": "width:100%",
+    "min-w-[200px]": "min-width:200px",
+    "max-w-7xl": "max-width:80rem",
+    "max-h-64": "max-height:16rem",
+    "flex-1": "flex:1 1 0%",
+    "cursor-pointer": "cursor:pointer",
+    "grid-cols-4": "grid-template-columns:repeat(4,minmax(0,1fr))",
+    "flex-wrap": "flex-wrap:wrap",
+    "items-start": "align-items:flex-start",
+    "items-center": "align-items:center",
+    "justify-between": "justify-content:space-between",
+    "gap-2": "gap:.5rem",
+    "gap-3": "gap:.75rem",
+    "gap-4": "gap:1rem",
+    "overflow-hidden": "overflow:hidden",
+    "overflow-x-auto": "overflow-x:auto",
+    "overflow-y-auto": "overflow-y:auto",
+    "rounded": "border-radius:.25rem",
+    "rounded-md": "border-radius:.375rem",
+    "rounded-lg": "border-radius:.5rem",
+    "rounded-full": "border-radius:9999px",
+    "rounded-t-lg": "border-top-left-radius:.5rem;border-top-right-radius:.5rem",
+    "rounded-b-lg": "border-bottom-right-radius:.5rem;border-bottom-left-radius:.5rem",
+    "border": "border-width:1px",
+    "border-2": "border-width:2px",
+    "border-b": "border-bottom-width:1px",
+    "border-t": "border-top-width:1px",
+    "border-gray-200": "border-color:#e5e7eb",
+    "border-gray-300": "border-color:#d1d5db",
+    "bg-white": "background-color:#fff",
+    "bg-blue-50": "background-color:#eff6ff",
+    "bg-blue-500": "background-color:#3b82f6",
+    "bg-gray-50": "background-color:#f9fafb",
+    "bg-gray-100": "background-color:#f3f4f6",
+    "bg-gray-200": "background-color:#e5e7eb",
+    "bg-gray-300": "background-color:#d1d5db",
+    "bg-gray-400": "background-color:#9ca3af",
+    "bg-green-500": "background-color:#22c55e",
+    "bg-red-500": "background-color:#ef4444",
+    "bg-gradient-to-br": "background-image:linear-gradient(to bottom right,var(--tw-gradient-stops))",
+    "from-blue-50": "--tw-gradient-from:#eff6ff;--tw-gradient-stops:var(--tw-gradient-from),var(--tw-gradient-to,rgba(239,246,255,0))",
+    "to-indigo-100": "--tw-gradient-to:#e0e7ff",
+    "p-4": "padding:1rem",
+    "p-6": "padding:1.5rem",
+    "px-4": "padding-left:1rem;padding-right:1rem",
+    "px-6": "padding-left:1.5rem;padding-right:1.5rem",
+    "py-2": "padding-top:.5rem;padding-bottom:.5rem",
+    "py-3": "padding-top:.75rem;padding-bottom:.75rem",
+    "py-4": "padding-top:1rem;padding-bottom:1rem",
+    "py-8": "padding-top:2rem;padding-bottom:2rem",
+    "py-12": "padding-top:3rem;padding-bottom:3rem",
+    "pt-2": "padding-top:.5rem",
+    "text-left": "text-align:left",
+    "text-center": "text-align:center",
+    "font-sans": "font-family:ui-sans-serif,system-ui,-apple-system,'Segoe UI',Roboto,'Noto Sans KR',sans-serif",
+    "font-mono": "font-family:ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,monospace",
+    "text-xs": "font-size:.75rem;line-height:1rem",
+    "text-sm": "font-size:.875rem;line-height:1.25rem",
+    "text-lg": "font-size:1.125rem;line-height:1.75rem",
+    "text-xl": "font-size:1.25rem;line-height:1.75rem",
+    "text-3xl": "font-size:1.875rem;line-height:2.25rem",
+    "text-4xl": "font-size:2.25rem;line-height:2.5rem",
+    "font-medium": "font-weight:500",
+    "font-semibold": "font-weight:600",
+    "font-bold": "font-weight:700",
+    "uppercase": "text-transform:uppercase",
+    "leading-none": "line-height:1",
+    "tracking-wider": "letter-spacing:.05em",
+    "text-white": "color:#fff",
+    "text-gray-400": "color:#9ca3af",
+    "text-gray-500": "color:#6b7280",
+    "text-gray-600": "color:#4b5563",
+    "text-gray-700": "color:#374151",
+    "text-gray-800": "color:#1f2937",
+    "text-gray-900": "color:#111827",
+    "text-blue-600": "color:#2563eb",
+    "text-blue-800": "color:#1e40af",
+    "text-green-600": "color:#16a34a",
+    "text-red-600": "color:#dc2626",
+    "underline": "text-decoration-line:underline",
+    "shadow-md": "box-shadow:0 4px 6px -1px rgba(0,0,0,.1),0 2px 4px -2px rgba(0,0,0,.1)",
+    "outline-none": "outline:2px solid transparent;outline-offset:2px",
+    "ring-2": "box-shadow:0 0 0 2px var(--tw-ring-color,#3b82f6)",
+    "ring-blue-500": "--tw-ring-color:#3b82f6",
+    "transition": ("transition-property:color,background-color,border-color,fill,stroke,opacity,box-shadow,transform;"
+                   "transition-timing-function:cubic-bezier(.4,0,.2,1);transition-duration:150ms"),
+}
+
+# 자식 선택자가 필요한 유틸리티
+UTILITY_CHILD_CSS = {
+    "space-y-2": ">:not([hidden])~:not([hidden]){margin-top:.5rem}",
+}
+
+# Tailwind container 의 반응형 max-width
+CONTAINER_CSS = "".join(
+    f"@media (min-width:{bp}px){{.container{{max-width:{bp}px}}}}" for bp in (640, 768, 1024, 1280, 1536)
+)
+
+# compact 행(build_row_html(compact=True))에서 쓰는 짧은 클래스 -> 원래 Tailwind 클래스 묶음
+COMPACT_ROW_CLASSES = {
+    "commander-row": "hover:bg-gray-50",
+    "cn": "px-6 py-4 text-sm text-gray-900 font-medium",
+    "cc": "px-6 py-4 text-sm text-blue-600 cursor-pointer hover:text-blue-800 hover:underline",
+    "ct": "px-6 py-4 text-sm",
+    "cf": "flex items-center justify-between",
+    "cd": "text-xs font-mono ml-4",
+}
+
+VARIANT_PSEUDO = {"hover": ":hover", "focus": ":focus"}
+CLASS_TOKEN_RE = re.compile(r"[\w:\[\]-]+")
+
+
+def _css_escape(cls):
+    return re.sub(r"([:\[\]])", r"\\\1", cls)
+
+
+def _utility_rule(cls, selector=None):
+    """
+    "hover:text-white" -> ".hover\\:text-white:hover{color:#fff}"
+    selector 를 주면 그 선택자에 같은 선언을 붙임 (compact 클래스용)
+    md: 변형은 (min-width:768px) 미디어쿼리로 감쌈. 모르는 클래스 -> None
+    """
+    variant, _, base = cls.rpartition(":")
+    sel = selector or "." + _css_escape(cls)
+    if variant in VARIANT_PSEUDO:
+        sel += VARIANT_PSEUDO[variant]
+    elif variant and variant != "md":
+        return None
+    if base in UTILITY_CSS:
+        rule = f"{sel}{{{UTILITY_CSS[base]}}}"
+    elif base in UTILITY_CHILD_CSS:
+        rule = sel + UTILITY_CHILD_CSS[base]
+    else:
+        return None
+    if variant == "md":
+        rule = f"@media (min-width:768px){{{rule}}}"
+    return rule
+
+
+def build_inline_css(page_html):
+    """
+    완성된 HTML에 실제로 등장하는 클래스만 골라 최소 CSS를 만든다.
+    (스크립트에서 classList 로 붙이는 클래스도 문자열로 들어있으므로 같이 잡힘)
+    순서: preflight -> 기본 유틸리티 -> 변형(hover/focus) -> 반응형(md) -> compact 행
+    """
+    tokens = set(CLASS_TOKEN_RE.findall(page_html))
+    base_rules = []
+    variant_rules = []
+    media_rules = []
+    for cls in sorted(tokens):
+        rule = _utility_rule(cls)
+        if rule is None:
+            continue
+        if cls.startswith("md:"):
+            media_rules.append(rule)
+        elif ":" in cls:
+            variant_rules.append(rule)
+        else:
+            base_rules.append(rule)
+    # 기본 유틸리티는 Tailwind 와 같은 선언 순서(UTILITY_CSS 순서)를 유지해야 덮어쓰기가 같아짐
+    order = {name: idx for idx, name in enumerate(UTILITY_CSS)}
+    base_rules.sort(key=lambda r: order.get(r[1:r.index("{")].replace("\\", "").split(">")[0], len(order)))
+
+    compact_rules = []
+    if "commander-row" in tokens:
+        for short, classes in COMPACT_ROW_CLASSES.items():
+            for cls in classes.split():
+                rule = _utility_rule(cls, selector="." + short)
+                if rule:
+                    compact_rules.append(rule)
+
+    container = CONTAINER_CSS if "container" in tokens else ""
+    return PREFLIGHT_CSS + "".join(base_rules) + container + "".join(variant_rules) + "".join(media_rules) + "".join(compact_rules)
+
+
+def write_production_assets(html_data, output_path, dev_size=None, log=print):
+    """
+    프로덕션 HTML을 output_path 에 쓰고, 내용 해시를 붙인 사본과 미리 압축한 .gz/.br 형제 파일을 만든다.
+      ./out.html -> ./out.<sha256 앞 10자리>.html, .html.gz, .html.br
+    내용이 같으면 파일명도 같으므로 정적 호스트에서 긴 캐시(immutable)로 서빙 가능.
+    brotli 모듈이 없으면 .br 은 건너뜀.
+    return: {경로: 바이트 크기}
+    """
+    import gzip
+    import hashlib
+
+    data = html_data.encode("utf-8") if isinstance(html_data, str) else html_data
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    root, ext = os.path.splitext(output_path)
+    hashed_path = f"{root}.{digest}{ext or '.html'}"
+
+    outputs = {output_path: data, hashed_path: data}
+    # mtime=0 으로 고정해야 같은 내용이면 .gz 바이트도 같음
+    outputs[hashed_path + ".gz"] = gzip.compress(data, compresslevel=9, mtime=0)
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+    if brotli is not None:
+        outputs[hashed_path + ".br"] = brotli.compress(data, quality=11)
+
+    for path, payload in outputs.items():
+        write_atomic(path, payload)
+
+    # 크기 리포트
+    if dev_size is not None:
+        log(f"개발용 HTML: {dev_size:,} bytes (+ Tailwind CDN 런타임 별도 다운로드)")
+    for path, payload in outputs.items():
+        log(f"{path}: {len(payload):,} bytes")
+    if brotli is None:
+        log("brotli 모듈 없음: .br 생략")
+
+    return {path: len(payload) for path, payload in outputs.items()}
+
+
+########################################
+# 오프라인 셸 (서비스 워커 + 매니페스트)
+########################################
+
+PWA_THEME_COLOR = "#2563eb"
+PWA_BACKGROUND_COLOR = "#eff6ff"
+
+
+def offline_shell_paths(output_path):
+    """출력 HTML 경로 -> (서비스 워커 경로, 매니페스트 경로): ./out.html -> ./out.sw.js, ./out.webmanifest"""
+    root, _ = os.path.splitext(output_path)
+    return f"{root}.sw.js", f"{root}.webmanifest"
+
+
+def build_service_worker(page_name, manifest_name, production=False, page_data=b""):
+    """
+    service_worker.js 템플릿 -> 워커 스크립트 bytes
+    page_name: 페이지 파일 이름 (워커와 같은 디렉터리)
+    page_data: 페이지 bytes. 캐시 이름 버전 = 워커 템플릿 해시 + 페이지 해시
+        -> 페이지가 바뀌면 워커 바이트도 바뀌어서 브라우저가 새 워커를 설치하며 새 페이지를 미리 받고,
+           활성화 때 예전 캐시를 지움 (그 사이 열린 페이지는 stale-while-revalidate 로 갱신)
+    """
+    import hashlib
+    import json
+
+    with open(SW_TEMPLATE_PATH, "rb") as f:
+        shell_version = hashlib.sha256(f.read()).hexdigest()[:8]
+    page_version = hashlib.sha256(page_data).hexdigest()[:10]
+    precache = [manifest_name] if production else [manifest_name, TAILWIND_CDN_URL]
+    slots = {
+        "cache_name_json": json.dumps(f"baad-shield:{page_name}:{shell_version}.{page_version}",
+                                      ensure_ascii=False),
+        "page_url_json": json.dumps(page_name, ensure_ascii=False),
+        "precache_json": json.dumps(precache, ensure_ascii=False),
+    }
+    return render_template(slots, path=SW_TEMPLATE_PATH)
+
+
+def build_manifest(title, page_name):
+    """웹 앱 매니페스트 bytes (아이콘은 HEADER_BADGE 이모지 SVG)"""
+    import json
+    from urllib.parse import quote
+
+    icon = ('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">'
+            f'<text y=".9em" font-size="90">{HEADER_BADGE}</text></svg>')
+    manifest = {
+        "name": title,
+        "short_name": title,
+        "start_url": page_name,
+        "scope": "./",
+        "display": "standalone",
+        "background_color": PWA_BACKGROUND_COLOR,
+        "theme_color": PWA_THEME_COLOR,
+        "icons": [{"src": "data:image/svg+xml," + quote(icon), "sizes": "any", "type": "image/svg+xml"}],
+    }
+    return json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def write_offline_shell(output_path, page_data, title=PAGE_TITLE, production=False, log=print):
+    """
+    output_path 페이지(page_data 는 그 bytes)용 서비스 워커 + 매니페스트를 옆에 씀
+    페이지를 쓴 뒤에 불러야 새 워커가 설치하면서 새 페이지를 받음. return: (워커 경로, 매니페스트 경로)
+    """
+    sw_path, manifest_path = offline_shell_paths(output_path)
+    page_name = os.path.basename(output_path)
+    outputs = {
+        sw_path: build_service_worker(page_name, os.path.basename(manifest_path), production, page_data),
+        manifest_path: build_manifest(title, page_name),
+    }
+    for path, payload in outputs.items():
+        # 바뀌지 않았으면 다시 쓰지 않음 (워커 바이트가 같으면 브라우저가 재설치하지 않음 + 수정 시각 유지)
+        try:
+            with open(path, "rb") as f:
+                if f.read() == payload:
+                    continue
+        except OSError:
+            pass
+        write_atomic(path, payload)
+        log(f"오프라인 셸: {path}")
+    return sw_path, manifest_path
+
+
+########################################
+# 메인 실행부 (라이브러리 API + CLI)
+########################################
+
+def _derived_path(output_path, default_path, suffix):
+    """기본 출력 경로면 설정값 경로, 아니면 출력 파일 옆에 "<이름>.<suffix>.json" """
+    if output_path == OUTPUT_HTML:
+        return default_path
+    root, _ = os.path.splitext(output_path)
+    return f"{root}.{suffix}.json"
+
+
+def read_input_lines(input_path):
+    """txt 경로 -> 라인 리스트 ("-" 이면 표준입력을 UTF-8 로 읽음)"""
+    import sys
+
+    if input_path == "-":
+        import io
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8").readlines()
+    with open(input_path, "r", encoding="utf-8") as f:
+        return f.readlines()
+
+
+def generate_dashboard(input_path=TEXT_FILE, output_path=OUTPUT_HTML, base_time=BASE_TIME_STR,
+                       title=PAGE_TITLE, tz=BASE_TZ, production=PRODUCTION_BUILD,
+                       state_path=None, delta_path=None, identity_path=None,
+                       plan_from=None, march_speed=PLAN_MARCH_SPEED, plan_horizon_min=PLAN_HORIZON_MIN,
+                       targets_for=None, targets_k=None, queries=None, offline=OFFLINE_SHELL):
+    """
+    txt 하나 -> 대시보드 HTML 하나 (+ 상태/델타, 프로덕션 산출물)
+
+    input_path: 쉴드/좌표 txt ("-" 이면 표준입력)
+    output_path: 결과 HTML ("-" 이면 표준출력, 이때 상태/델타는 경로를 직접 줬을 때만 씀)
+    base_time: "YYYY-MM-DD HH:MM:SS" 문자열 또는 시간대가 붙은 datetime
+    state_path / delta_path / identity_path: None 이면 출력 경로에서 유도
+        (기본 출력이면 STATE_JSON / DELTA_JSON / IDENTITY_JSON)
+    plan_from: (x, y) 를 주면 그 좌표에서 march_speed 로 출발하는 공격 순서를 계산해 페이지에 넣음
+    targets_for: 연맹 이름을 주면 그 연맹원마다 가까운 타겟 targets_k 명을 계산해 패널 + 파일로 냄
+    queries: ["이름:질의", ...] 페이지 필터 버튼으로 넣을 질의 (query.py 문법)
+    offline: True 면 서비스 워커 + 매니페스트를 옆에 써서 재방문 때 캐시에서 바로 열림 (표준출력이면 무시)
+    return: {"output", "rows", "issues", "version"}
+    """
+    import sys
+
+    to_stdout = output_path == "-"
+    # 표준출력으로 HTML 을 낼 때는 진행 메시지를 stderr 로
+    log = (lambda msg: print(msg, file=sys.stderr)) if to_stdout else print
+
+    if isinstance(base_time, str):
+        base_time = parse_base_time(base_time, tz)
+
+    # txt 읽기
+    lines = read_input_lines(input_path)
+
+    # 파싱
+    issues = []
+    rows = parse_txt_lines(lines, base_time, issues)
+    source = "<stdin>" if input_path == "-" else input_path
+    for line_no, message in issues:
+        log(f"경고: {source}:{line_no}: {message}")
+
+    result = publish_dashboard(
+        rows, base_time, output_path=output_path, title=title, production=production,
+        state_path=state_path, delta_path=delta_path, identity_path=identity_path,
+        plan_from=plan_from, march_speed=march_speed, plan_horizon_min=plan_horizon_min,
+        targets_for=targets_for, targets_k=targets_k, queries=queries, offline=offline, log=log,
+    )
+    result["issues"] = issues
+    return result
+
+
+def publish_dashboard(rows, base_time, output_path=OUTPUT_HTML, title=PAGE_TITLE, production=PRODUCTION_BUILD,
+                      state_path=None, delta_path=None, identity_path=None,
+                      plan_from=None, march_speed=PLAN_MARCH_SPEED, plan_horizon_min=PLAN_HORIZON_MIN,
+                      targets_for=None, targets_k=None, queries=None, offline=OFFLINE_SHELL, assign_identity=True,
+                      log=print):
+    """
+    이미 파싱된 rows -> 식별 ID / 상태·델타 / 공격 순서 / 연맹원별 타겟 / HTML 산출물
+    (generate_dashboard 의 파싱 이후 부분, 여러 덤프를 합친 rows 에도 씀)
+    assign_identity: False 면 rows 에 이미 ID 가 붙어 있다고 보고 건드리지 않음 (fanout.py 의 공유 행 표)
+    return: {"output", "rows", "version"}
+    """
+    import sys
+
+    to_stdout = output_path == "-"
+    if not to_stdout:
+        state_path = state_path or _derived_path(output_path, STATE_JSON, "state")
+        delta_path = delta_path or _derived_path(output_path, DELTA_JSON, "delta")
+        identity_path = identity_path or _derived_path(output_path, IDENTITY_JSON, "identity")
+
+    # 커맨더 식별 (덤프가 바뀌어도 같은 사람은 같은 ID -> 행 키)
+    if assign_identity:
+        from identity import assign_ids
+        id_stats = assign_ids(rows, int(base_time.timestamp()), identity_path)
+        if id_stats["fuzzy"] or id_stats["coord"]:
+            log(f"식별: 이름 변형/개명 {id_stats['fuzzy'] + id_stats['coord']}명을 기존 ID 로 연결")
+
+    # 델타 (직전 실행 결과와 비교)
+    state = build_state(rows, base_time)
+    if state_path and delta_path:
+        write_delta_outputs(state, state_path, delta_path, log=log)
+
+    # 공격 순서 (요청했을 때만)
+    plan = None
+    if plan_from is not None:
+        from planner import plan_route
+        plan = plan_route(rows, plan_from, march_speed, int(base_time.timestamp()), plan_horizon_min * 60)
+        log(f"공격 순서: {len(plan)}곳")
+
+    # 연맹원별 가까운 타겟 (요청했을 때만)
+    targets = None
+    if targets_for:
+        from targets import TARGET_K, find_targets, write_targets
+        targets = find_targets(rows, targets_for, int(base_time.timestamp()), targets_k or TARGET_K)
+        if not to_stdout:
+            targets_path = _derived_path(output_path, TARGETS_JSON, "targets")
+            write_targets(targets, targets_path)
+            log(f"연맹원별 타겟: {len(targets)}명 -> {targets_path}")
+
+    # 오프라인 셸 (페이지가 등록할 워커 / 매니페스트, 파일은 페이지를 쓴 뒤에)
+    offline = offline and not to_stdout
+    sw_url = manifest_url = ""
+    if offline:
+        sw_url, manifest_url = (os.path.basename(p) for p in offline_shell_paths(output_path))
+
+    # HTML 생성
+    page_options = {
+        "production": production,
+        "title": title,
+        "data_version": state["version"] if delta_path else "",
+        "delta_url": os.path.basename(delta_path) if delta_path else "",
+        "plan": plan,
+        "plan_start": plan_from,
+        "plan_speed": march_speed,
+        "targets": targets,
+        "targets_alliance": targets_for or "",
+        "queries": parse_query_specs(queries),
+        "sw_url": sw_url,
+        "manifest_url": manifest_url,
+    }
+    html_result = build_html_bytes(rows, base_time, **page_options)
+
+    # 저장
+    if to_stdout:
+        sys.stdout.buffer.write(html_result)
+        sys.stdout.flush()
+    elif production:
+        dev_size = len(build_html_bytes(rows, base_time, **{**page_options, "production": False}))
+        write_production_assets(html_result, output_path, dev_size=dev_size, log=log)
+    else:
+        write_atomic(output_path, html_result)
+    if offline:
+        write_offline_shell(output_path, html_result, title, production, log=log)
+
+    log(f"완료: {'<stdout>' if to_stdout else output_path} 에 HTML 생성됨")
+    return {"output": output_path, "rows": len(rows), "version": state["version"]}
+
+
+def _run_job(job):
+    """배치 작업 하나 (워커 프로세스에서 실행)"""
+    return generate_dashboard(**job)
+
+
+def _job_paths(job):
+    """배치 작업 하나가 쓰는 파일 (HTML + 상태/델타/식별 인덱스, publish_dashboard 와 같은 유도 규칙)"""
+    output_path = job.get("output_path", OUTPUT_HTML)
+    paths = [output_path]
+    for key, default_path, suffix in (("state_path", STATE_JSON, "state"), ("delta_path", DELTA_JSON, "delta"),
+                                      ("identity_path", IDENTITY_JSON, "identity")):
+        path = job.get(key)
+        if path is None and output_path != "-":
+            path = _derived_path(output_path, default_path, suffix)
+        if path is not None:
+            paths.append(path)
+    return [p if p == "-" else os.path.normcase(os.path.abspath(p)) for p in paths]
+
+
+def check_batch_outputs(jobs):
+    """두 작업이 같은 파일(표준출력 포함)에 쓰면 ValueError (동시에 돌면서 서로 덮어씀)"""
+    owner = {}
+    for idx, job in enumerate(jobs):
+        for path in _job_paths(job):
+            other = owner.setdefault(path, idx)
+            if other != idx:
+                raise ValueError(f"배치 작업 {other + 1}번과 {idx + 1}번이 같은 파일에 씀: {path} "
+                                 f"(작업마다 \"output\" 을 다르게 지정)")
+
+
+def generate_batch(jobs, workers=None):
+    """
+    여러 대시보드를 한 프로세스(풀)에서 생성. 인터프리터 기동/모듈 로딩은 워커당 한 번.
+    jobs: generate_dashboard 키워드 인자 dict 리스트 (작업끼리 출력/상태/델타/식별 인덱스 파일이 겹치면 ValueError)
+    workers: 워커 프로세스 수 (None 이면 CPU 수, 1 이면 현재 프로세스에서 순서대로)
+    return: 작업 순서대로 결과 리스트
+    """
+    check_batch_outputs(jobs)
+    if workers == 1 or len(jobs) <= 1:
+        return [_run_job(job) for job in jobs]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_job, jobs))
+
+
+# 배치 JSON 에서 CLI 옵션 이름으로 써도 되는 키
+BATCH_KEY_ALIASES = {"input": "input_path", "output": "output_path", "state": "state_path", "delta": "delta_path",
+                     "identity": "identity_path"}
+
+
+def _parse_coord(text):
+    """"213,409" / "(213, 409)" -> (213, 409)"""
+    x, _, y = text.strip("() ").partition(",")
+    return int(x), int(y)
+
+
+def build_arg_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="쉴드/좌표 txt -> 실시간 카운트다운 대시보드 HTML")
+    parser.add_argument("-i", "--input", default=TEXT_FILE, help="입력 txt (- 이면 표준입력, 기본: %(default)s)")
+    parser.add_argument("-o", "--output", default=OUTPUT_HTML, help="출력 HTML (- 이면 표준출력, 기본: %(default)s)")
+    parser.add_argument("-t", "--base-time", default=BASE_TIME_STR, help="기준 시각 'YYYY-MM-DD HH:MM:SS' (기본: %(default)s)")
+    parser.add_argument("--tz", default=BASE_TZ, help="기준 시각의 시간대 (기본: %(default)s)")
+    parser.add_argument("--title", default=PAGE_TITLE, help="페이지 제목")
+    parser.add_argument("--production", action="store_true", default=PRODUCTION_BUILD,
+                        help="인라인 CSS + 해시 파일명 .gz/.br 생성")
+    parser.add_argument("--state", default=None, help="상태 JSON 경로 (기본: 출력 경로에서 유도)")
+    parser.add_argument("--delta", default=None, help="델타 JSON 경로 (기본: 출력 경로에서 유도)")
+    parser.add_argument("--identity", default=None, help="커맨더 식별 인덱스 JSON 경로 (기본: 출력 경로에서 유도)")
+    parser.add_argument("--plan-from", type=_parse_coord, metavar="X,Y", help="공격 순서 출발 좌표")
+    parser.add_argument("--march-speed", type=float, default=PLAN_MARCH_SPEED,
+                        help="행군 속도, 좌표 단위/분 (기본: %(default)s)")
+    parser.add_argument("--plan-horizon", type=int, default=PLAN_HORIZON_MIN,
+                        help="공격 순서 계획 범위, 분 (기본: %(default)s)")
+    parser.add_argument("--targets-for", metavar="ALLIANCE", help="이 연맹원마다 가까운 타겟을 계산해 패널로 넣음")
+    parser.add_argument("--targets-k", type=int, default=None, help="연맹원마다 뽑는 타겟 수 (기본: 5)")
+    parser.add_argument("--query", action="append", metavar="NAME:QUERY",
+                        help='페이지 필터 버튼으로 넣을 질의 (여러 번 가능), 예: "곧 풀림:hq>=29 and expires<45m"')
+    parser.add_argument("--offline", dest="offline", action="store_true", default=OFFLINE_SHELL,
+                        help="서비스 워커 / 매니페스트를 같이 씀 (출력 폴더에 파일 2개가 더 생김)")
+    parser.add_argument("--no-offline", dest="offline", action="store_false", help="서비스 워커 / 매니페스트를 만들지 않음")
+    parser.add_argument("--batch", metavar="JOBS_JSON",
+                        help="작업 목록 JSON (객체 배열: input/output/base_time/title/tz/production, 빠진 키는 위 옵션값 사용)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="배치 워커 프로세스 수")
+    return parser
+
+
+def main(argv=None):
+    import sys
+
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        # 인자 없는 실행(cron 등)은 argparse 를 불러오지 않고 기본값으로 바로 생성
+        generate_dashboard()
+        return
+
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    try:
+        parse_query_specs(args.query)
+    except ValueError as e:
+        parser.error(str(e))
+
+    defaults = {
+        "input_path": args.input,
+        "output_path": args.output,
+        "base_time": args.base_time,
+        "title": args.title,
+        "tz": args.tz,
+        "production": args.production,
+        "state_path": args.state,
+        "delta_path": args.delta,
+        "identity_path": args.identity,
+        "plan_from": args.plan_from,
+        "march_speed": args.march_speed,
+        "plan_horizon_min": args.plan_horizon,
+        "targets_for": args.targets_for,
+        "targets_k": args.targets_k,
+        "queries": args.query,
+        "offline": args.offline,
+    }
+
+    if not args.batch:
+        generate_dashboard(**defaults)
+        return
+
+    import json
+
+    with open(args.batch, "r", encoding="utf-8") as f:
+        job_specs = json.load(f)
+    # 배치에서는 상태/델타/식별 인덱스 경로를 작업마다 출력 경로에서 유도
+    # (--identity 하나를 병렬 작업이 같이 읽고 쓰면 서로 덮어씀)
+    defaults["state_path"] = defaults["delta_path"] = defaults["identity_path"] = None
+    jobs = [{**defaults, **{BATCH_KEY_ALIASES.get(k, k): v for k, v in spec.items()}} for spec in job_specs]
+    try:
+        check_batch_outputs(jobs)
+    except ValueError as e:
+        parser.error(str(e))
+    results = generate_batch(jobs, workers=args.workers)
+    print(f"배치 완료: {len(results)}개 대시보드")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+공격 순서 플래너
+
+출발 좌표 + 행군 속도 -> 쉴드가 없거나 곧 풀리는 커맨더를 어떤 순서로 칠지.
+  - 각 타겟은 시간창 [열림, 마감] 을 가짐 (열림 = 쉴드 만료 시각, 이미 만료면 지금 / 마감 = 지금 + horizon)
+  - 도착이 열림보다 이르면 그 자리에서 기다림
+  - 탐욕(가장 빨리 칠 수 있는 타겟 먼저) + 시간창 2-opt 로 전체 종료 시각을 줄임
+  - 격자 공간 인덱스로 가까운 칸부터 찾고, 더 먼 칸은 도착 시각 하한으로 가지치기
+"""
+import math
+import time
+
+########################################
+# 설정값
+########################################
+
+GRID_CELL = 25  # 공간 인덱스 칸 크기 (좌표 단위)
+TWO_OPT_WINDOW = 25  # 2-opt 에서 뒤집어 볼 최대 구간 길이
+TWO_OPT_BUDGET_SEC = 0.4  # 2-opt 개선에 쓸 최대 시간
+
+
+########################################
+# 공간 인덱스
+########################################
+
+class GridIndex:
+    """
+    좌표 -> 격자 칸 버킷. 남은 타겟만 들고 있고 방문하면 지움.
+    rings(cx, cy) 로 출발 칸에서 바깥쪽으로 한 겹씩 칸을 돌려줌
+    """
+
+    def __init__(self, points, cell=GRID_CELL):
+        self.cell = cell
+        self.buckets = {}
+        self.count = 0
+        for idx, (x, y) in enumerate(points):
+            self.buckets.setdefault((int(x // cell), int(y // cell)), set()).add(idx)
+            self.count += 1
+        if self.buckets:
+            xs = [k[0] for k in self.buckets]
+            ys = [k[1] for k in self.buckets]
+            self.max_ring = max(max(xs) - min(xs), max(ys) - min(ys)) + 1
+        else:
+            self.max_ring = 0
+
+    def remove(self, idx, x, y):
+        key = (int(x // self.cell), int(y // self.cell))
+        bucket = self.buckets[key]
+        bucket.discard(idx)
+        if not bucket:
+            del self.buckets[key]
+        self.count -= 1
+
+    def ring(self, cx, cy, r):
+        """(cx, cy) 에서 체비셰프 거리 r 인 칸들의 타겟 인덱스"""
+        buckets = self.buckets
+        if r == 0:
+            yield from buckets.get((cx, cy), ())
+            return
+        for dx in range(-r, r + 1):
+            for dy in (-r, r):
+                yield from buckets.get((cx + dx, cy + dy), ())
+        for dy in range(-r + 1, r):
+            for dx in (-r, r):
+                yield from buckets.get((cx + dx, cy + dy), ())
+
+
+########################################
+# 플래너
+########################################
+
+def collect_targets(rows, now_ts, horizon_sec):
+    """
+    rows -> 시간창 안에 열리는 타겟 리스트
+        {"name", "x", "y", "hq", "open": 칠 수 있게 되는 시각(epoch 초)}
+    """
+    deadline = now_ts + horizon_sec
+    targets = []
+    for r in rows:
+        if not (r["x"].lstrip("-").isdigit() and r["y"].lstrip("-").isdigit()):
+            continue
+        if r["is_expired"]:
+            open_ts = now_ts
+        elif r["expire_ts"] <= deadline:
+            open_ts = max(now_ts, r["expire_ts"])
+        else:
+            continue
+        targets.append({
+            "name": r["name"],
+            "x": int(r["x"]),
+            "y": int(r["y"]),
+            "hq": r.get("hq"),
+            "open": open_ts,
+        })
+    return targets
+
+
+def _schedule(route, targets, start, start_ts, sec_per_unit, hit_sec):
+    """방문 순서 -> 각 타겟의 (도착 시각, 타격 시작 시각) 리스트"""
+    times = []
+    px, py = start
+    t = start_ts
+    for idx in route:
+        tgt = targets[idx]
+        arrive = t + math.hypot(tgt["x"] - px, tgt["y"] - py) * sec_per_unit
+        ready = arrive if arrive >= tgt["open"] else tgt["open"]
+        times.append((arrive, ready))
+        t = ready + hit_sec
+        px, py = tgt["x"], tgt["y"]
+    return times
+
+
+def _greedy_route(targets, start, start_ts, deadline, sec_per_unit, hit_sec):
+    """
+    매번 "가장 빨리 칠 수 있는(max(도착, 열림) 최소)" 타겟으로 이동.
+    링 r 의 칸은 최소 (r-1)*cell 만큼 떨어져 있으므로 그 도착 하한이 현재 최선보다 늦으면 탐색 중단
+    """
+    index = GridIndex([(t["x"], t["y"]) for t in targets])
+    cell = index.cell
+    route = []
+    px, py = start
+    t = start_ts
+
+    while index.count:
+        cx, cy = int(px // cell), int(py // cell)
+        best = None
+        best_ready = math.inf
+        best_dist = math.inf
+        r = 0
+        while r <= index.max_ring + abs(cx) + abs(cy):
+            lower_bound = t + max(0, r - 1) * cell * sec_per_unit
+            if lower_bound > best_ready or lower_bound > deadline:
+                break
+            for idx in index.ring(cx, cy, r):
+                tgt = targets[idx]
+                dist = math.hypot(tgt["x"] - px, tgt["y"] - py)
+                arrive = t + dist * sec_per_unit
+                ready = arrive if arrive >= tgt["open"] else tgt["open"]
+                if ready < best_ready or (ready == best_ready and dist < best_dist):
+                    best, best_ready, best_dist = idx, ready, dist
+            r += 1
+
+        if best is None or best_ready > deadline:
+            break
+        route.append(best)
+        tgt = targets[best]
+        index.remove(best, tgt["x"], tgt["y"])
+        px, py = tgt["x"], tgt["y"]
+        t = best_ready + hit_sec
+
+    return route
+
+
+def _two_opt(route, targets, start, start_ts, deadline, sec_per_unit, hit_sec,
+             window=TWO_OPT_WINDOW, budget_sec=TWO_OPT_BUDGET_SEC):
+    """
+    구간 [i, j] 를 뒤집어 보고 j 다음 지점의 타격 시작 시각이 당겨지면 채택.
+    스케줄은 단조(앞이 빨라지면 뒤도 늦어지지 않음)라서 j+1 시점만 비교하면 전체 종료 시각이 나빠지지 않음.
+    구간 길이 window, 총 시간 budget_sec 로 제한
+    """
+    if len(route) < 3:
+        return route
+    started = time.perf_counter()
+    times = _schedule(route, targets, start, start_ts, sec_per_unit, hit_sec)
+    n = len(route)
+    improved = True
+
+    def pos(k):
+        if k < 0:
+            return start
+        tgt = targets[route[k]]
+        return tgt["x"], tgt["y"]
+
+    while improved:
+        improved = False
+        for i in range(n - 1):
+            if time.perf_counter() - started > budget_sec:
+                return route
+            prev_free = start_ts if i == 0 else times[i - 1][1] + hit_sec
+            for j in range(i + 1, min(n, i + window)):
+                # 뒤집은 구간 route[j], route[j-1], ..., route[i] 를 순서대로 다시 계산
+                px, py = pos(i - 1)
+                t = prev_free
+                feasible = True
+                for k in range(j, i - 1, -1):
+                    tgt = targets[route[k]]
+                    arrive = t + math.hypot(tgt["x"] - px, tgt["y"] - py) * sec_per_unit
+                    ready = arrive if arrive >= tgt["open"] else tgt["open"]
+                    if ready > deadline:
+                        feasible = False
+                        break
+                    t = ready + hit_sec
+                    px, py = tgt["x"], tgt["y"]
+                if not feasible:
+                    continue
+                if j + 1 < n:
+                    nxt = targets[route[j + 1]]
+                    arrive = t + math.hypot(nxt["x"] - px, nxt["y"] - py) * sec_per_unit
+                    new_key = arrive if arrive >= nxt["open"] else nxt["open"]
+                    old_key = times[j + 1][1]
+                else:
+                    new_key = t
+                    old_key = times[j][1] + hit_sec
+                if new_key < old_key - 1e-6:
+                    route[i:j + 1] = route[i:j + 1][::-1]
+                    times = _schedule(route, targets, start, start_ts, sec_per_unit, hit_sec)
+                    prev_free = start_ts if i == 0 else times[i - 1][1] + hit_sec
+                    improved = True
+    return route
+
+
+def plan_route(rows, start, speed, now_ts, horizon_sec=3600, hit_sec=0):
+    """
+    rows: parse_txt_lines 결과
+    start: (x, y) 출발 좌표
+    speed: 행군 속도 (좌표 단위 / 분)
+    now_ts: 출발 시각 (UTC epoch 초, 보통 기준 시각)
+    horizon_sec: 이 시간 안에 칠 수 있는 타겟만 계획
+    hit_sec: 타겟 하나 치는 데 머무는 시간
+    return: 방문 순서대로
+        [{"order", "name", "x", "y", "hq", "open", "arrive", "ready", "wait"}, ...]  (시각은 epoch 초)
+    """
+    if speed <= 0:
+        raise ValueError("행군 속도는 0보다 커야 함")
+    sec_per_unit = 60.0 / speed
+    deadline = now_ts + horizon_sec
+    targets = collect_targets(rows, now_ts, horizon_sec)
+
+    route = _greedy_route(targets, start, now_ts, deadline, sec_per_unit, hit_sec)
+    route = _two_opt(route, targets, start, now_ts, deadline, sec_per_unit, hit_sec)
+    times = _schedule(route, targets, start, now_ts, sec_per_unit, hit_sec)
+
+    plan = []
+    for order, (idx, (arrive, ready)) in enumerate(zip(route, times), 1):
+        tgt = targets[idx]
+        plan.append({
+            "order": order,
+            "name": tgt["name"],
+            "x": tgt["x"],
+            "y": tgt["y"],
+            "hq": tgt["hq"],
+            "open": tgt["open"],
+            "arrive": int(arrive),
+            "ready": int(ready),
+            "wait": int(ready - arrive),
+        })
+    return plan
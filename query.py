@@ -0,0 +1,401 @@
+"""
+필터 질의 언어
+
+    hq>=29 and status=active and expires<45m and near(213,409,50)
+
+한 번 파싱한 구문 트리를 두 곳으로 컴파일함.
+  - 파이썬: 술어 소스를 만들어 compile -> 행마다 함수 호출 한 번 (CLI / 내보내기)
+  - 자바스크립트: 페이지 행 상태 엔진의 타입 배열(상태 코드/만료 시각/HQ/좌표)을 읽는 식
+rows 전체를 거를 때(select)는 최상위 and 조건 중 하나로 후보를 먼저 줄임.
+  - status / expires -> 만료 시각 정렬 색인(snapshot.ShieldIndex)의 이분 탐색 구간
+  - near -> 좌표 격자 칸
+  - 가장 작은 후보에만 전체 술어를 적용
+
+문법:
+    식    := 항 ("or" 항)*
+    항    := 인자 ("and" 인자)*
+    인자  := "not" 인자 | "(" 식 ")" | near(x, y, r) | 필드 연산자 값
+    필드:
+      name, alliance     = != ~(포함)   대소문자 무시, 공백이 있으면 "..." 로
+      hq, x, y           = != < <= > >=
+      status             = !=           active(쉴드 있음, critical 포함) / critical / expired
+      expires            = != < <= > >= 남은 쉴드 시간 "45m", "2h30m", "1d" (숫자만 쓰면 분). 쉴드 없는 행은 항상 거짓
+값이 없는 칸(HQ 빈칸 또는 0, 깨진 좌표)은 비교가 모두 거짓. near 반경은 0 이상.
+
+사용 예:
+    python query.py "hq>=29 and expires<45m" -i ./new.txt
+    python query.py "status=expired and near(213,409,50)" --js
+"""
+import bisect
+import re
+
+from main import (BASE_TIME_STR, BASE_TZ, COORD_RE, CRITICAL_SEC, DURATION_TEXT_RE, TEXT_FILE, coord_int,
+                  parse_duration)
+
+########################################
+# 설정값
+########################################
+
+QUERY_GRID_CELL = 25  # near() 후보용 좌표 격자 칸 크기
+JS_NO_COORD = -2147483648  # 페이지 행 상태 엔진의 "좌표 없음" 값 (Int32 최솟값, 음수 좌표와 안 겹침)
+
+TEXT_FIELDS = ("name", "alliance")
+NUMBER_FIELDS = ("hq", "x", "y")
+STATUS_VALUES = ("active", "critical", "expired")
+
+
+########################################
+# 파서
+########################################
+
+QUERY_TOKEN_RE = re.compile(r"""
+    \s*(?:
+      (?P<punct>[(),])
+    | (?P<op>>=|<=|!=|=|<|>|~)
+    | "(?P<dq>[^"]*)" | '(?P<sq>[^']*)'
+    | (?P<word>[^\s(),<>=!~"']+)
+    )""", re.X)
+
+
+def tokenize(text):
+    """질의 문자열 -> [(종류, 값, 위치), ...]  종류: punct / op / str / word"""
+    tokens = []
+    pos = 0
+    end = len(text.rstrip())
+    while pos < end:
+        m = QUERY_TOKEN_RE.match(text, pos)
+        if m is None or m.end() == pos:
+            raise ValueError(f"질의 {pos + 1}번째 글자를 읽을 수 없음: {text[pos:pos + 10]!r}")
+        kind = m.lastgroup
+        start = m.start(kind)
+        value = m.group(kind)
+        if kind in ("dq", "sq"):
+            kind = "str"
+        tokens.append((kind, value, start))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None, len(self.text))
+
+    def take(self):
+        tok = self.peek()
+        self.pos += 1
+        return tok
+
+    def fail(self, message, tok=None):
+        where = (tok or self.peek())[2] + 1
+        raise ValueError(f"질의 {where}번째 글자: {message}")
+
+    def keyword(self, word):
+        kind, value, _ = self.peek()
+        if kind == "word" and value.lower() == word:
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, punct):
+        tok = self.take()
+        if tok[0] != "punct" or tok[1] != punct:
+            self.fail(f"'{punct}' 가 와야 함", tok)
+
+    def parse(self):
+        node = self.expr()
+        if self.pos < len(self.tokens):
+            self.fail(f"예상 못한 '{self.peek()[1]}'")
+        return node
+
+    def expr(self):
+        parts = [self.term()]
+        while self.keyword("or"):
+            parts.append(self.term())
+        return parts[0] if len(parts) == 1 else ("or", parts)
+
+    def term(self):
+        parts = [self.factor()]
+        while self.keyword("and"):
+            parts.append(self.factor())
+        return parts[0] if len(parts) == 1 else ("and", parts)
+
+    def number(self):
+        tok = self.take()
+        if tok[0] != "word" or not COORD_RE.fullmatch(tok[1]):
+            self.fail("정수가 와야 함", tok)
+        return int(tok[1])
+
+    def factor(self):
+        if self.keyword("not"):
+            return ("not", self.factor())
+        kind, value, _ = tok = self.take()
+        if kind == "punct" and value == "(":
+            node = self.expr()
+            self.expect(")")
+            return node
+        if kind != "word":
+            self.fail("필드 이름이 와야 함", tok)
+
+        field = value.lower()
+        if field == "near":
+            self.expect("(")
+            x = self.number()
+            self.expect(",")
+            y = self.number()
+            self.expect(",")
+            r_tok = self.peek()
+            r = self.number()
+            if r < 0:
+                self.fail("near 반경은 0 이상이어야 함", r_tok)
+            self.expect(")")
+            return ("near", x, y, r)
+
+        op_tok = self.take()
+        if op_tok[0] != "op":
+            self.fail(f"'{value}' 뒤에 비교 연산자가 와야 함", op_tok)
+        op = op_tok[1]
+        val_tok = self.take()
+        if val_tok[0] not in ("word", "str"):
+            self.fail("비교할 값이 와야 함", val_tok)
+        raw = val_tok[1]
+
+        if field in TEXT_FIELDS:
+            if op not in ("=", "!=", "~"):
+                self.fail(f"{field} 에는 = != ~ 만 쓸 수 있음", op_tok)
+            return ("cmp", field, op, raw.lower())
+        if op == "~":
+            self.fail(f"{field} 에는 ~ 를 쓸 수 없음", op_tok)
+        if field in NUMBER_FIELDS:
+            if not COORD_RE.fullmatch(raw):
+                self.fail(f"{field} 값은 정수여야 함", val_tok)
+            return ("cmp", field, op, int(raw))
+        if field == "status":
+            if op not in ("=", "!=") or raw.lower() not in STATUS_VALUES:
+                self.fail("status 는 = / != active|critical|expired 만 됨", val_tok)
+            return ("cmp", field, op, raw.lower())
+        if field == "expires":
+            if raw.isdigit():
+                return ("cmp", field, op, int(raw) * 60)
+            if not DURATION_TEXT_RE.fullmatch(raw):
+                self.fail(f"시간 값을 읽을 수 없음: {raw!r}", val_tok)
+            return ("cmp", field, op, parse_duration(raw))
+        self.fail(f"알 수 없는 필드: {value}", tok)
+
+
+########################################
+# 컴파일
+########################################
+
+def _py(node):
+    """구문 트리 -> 파이썬 식 (변수: name, alliance, hq, x, y, expire_ts, now)"""
+    kind = node[0]
+    if kind in ("and", "or"):
+        return "(" + f" {kind} ".join(_py(n) for n in node[1]) + ")"
+    if kind == "not":
+        return f"(not {_py(node[1])})"
+    if kind == "near":
+        _, nx, ny, r = node
+        return f"(x is not None and (x - {nx}) * (x - {nx}) + (y - {ny}) * (y - {ny}) <= {r * r})"
+
+    _, field, op, value = node
+    if field in TEXT_FIELDS:
+        if op == "~":
+            return f"({value!r} in ({field} or '').lower())"
+        return f"(({field} or '').lower() {'==' if op == '=' else '!='} {value!r})"
+    pyop = "==" if op == "=" else op
+    if field == "hq":
+        # HQ 0 은 모름 (페이지 엔진의 hq 배열과 같은 규칙)
+        return f"(hq is not None and hq > 0 and hq {pyop} {value})"
+    if field in NUMBER_FIELDS:
+        return f"({field} is not None and {field} {pyop} {value})"
+    if field == "status":
+        test = {
+            "expired": "(expire_ts is None or expire_ts <= now)",
+            "critical": f"(expire_ts is not None and now < expire_ts < now + {CRITICAL_SEC})",
+            "active": "(expire_ts is not None and expire_ts > now)",
+        }[value]
+        return test if op == "=" else f"(not {test})"
+    # expires
+    return f"(expire_ts is not None and expire_ts > now and expire_ts - now {pyop} {value})"
+
+
+def _js(node):
+    """구문 트리 -> 자바스크립트 식 (행 상태 엔진의 i, now, expire, status, hq, xs, ys, names, alliances)"""
+    import json
+
+    kind = node[0]
+    if kind in ("and", "or"):
+        return "(" + (" && " if kind == "and" else " || ").join(_js(n) for n in node[1]) + ")"
+    if kind == "not":
+        return f"!{_js(node[1])}"
+    if kind == "near":
+        _, nx, ny, r = node
+        return f"(xs[i] !== {JS_NO_COORD} && (xs[i] - {nx}) * (xs[i] - {nx}) + (ys[i] - {ny}) * (ys[i] - {ny}) <= {r * r})"
+
+    _, field, op, value = node
+    jsop = {"=": "===", "!=": "!=="}.get(op, op)
+    if field in TEXT_FIELDS:
+        arr = "names" if field == "name" else "alliances"
+        if op == "~":
+            return f"{arr}[i].includes({json.dumps(value, ensure_ascii=False)})"
+        return f"({arr}[i] {jsop} {json.dumps(value, ensure_ascii=False)})"
+    if field == "hq":
+        return f"(hq[i] > 0 && hq[i] {jsop} {value})"
+    if field in ("x", "y"):
+        return f"({field}s[i] !== {JS_NO_COORD} && {field}s[i] {jsop} {value})"
+    if field == "status":
+        # 엔진 상태 코드: 0 활성 / 1 긴급 / 2 만료
+        test = {"expired": "status[i] === 2", "critical": "status[i] === 1", "active": "status[i] !== 2"}[value]
+        return f"({test})" if op == "=" else f"!({test})"
+    return f"(expire[i] > now && expire[i] - now {jsop} {value})"
+
+
+class Query:
+    """
+    파싱 + 컴파일된 질의
+        q = Query("hq>=29 and expires<45m")
+        q.test(name, alliance, hq, x, y, expire_ts, now)  # 값으로 바로 (내보내기 튜플용)
+        q.matches(row, now)                               # parse_txt_lines 의 row dict
+        q.js                                               # 페이지용 식 소스
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.tree = _Parser(text).parse()
+        source = f"def _query(name, alliance, hq, x, y, expire_ts, now):\n    return {_py(self.tree)}\n"
+        namespace = {}
+        exec(compile(source, f"<query {text!r}>", "exec"), namespace)
+        self.test = namespace["_query"]
+        self.js = _js(self.tree)
+
+    def matches(self, row, now):
+        x, y = coord_int(row["x"]), coord_int(row["y"])
+        if x is None or y is None:
+            x = y = None
+        return self.test(row["name"], row.get("alliance"), row.get("hq"), x, y, row["expire_ts"], now)
+
+    def __repr__(self):
+        return f"Query({self.text!r})"
+
+
+########################################
+# 색인을 쓰는 선택
+########################################
+
+class RowIndex:
+    """rows 의 만료 시각 정렬 색인 + (처음 near 질의 때 만드는) 좌표 격자"""
+
+    def __init__(self, rows):
+        from snapshot import ShieldIndex
+
+        self.shield = ShieldIndex(rows)
+        self.rows = rows
+        self._grid = None
+
+    def _expire_slice(self, lo_ts, hi_ts, hi_inclusive):
+        """만료 시각이 (lo_ts, hi_ts) 또는 (lo_ts, hi_ts] 인 rows"""
+        ends = self.shield.ends
+        start = bisect.bisect_right(ends, lo_ts)
+        stop = (bisect.bisect_right if hi_inclusive else bisect.bisect_left)(ends, hi_ts)
+        return self.shield.rows[start:max(start, stop)]
+
+    def _grid_cells(self):
+        if self._grid is None:
+            cells = {}
+            for row in self.rows:
+                x, y = coord_int(row["x"]), coord_int(row["y"])
+                if x is not None and y is not None:
+                    cells.setdefault((x // QUERY_GRID_CELL, y // QUERY_GRID_CELL), []).append(row)
+            self._grid = cells
+        return self._grid
+
+    def candidates(self, node, now):
+        """조건 하나로 색인에서 뽑을 수 있는 후보 rows (색인을 못 쓰면 None)"""
+        kind = node[0]
+        if kind == "near":
+            _, nx, ny, r = node
+            cells = self._grid_cells()
+            out = []
+            for cx in range((nx - r) // QUERY_GRID_CELL, (nx + r) // QUERY_GRID_CELL + 1):
+                for cy in range((ny - r) // QUERY_GRID_CELL, (ny + r) // QUERY_GRID_CELL + 1):
+                    out.extend(cells.get((cx, cy), ()))
+            return out
+        if kind != "cmp" or node[2] == "!=":
+            return None
+        _, field, op, value = node
+        inf = float("inf")
+        if field == "status":
+            if value == "expired":
+                return self.shield.unshielded_at(now)
+            if value == "active":
+                return self.shield.shielded_at(now)
+            return self._expire_slice(now, now + CRITICAL_SEC, False)
+        if field == "expires":
+            if op in ("<", "<="):
+                return self._expire_slice(now, now + value, op == "<=")
+            if op == "=":
+                return self._expire_slice(now + value - 1, now + value, True)
+            return self._expire_slice(now + value - (op == ">="), inf, True)
+        return None
+
+
+def select(rows, query, now, index=None):
+    """
+    rows 중 query 에 맞는 것 (만료 시각 순)
+    query: Query 또는 질의 문자열 / index: 같은 rows 로 여러 번 물을 때 RowIndex 재사용
+    """
+    if isinstance(query, str):
+        query = Query(query)
+    index = index or RowIndex(rows)
+    tree = query.tree
+    conjuncts = tree[1] if tree[0] == "and" else [tree]
+
+    best = index.shield.rows
+    best_node = None
+    for node in conjuncts:
+        cand = index.candidates(node, now)
+        if cand is not None and len(cand) < len(best):
+            best, best_node = cand, node
+    out = [row for row in best if query.matches(row, now)]
+    if best_node is not None and best_node[0] == "near":
+        # 격자 후보는 칸 순서라 만료 시각 순으로 다시 정렬
+        out.sort(key=lambda r: float("-inf") if r["expire_ts"] is None else r["expire_ts"])
+    return out
+
+
+def main(argv=None):
+    import argparse
+
+    from main import parse_base_time, parse_txt_lines, read_input_lines
+
+    parser = argparse.ArgumentParser(description="질의에 맞는 커맨더 목록 (또는 페이지용 JS 식)")
+    parser.add_argument("query", help='예: "hq>=29 and status=active and expires<45m and near(213,409,50)"')
+    parser.add_argument("-i", "--input", default=TEXT_FILE, help="덤프 txt (- 이면 표준입력, 기본: %(default)s)")
+    parser.add_argument("-t", "--base-time", default=BASE_TIME_STR, help="기준 시각 (기본: %(default)s)")
+    parser.add_argument("--tz", default=BASE_TZ, help="기준 시각의 시간대 (기본: %(default)s)")
+    parser.add_argument("--js", action="store_true", help="목록 대신 컴파일된 자바스크립트 식만 출력")
+    args = parser.parse_args(argv)
+
+    try:
+        query = Query(args.query)
+    except ValueError as e:
+        parser.exit(2, f"오류: {e}\n")
+    if args.js:
+        print(query.js)
+        return
+
+    base_time = parse_base_time(args.base_time, args.tz)
+    rows = parse_txt_lines(read_input_lines(args.input), base_time)
+    matched = select(rows, query, int(base_time.timestamp()))
+    for row in matched:
+        print(f"{row['name']}\t{row['alliance']}\t{row['hq'] or '-'}\t({row['x']}, {row['y']})\t{row['countdown']}")
+    print(f"{len(matched)}명 / 전체 {len(rows)}명")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""
+대시보드 서버 모드 (응답 캐시 + ETag/304)
+
+덤프 txt 하나를 물고 있다가 요청마다 만들지 않고 캐시에서 내줌.
+  - 덤프 버전 = 파일 내용 + 기준 시각 해시. 파일이 바뀌면(크기/수정 시각) 다시 해시하고 다시 파싱
+    (기준 시각을 안 주면 파일 수정 시각이 기준 시각 -> 내용이 같아도 touch 만으로 새 버전)
+  - 응답 캐시: (덤프 버전, 경로, 질의) -> 본문. 총 바이트 수 제한 LRU
+    같은 키를 여러 요청이 동시에 처음 찾으면 하나만 만들고 나머지는 기다렸다 같이 씀
+  - 강한 ETag = 덤프 버전 + 응답 키 해시 -> If-None-Match 가 맞으면 본문 없이 304
+
+경로:
+    /             대시보드 HTML
+    /data.json    파싱된 커맨더 목록 (페이지 MAP_DATA 와 같은 형식)
+    /query?q=...  질의(query.py 문법) 결과 JSON
+    /stats        캐시 적중/실패/제거 수
+
+사용 예:
+    python serve.py -i ./new.txt --port 8000
+    python serve.py --load 500 --url http://127.0.0.1:8000/   # 부하 생성기
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from main import (BASE_TZ, PAGE_TITLE, TEXT_FILE, build_html_bytes, build_rows_json_bytes, parse_base_time,
+                  parse_txt_lines, resolve_tz)
+
+########################################
+# 설정값
+########################################
+
+SERVE_HOST = "127.0.0.1"
+SERVE_PORT = 8000
+CACHE_MAX_BYTES = 64 * 1024 * 1024  # 응답 캐시 총 크기
+SERVE_BACKLOG = 1024  # listen 대기열 (기본 5 면 동시 접속이 몰릴 때 SYN 재전송으로 수 초씩 밀림)
+LOAD_VIEWERS = 500  # 부하 생성기 동시 접속 수
+LOAD_REQUESTS = 4  # 접속마다 보내는 요청 수 (첫 요청 뒤로는 ETag 를 붙임)
+
+
+########################################
+# 응답 캐시
+########################################
+
+class ResponseCache:
+    """
+    키 -> (본문 bytes, ETag). 총 바이트가 max_bytes 를 넘으면 가장 오래 안 쓴 것부터 버림
+    get_or_build: 없으면 build() 로 만들어 넣음 (같은 키 동시 요청은 한 번만 만듦)
+    """
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.building = {}
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "not_modified": 0}
+
+    def get_or_build(self, key, build):
+        """return: (본문, ETag, 캐시 적중 여부)"""
+        while True:
+            with self.lock:
+                entry = self.entries.get(key)
+                if entry is not None:
+                    self.entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry[0], entry[1], True
+                waiter = self.building.get(key)
+                if waiter is None:
+                    waiter = self.building[key] = threading.Event()
+                    break
+            # 다른 스레드가 만드는 중: 끝나면 다시 찾아봄
+            waiter.wait()
+
+        try:
+            body, etag = build()
+            with self.lock:
+                self.stats["misses"] += 1
+                if len(body) <= self.max_bytes:
+                    self.entries[key] = (body, etag)
+                    self.size += len(body)
+                    while self.size > self.max_bytes:
+                        _, (old_body, _) = self.entries.popitem(last=False)
+                        self.size -= len(old_body)
+                        self.stats["evictions"] += 1
+        finally:
+            with self.lock:
+                del self.building[key]
+            waiter.set()
+        return body, etag, False
+
+    def drop_version(self, version):
+        """이전 덤프 버전 응답을 한꺼번에 버림"""
+        with self.lock:
+            for key in [k for k in self.entries if k[0] == version]:
+                body, _ = self.entries.pop(key)
+                self.size -= len(body)
+
+
+########################################
+# 덤프 상태
+########################################
+
+class DumpSource:
+    """
+    덤프 파일 -> (버전, rows, 기준 시각). 파일의 (크기, 수정 시각) 이 바뀌었을 때만 다시 읽음
+    base_time 을 안 주면 파일 수정 시각을 기준 시각으로 (남은시간은 붙여넣은 시점 기준)
+    버전은 내용과 기준 시각을 같이 해시 (페이지의 BASE_TS 가 바뀌면 캐시/ETag 도 바뀌어야 함)
+    """
+
+    def __init__(self, path, base_time=None, tz=BASE_TZ):
+        self.path = path
+        self.base_time_str = base_time
+        self.tz = tz
+        self.lock = threading.Lock()
+        self.stamp = None
+        self.current = None
+        self.index = None
+
+    def query_index(self, rows):
+        """rows 의 query.RowIndex (버전마다 질의가 처음 올 때 한 번 만듦)"""
+        from query import RowIndex
+
+        with self.lock:
+            if self.index is None or self.index.rows is not rows:
+                self.index = RowIndex(rows)
+            return self.index
+
+    def get(self):
+        from datetime import datetime
+
+        st = os.stat(self.path)
+        stamp = (st.st_size, st.st_mtime_ns)
+        with self.lock:
+            if stamp != self.stamp:
+                with open(self.path, "rb") as f:
+                    data = f.read()
+                if self.base_time_str:
+                    base_time = parse_base_time(self.base_time_str, self.tz)
+                else:
+                    base_time = datetime.fromtimestamp(int(st.st_mtime), resolve_tz(self.tz))
+                rows = parse_txt_lines(data.decode("utf-8").splitlines(), base_time)
+                digest = hashlib.sha256(data)
+                digest.update(f"@{int(base_time.timestamp())}".encode("ascii"))
+                version = digest.hexdigest()[:20]
+                self.current = (version, rows, base_time)
+                self.index = None
+                self.stamp = stamp
+            return self.current
+
+
+########################################
+# HTTP
+########################################
+
+def _etag(version, key):
+    digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:12]
+    return f'"{version}-{digest}"'
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    server_version = "BaadShield/1"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type, etag=None, cache_state=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")  # 매번 재검증 -> 바뀌지 않았으면 304
+        if cache_state:
+            self.send_header("X-Cache", cache_state)
+        if status == 304:
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        from urllib.parse import parse_qs, urlsplit
+
+        url = urlsplit(self.path)
+        cache = self.server.cache
+        if url.path == "/stats":
+            body = json.dumps({**cache.stats, "entries": len(cache.entries), "bytes": cache.size}).encode("utf-8")
+            self._send(200, body, "application/json")
+            return
+
+        try:
+            version, rows, base_time = self.server.source.get()
+        except (OSError, UnicodeDecodeError) as e:
+            self._send(503, f"덤프를 읽을 수 없음: {e}".encode("utf-8"), "text/plain; charset=utf-8")
+            return
+        if version != self.server.last_version:
+            if self.server.last_version is not None:
+                cache.drop_version(self.server.last_version)
+            self.server.last_version = version
+
+        if url.path in ("/", "/index.html"):
+            key = (version, "page")
+            content_type = "text/html; charset=utf-8"
+
+            def build():
+                return build_html_bytes(rows, base_time, title=self.server.title), _etag(version, key)
+        elif url.path == "/data.json":
+            key = (version, "data")
+            content_type = "application/json"
+
+            def build():
+                return build_rows_json_bytes(rows), _etag(version, key)
+        elif url.path == "/query":
+            text = parse_qs(url.query).get("q", [""])[0]
+            from query import Query, select
+
+            try:
+                query = Query(text)
+            except ValueError as e:
+                self._send(400, str(e).encode("utf-8"), "text/plain; charset=utf-8")
+                return
+            key = (version, "query", query.text.strip())
+            content_type = "application/json"
+
+            def build():
+                index = self.server.source.query_index(rows)
+                return build_rows_json_bytes(select(rows, query, int(base_time.timestamp()), index)), _etag(version, key)
+        else:
+            self._send(404, b"not found", "text/plain")
+            return
+
+        # 덤프 버전 + 키로 ETag 를 미리 알 수 있으므로 304 는 캐시를 건드리지 않고 바로
+        etag = _etag(version, key)
+        if etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+            with cache.lock:
+                cache.stats["not_modified"] += 1
+            self._send(304, b"", content_type, etag, "revalidated")
+            return
+        body, etag, hit = cache.get_or_build(key, build)
+        self._send(200, body, content_type, etag, "hit" if hit else "miss")
+
+
+class DashboardServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = SERVE_BACKLOG
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return  # 응답 도중 끊은 브라우저
+        super().handle_error(request, client_address)
+
+
+def make_server(input_path=TEXT_FILE, host=SERVE_HOST, port=SERVE_PORT, base_time=None, tz=BASE_TZ,
+                title=PAGE_TITLE, cache_bytes=CACHE_MAX_BYTES, verbose=False):
+    server = DashboardServer((host, port), DashboardHandler)
+    server.source = DumpSource(input_path, base_time, tz)
+    server.cache = ResponseCache(cache_bytes)
+    server.last_version = None
+    server.title = title
+    server.verbose = verbose
+    return server
+
+
+########################################
+# 부하 생성기
+########################################
+
+def run_load(url, viewers=LOAD_VIEWERS, requests_each=LOAD_REQUESTS):
+    """
+    viewers 개 스레드가 동시에 url 을 requests_each 번씩 요청 (두 번째부터 If-None-Match)
+    return: {"status": {코드: 수}, "cache": {X-Cache: 수}, "p50_ms", "p95_ms", "max_ms", "seconds"}
+    """
+    import time
+    import urllib.error
+    import urllib.request
+
+    lock = threading.Lock()
+    status = {}
+    cache_states = {}
+    latencies = []
+    start_gate = threading.Event()
+
+    def viewer():
+        etag = None
+        start_gate.wait()
+        for _ in range(requests_each):
+            req = urllib.request.Request(url, headers={"If-None-Match": etag} if etag else {})
+            t0 = time.perf_counter()
+            try:
+                with urllib.request.urlopen(req, timeout=60) as res:
+                    res.read()
+                    code, headers = res.status, res.headers
+            except urllib.error.HTTPError as e:
+                code, headers = e.code, e.headers
+            except OSError:
+                code, headers = "error", {}
+            elapsed = (time.perf_counter() - t0) * 1000
+            etag = headers.get("ETag") or etag
+            with lock:
+                status[code] = status.get(code, 0) + 1
+                state = headers.get("X-Cache", "-")
+                cache_states[state] = cache_states.get(state, 0) + 1
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=viewer) for _ in range(viewers)]
+    for t in threads:
+        t.start()
+    started = time.perf_counter()
+    start_gate.set()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - started
+
+    latencies.sort()
+    pick = lambda q: round(latencies[min(len(latencies) - 1, int(len(latencies) * q))], 1) if latencies else 0
+    return {"status": status, "cache": cache_states, "p50_ms": pick(0.5), "p95_ms": pick(0.95),
+            "max_ms": pick(1.0), "seconds": round(seconds, 2)}
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="대시보드 서버 (응답 캐시 + ETag/304) / 부하 생성기")
+    parser.add_argument("-i", "--input", default=TEXT_FILE, help="덤프 txt (기본: %(default)s)")
+    parser.add_argument("--host", default=SERVE_HOST, help="리슨 주소 (기본: %(default)s)")
+    parser.add_argument("--port", type=int, default=SERVE_PORT, help="리슨 포트 (기본: %(default)s)")
+    parser.add_argument("-t", "--base-time", default=None, help="기준 시각 (기본: 덤프 파일 수정 시각)")
+    parser.add_argument("--tz", default=BASE_TZ, help="시간대 (기본: %(default)s)")
+    parser.add_argument("--title", default=PAGE_TITLE, help="페이지 제목")
+    parser.add_argument("--cache-mb", type=int, default=CACHE_MAX_BYTES // (1024 * 1024),
+                        help="응답 캐시 크기 MB (기본: %(default)s)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="요청마다 로그")
+    parser.add_argument("--load", type=int, metavar="VIEWERS", help="서버 대신 부하 생성기 (동시 접속 수)")
+    parser.add_argument("--url", default=f"http://{SERVE_HOST}:{SERVE_PORT}/", help="부하 생성기 대상 URL")
+    parser.add_argument("--requests", type=int, default=LOAD_REQUESTS, help="접속마다 요청 수 (기본: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.load:
+        print(json.dumps(run_load(args.url, args.load, args.requests), ensure_ascii=False))
+        return
+
+    server = make_server(args.input, args.host, args.port, args.base_time, args.tz, args.title,
+                         args.cache_mb * 1024 * 1024, args.verbose)
+    print(f"서버: http://{args.host}:{server.server_address[1]}/ ({args.input})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("중단됨", file=sys.stderr)
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
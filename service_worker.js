@@ -0,0 +1,103 @@
+// 대시보드 서비스 워커 (main.py 가 @@이름@@ 자리를 채워 "<출력 이름>.sw.js" 로 씀)
+//  - 페이지(커맨더 데이터가 인라인으로 들어 있음): 캐시에 있으면 바로 내주고 뒤에서 네트워크로 갱신
+//    (stale-while-revalidate). 갱신본이 캐시에 있던 것과 다르면 열린 페이지에 'page-updated' 메시지
+//  - 앱 셸 자산(매니페스트, Tailwind CDN 런타임): 캐시 우선, 없을 때만 네트워크
+//  - 그 외(델타 JSON 폴링 등)는 가로채지 않음
+// CACHE_NAME 의 버전에 페이지 해시가 들어 있어서 페이지를 다시 만들면 이 파일도 바뀜
+// -> 브라우저가 새 워커를 설치하며 새 페이지를 미리 받고, 활성화 때 예전 캐시를 지움
+const CACHE_NAME = @@cache_name_json@@;
+const PAGE_URL = new URL(@@page_url_json@@, self.location).href;
+const PRECACHE = @@precache_json@@.map(url => new URL(url, self.location).href);
+
+function cacheKey(url) {
+  const u = new URL(url);
+  u.search = '';
+  u.hash = '';
+  return u.href;
+}
+
+function fetchFresh(url) {
+  // 다른 출처(CDN)는 no-cors 로 받아 불투명 응답 그대로 저장
+  if (new URL(url).origin !== self.location.origin) return fetch(url, { mode: 'no-cors' });
+  return fetch(url, { cache: 'no-cache', credentials: 'same-origin' });
+}
+
+function storable(res) {
+  return res && (res.ok || res.type === 'opaque');
+}
+
+self.addEventListener('install', event => {
+  event.waitUntil((async () => {
+    const cache = await caches.open(CACHE_NAME);
+    await Promise.all([PAGE_URL, ...PRECACHE].map(async url => {
+      try {
+        const res = await fetchFresh(url);
+        if (storable(res)) await cache.put(cacheKey(url), res);
+      } catch (e) {
+        // 오프라인에서 설치: 다음 방문 때 채움
+      }
+    }));
+    await self.skipWaiting();
+  })());
+});
+
+self.addEventListener('activate', event => {
+  event.waitUntil((async () => {
+    // 같은 페이지의 예전 셸 버전 캐시 정리 (이름: "<접두어>:<버전>")
+    const prefix = CACHE_NAME.slice(0, CACHE_NAME.lastIndexOf(':') + 1);
+    for (const name of await caches.keys()) {
+      if (name.startsWith(prefix) && name !== CACHE_NAME) await caches.delete(name);
+    }
+    await self.clients.claim();
+  })());
+});
+
+// 응답이 바뀌었는지: ETag / Last-Modified 가 있으면 그걸로, 없으면 본문 비교
+async function changed(cached, fresh) {
+  const tag = res => res.headers.get('ETag') || res.headers.get('Last-Modified') || '';
+  if (tag(fresh)) return tag(fresh) !== tag(cached);
+  return (await cached.text()) !== (await fresh.clone().text());
+}
+
+async function revalidatePage(request, key, cached) {
+  const fresh = await fetchFresh(request.url);
+  if (!fresh.ok) return fresh;
+  const cache = await caches.open(CACHE_NAME);
+  await cache.put(key, fresh.clone());
+  if (cached && await changed(cached, fresh)) {
+    for (const client of await self.clients.matchAll({ type: 'window' })) {
+      if (cacheKey(client.url) === key) client.postMessage({ type: 'page-updated' });
+    }
+  }
+  return fresh;
+}
+
+self.addEventListener('fetch', event => {
+  const request = event.request;
+  if (request.method !== 'GET') return;
+  const key = cacheKey(request.url);
+
+  if (request.mode === 'navigate') {
+    event.respondWith((async () => {
+      const cached = await caches.match(key, { cacheName: CACHE_NAME });
+      const update = revalidatePage(request, key, cached && cached.clone());
+      if (cached) {
+        event.waitUntil(update.catch(() => {}));  // 오프라인이면 캐시본 그대로
+        return cached;
+      }
+      return update;
+    })());
+    return;
+  }
+
+  if (PRECACHE.includes(key)) {
+    event.respondWith((async () => {
+      const cache = await caches.open(CACHE_NAME);
+      const cached = await cache.match(key);
+      if (cached) return cached;
+      const res = await fetchFresh(request.url);
+      if (storable(res)) await cache.put(key, res.clone());
+      return res;
+    })());
+  }
+});
@@ -0,0 +1,216 @@
+"""
+시점 스냅샷 조회
+
+저장된 관측(덤프 txt 또는 ingest 의 합친 상태)으로 "T 시점에 누가 쉴드가 없나" 를 계산.
+  - 쉴드 구간 [관측, 만료 시각) 을 만료 시각 순으로 정렬한 색인 (ShieldIndex)
+  - T 에 쉴드 없음 = 만료 시각 <= T 인 앞부분, 쉴드 있음 = 나머지 -> 이분 탐색 O(log n) + 결과 k 개
+  - T 에 긴급(30분 이내) = 만료 시각이 (T, T+30분] 인 구간 -> 이분 탐색 두 번
+  - 타임 슬라이더용 내보내기: 구간 안의 상태 전이(활성 -> 긴급 -> 만료)를 시간순으로 미리 계산
+관측 이전 시점은 알 수 없으므로 관측 때 이미 만료였던 커맨더는 언제 물어도 만료로 봄.
+
+사용 예:
+    python snapshot.py --at "2025-11-05 21:00:00" -o snapshot.html
+    python snapshot.py --at 21:00 --only unshielded --list
+    python snapshot.py --at "2025-11-05 10:00:00" --slider slider.json --until "2025-11-06 10:00:00" --step 5
+"""
+import bisect
+import json
+
+from main import (BASE_TIME_STR, BASE_TZ, CRITICAL_SEC, PAGE_TITLE, TEXT_FILE, build_html_bytes,
+                  parse_base_time, parse_txt_lines, read_input_lines, rebase_rows, resolve_tz, write_atomic)
+
+########################################
+# 설정값
+########################################
+
+SNAPSHOT_HTML = "./baad_shield_snapshot.html"
+SLIDER_STEP_MIN = 5  # 슬라이더 눈금 간격 (분)
+
+# 슬라이더 상태 코드
+STATUS_ACTIVE = 0
+STATUS_CRITICAL = 1
+STATUS_EXPIRED = 2
+
+
+########################################
+# 색인
+########################################
+
+class ShieldIndex:
+    """
+    rows 를 만료 시각 순으로 정렬해 들고 있음 (관측 때 이미 만료 = -inf 로 맨 앞)
+    구간이 모두 "지금 ~ 만료" 형태라 끝점 하나로 정렬한 배열이면 시점 질의가 이분 탐색으로 끝남
+    """
+
+    def __init__(self, rows):
+        keyed = sorted(rows, key=lambda r: float("-inf") if r["expire_ts"] is None else r["expire_ts"])
+        self.rows = keyed
+        self.ends = [float("-inf") if r["expire_ts"] is None else r["expire_ts"] for r in keyed]
+
+    def _cut(self, ts):
+        return bisect.bisect_right(self.ends, ts)
+
+    def unshielded_at(self, ts):
+        """ts 에 쉴드가 없는 rows"""
+        return self.rows[:self._cut(ts)]
+
+    def shielded_at(self, ts):
+        return self.rows[self._cut(ts):]
+
+    def _critical_cut(self, ts, critical_sec):
+        """ts 에 긴급(남은 초 < critical_sec)까지인 rows 의 끝 (만료 시각 < ts + critical_sec)"""
+        return bisect.bisect_left(self.ends, ts + critical_sec)
+
+    def critical_at(self, ts, critical_sec=CRITICAL_SEC):
+        """ts 에 쉴드는 있지만 남은 초가 critical_sec 보다 적은 rows"""
+        return self.rows[self._cut(ts):self._critical_cut(ts, critical_sec)]
+
+    def counts_at(self, ts, critical_sec=CRITICAL_SEC):
+        """ts 시점 (활성, 긴급, 만료) 인원 (O(log n))"""
+        expired = self._cut(ts)
+        critical = self._critical_cut(ts, critical_sec) - expired
+        return len(self.rows) - expired - critical, critical, expired
+
+    def rows_at(self, at_time, only=None):
+        """
+        at_time(datetime) 기준으로 다시 계산한 rows
+        only: None(전체) / "unshielded" / "shielded" / "critical" -> 해당 구간만 (O(log n + k))
+        """
+        ts = int(at_time.timestamp())
+        if only is None:
+            picked = self.rows
+        else:
+            picked = {"unshielded": self.unshielded_at, "shielded": self.shielded_at,
+                      "critical": self.critical_at}[only](ts)
+        return rebase_rows(picked, at_time)
+
+
+########################################
+# 관측 불러오기
+########################################
+
+def load_observations(input_path=TEXT_FILE, base_time=BASE_TIME_STR, tz=BASE_TZ, merged_path=None):
+    """
+    덤프 txt(+ 기준 시각) 또는 ingest 의 합친 상태 파일 -> rows (expire_ts 는 절대 시각이라 그대로 씀)
+    merged_path 를 주면 그쪽을 읽음
+    """
+    if merged_path:
+        from ingest import MergedState
+        return [row for _, row in MergedState.load(merged_path).entries.values()]
+    if isinstance(base_time, str):
+        base_time = parse_base_time(base_time, tz)
+    return parse_txt_lines(read_input_lines(input_path), base_time)
+
+
+def parse_at(text, reference, tz=BASE_TZ):
+    """
+    "YYYY-MM-DD HH:MM[:SS]" -> datetime
+    "HH:MM[:SS]" 만 주면 reference(datetime) 와 같은 날짜
+    """
+    if len(text) <= 8:
+        return parse_base_time(f"{reference.astimezone(resolve_tz(tz)).date()} {text}", tz)
+    return parse_base_time(text, tz)
+
+
+########################################
+# 스냅샷 페이지 / 슬라이더 내보내기
+########################################
+
+def render_snapshot(index, at_time, output_path=SNAPSHOT_HTML, only=None, title=PAGE_TITLE):
+    """at_time 시점에 멈춘 대시보드 HTML 을 씀. return: 페이지에 들어간 인원"""
+    rows = index.rows_at(at_time, only)
+    page = build_html_bytes(rows, at_time, title=f"{title} @ {at_time.strftime('%m/%d %H:%M')}", frozen=True)
+    write_atomic(output_path, page)
+    return len(rows)
+
+
+def build_slider(index, start_ts, end_ts, step_sec=SLIDER_STEP_MIN * 60, critical_sec=CRITICAL_SEC):
+    """
+    [start_ts, end_ts] 타임 슬라이더용 데이터
+        {"from", "to", "step",
+         "ids": [키], "names": [이름], "x": [...], "y": [...],
+         "initial": [start_ts 시점 상태 코드],
+         "transitions": [[시각, 인덱스, 새 상태 코드], ...]  (시간순),
+         "steps": [[시각, 활성, 긴급, 만료], ...]}
+    전이는 만료 시각이 (start, end + 긴급 기준) 인 커맨더만 봄 -> O(log n + k)
+    긴급이 되는 시각 = 만료 - critical_sec + 1 (남은 초가 critical_sec 보다 적어지는 첫 초)
+    """
+    rows = index.rows
+    lead = critical_sec - 1
+    initial = []
+    expired_cut = index._cut(start_ts)
+    critical_cut = index._critical_cut(start_ts, critical_sec)
+    for i in range(len(rows)):
+        initial.append(STATUS_EXPIRED if i < expired_cut else STATUS_CRITICAL if i < critical_cut else STATUS_ACTIVE)
+
+    transitions = []
+    for i in range(expired_cut, index._critical_cut(end_ts, critical_sec)):
+        expire = rows[i]["expire_ts"]
+        if start_ts < expire - lead <= end_ts:
+            transitions.append([expire - lead, i, STATUS_CRITICAL])
+        if expire <= end_ts:
+            transitions.append([expire, i, STATUS_EXPIRED])
+    transitions.sort()
+
+    steps = []
+    ts = start_ts
+    while ts <= end_ts:
+        steps.append([ts, *index.counts_at(ts, critical_sec)])
+        ts += step_sec
+
+    return {
+        "from": start_ts,
+        "to": end_ts,
+        "step": step_sec,
+        "ids": [r.get("id", r["name"]) for r in rows],
+        "names": [r["name"] for r in rows],
+        "x": [r["x"] for r in rows],
+        "y": [r["y"] for r in rows],
+        "initial": initial,
+        "transitions": transitions,
+        "steps": steps,
+    }
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="저장된 관측으로 특정 시점의 쉴드 상태 조회")
+    parser.add_argument("--at", required=True, help="조회 시각 'YYYY-MM-DD HH:MM[:SS]' 또는 'HH:MM' (관측 날짜)")
+    parser.add_argument("-i", "--input", default=TEXT_FILE, help="덤프 txt (기본: %(default)s)")
+    parser.add_argument("-t", "--base-time", default=BASE_TIME_STR, help="덤프 기준 시각 (기본: %(default)s)")
+    parser.add_argument("--merged", default=None, help="덤프 대신 ingest 의 합친 상태 JSON 을 읽음")
+    parser.add_argument("--tz", default=BASE_TZ, help="시간대 (기본: %(default)s)")
+    parser.add_argument("--only", choices=["unshielded", "shielded", "critical"], help="이 상태인 커맨더만")
+    parser.add_argument("-o", "--output", default=SNAPSHOT_HTML, help="스냅샷 HTML (기본: %(default)s)")
+    parser.add_argument("--list", action="store_true", help="HTML 대신 이름/좌표 목록만 출력")
+    parser.add_argument("--slider", metavar="JSON", help="--at 부터 --until 까지 타임 슬라이더 데이터를 씀")
+    parser.add_argument("--until", help="슬라이더 끝 시각 (기본: --at + 24시간)")
+    parser.add_argument("--step", type=int, default=SLIDER_STEP_MIN, help="슬라이더 눈금, 분 (기본: %(default)s)")
+    args = parser.parse_args(argv)
+
+    reference = parse_base_time(args.base_time, args.tz)
+    index = ShieldIndex(load_observations(args.input, reference, args.tz, args.merged))
+    at_time = parse_at(args.at, reference, args.tz)
+    at_ts = int(at_time.timestamp())
+
+    if args.slider:
+        end_ts = int(parse_at(args.until, at_time, args.tz).timestamp()) if args.until else at_ts + 86400
+        data = build_slider(index, at_ts, end_ts, args.step * 60)
+        write_atomic(args.slider, json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+        print(f"슬라이더: 전이 {len(data['transitions'])}개, 눈금 {len(data['steps'])}개 -> {args.slider}")
+        return
+
+    if args.list:
+        for row in index.rows_at(at_time, args.only):
+            print(f"{row['name']}\t({row['x']}, {row['y']})\t{row['countdown']}")
+        return
+
+    count = render_snapshot(index, at_time, args.output, args.only)
+    active, critical, expired = index.counts_at(at_ts)
+    print(f"{at_time.isoformat()} 시점: 활성 {active} / 긴급 {critical} / 만료 {expired}")
+    print(f"완료: {args.output} 에 스냅샷 생성됨 ({count}명)")
+
+
+if __name__ == "__main__":
+    main()
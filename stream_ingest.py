@@ -0,0 +1,226 @@
+"""
+소켓 수집 엔드포인트
+
+정찰 도우미(스크레이퍼)가 덤프를 로컬 TCP / 유닉스 소켓으로 한 줄씩 흘려 넣으면
+  - 줄이 도착하는 대로 RecordTokenizer 에 넣고 row 로 바꿈 (파일로 저장한 뒤 파싱하지 않음)
+  - 클라이언트가 보내기를 끝내면(EOF) 그때 이미 다 파싱된 rows 로 바로 대시보드를 다시 만듦
+  - 읽기 버퍼는 STREAM_LINE_LIMIT 로 제한 (넘치면 전송 쪽이 TCP 흐름 제어로 기다림),
+    동시 업로드는 STREAM_MAX_CLIENTS 개, 재생성은 한 번에 하나씩
+  - 끝나면 "OK <행 수> <경고 수> <버전>" 또는 "ERR <이유>" 한 줄로 답함
+
+첫 줄이 "#base YYYY-MM-DD HH:MM:SS" 면 그 시각을 기준 시각으로 씀 (없으면 연결한 시각).
+
+사용 예:
+    python stream_ingest.py -o ./baad_shield_output.html --port 8765
+    python stream_ingest.py --send ./new.txt --port 8765
+    scraper | nc -N 127.0.0.1 8765
+"""
+import asyncio
+import functools
+import sys
+
+from main import BASE_TZ, OUTPUT_HTML, RecordTokenizer, parse_base_time, publish_dashboard, record_to_row, resolve_tz
+
+########################################
+# 설정값
+########################################
+
+STREAM_HOST = "127.0.0.1"
+STREAM_PORT = 8765
+STREAM_LINE_LIMIT = 64 * 1024  # 한 줄 / 읽기 버퍼 최대 바이트
+STREAM_MAX_CLIENTS = 8  # 동시에 받는 업로드 수 (넘으면 연결은 받되 읽기를 기다림)
+STREAM_IDLE_SEC = 30  # 이 시간 동안 한 줄도 안 오면 업로드를 끊음
+BASE_HEADER = "#base "
+
+
+########################################
+# 업로드 하나 읽기
+########################################
+
+async def read_upload(reader, tz=BASE_TZ, idle_sec=STREAM_IDLE_SEC):
+    """
+    스트림 -> (rows, issues, base_time). 줄마다 바로 토크나이저에 넣어 row 로 바꿈
+    줄이 너무 길면 ValueError, idle_sec 동안 아무것도 안 오면 asyncio.TimeoutError
+    """
+    from datetime import datetime
+
+    base_time = datetime.now(resolve_tz(tz))
+    issues = []
+    tokenizer = RecordTokenizer(issues)
+    feed = tokenizer.feed
+    expire_cache = {}
+    rows = []
+    first = True
+    while True:
+        try:
+            line = await asyncio.wait_for(reader.readline(), idle_sec)
+        except ValueError:
+            raise ValueError(f"한 줄이 {STREAM_LINE_LIMIT}바이트를 넘음") from None
+        if not line:
+            break
+        text = line.decode("utf-8", errors="replace")
+        if first:
+            first = False
+            if text.startswith(BASE_HEADER):
+                stamp = text[len(BASE_HEADER):].strip()
+                try:
+                    base_time = parse_base_time(stamp, tz)
+                except ValueError:
+                    raise ValueError(f"#base 기준 시각을 읽을 수 없음: {stamp!r}") from None
+                tokenizer.line_no += 1  # 경고 줄번호를 보낸 내용 기준으로 맞춤
+                continue
+        record = feed(text)
+        if record is not None:
+            rows.append(record_to_row(record, base_time, expire_cache))
+    tokenizer.close()
+    return rows, issues, base_time
+
+
+def _reply_line(text):
+    """답은 한 줄 프로토콜이므로 예외 메시지 안의 줄바꿈을 없앰"""
+    return " ".join(str(text).split())
+
+
+async def handle_client(reader, writer, ctx):
+    """연결 하나: 읽기 -> (차례가 오면) 재생성 -> 한 줄 답. 무슨 일이 있어도 답하고 연결을 닫음"""
+    peer = writer.get_extra_info("peername") or "unix"
+    log = ctx["log"]
+    async with ctx["slots"]:
+        try:
+            try:
+                rows, issues, base_time = await read_upload(reader, ctx["tz"], ctx["idle_sec"])
+                for line_no, message in issues:
+                    log(f"경고: {peer}:{line_no}: {message}")
+                publish = functools.partial(publish_dashboard, rows, base_time, output_path=ctx["output_path"],
+                                            log=log, **ctx["publish_options"])
+                async with ctx["publish_lock"]:
+                    result = await asyncio.get_running_loop().run_in_executor(None, publish)
+                reply = f"OK {len(rows)} {len(issues)} {result['version']}\n"
+                log(f"업로드 반영: {peer} -> {len(rows)}명")
+            except asyncio.TimeoutError:
+                reply = f"ERR {ctx['idle_sec']:g}초 동안 입력 없음\n"
+            except (ValueError, OSError) as e:
+                reply = f"ERR {_reply_line(e)}\n"
+            except Exception as e:
+                # 재생성 중 예상 못 한 오류 (깨진 행 등): 클라이언트를 기다리게 두지 않고 알려줌
+                reply = f"ERR 대시보드 생성 실패: {type(e).__name__}: {_reply_line(e)}\n"
+            if reply.startswith("ERR"):
+                log(f"업로드 실패: {peer}: {reply[4:].strip()}")
+            try:
+                writer.write(reply.encode("utf-8"))
+                await writer.drain()
+            except OSError:
+                pass  # 답을 기다리지 않고 끊은 클라이언트
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+def make_context(output_path=OUTPUT_HTML, tz=BASE_TZ, max_clients=STREAM_MAX_CLIENTS, idle_sec=STREAM_IDLE_SEC,
+                 log=print, **publish_options):
+    """handle_client 가 연결 사이에 공유하는 상태 (이벤트 루프 안에서 만들어야 함)"""
+    return {
+        "output_path": output_path,
+        "tz": tz,
+        "idle_sec": idle_sec,
+        "log": log,
+        "slots": asyncio.Semaphore(max_clients),
+        "publish_lock": asyncio.Lock(),
+        "publish_options": publish_options,
+    }
+
+
+async def serve(output_path=OUTPUT_HTML, host=STREAM_HOST, port=STREAM_PORT, unix_path=None, tz=BASE_TZ,
+                max_clients=STREAM_MAX_CLIENTS, log=print, ready=None, idle_sec=STREAM_IDLE_SEC, **publish_options):
+    """
+    업로드를 받을 때마다 output_path 대시보드를 다시 만듦 (끝나지 않음)
+    unix_path 를 주면 TCP 대신 유닉스 소켓
+    ready: asyncio.Event 를 주면 리슨을 시작한 뒤 set
+    idle_sec: 이 시간 동안 한 줄도 안 오면 그 업로드를 끊음
+    publish_options: publish_dashboard 에 그대로 넘김 (title, production ...)
+    """
+    ctx = make_context(output_path, tz, max_clients, idle_sec, log, **publish_options)
+    handler = functools.partial(handle_client, ctx=ctx)
+    if unix_path:
+        server = await asyncio.start_unix_server(handler, path=unix_path, limit=STREAM_LINE_LIMIT)
+        where = unix_path
+    else:
+        server = await asyncio.start_server(handler, host, port, limit=STREAM_LINE_LIMIT)
+        where = f"{host}:{server.sockets[0].getsockname()[1]}"
+    log(f"수집 대기: {where} -> {output_path}")
+    if ready is not None:
+        ready.set()
+    async with server:
+        await server.serve_forever()
+
+
+########################################
+# 보내는 쪽 (도우미 / 점검용)
+########################################
+
+def send_dump(lines, host=STREAM_HOST, port=STREAM_PORT, unix_path=None, base_time=None, timeout=60):
+    """
+    라인들을 엔드포인트로 흘려 보내고 서버의 답 한 줄을 돌려줌
+    base_time: "YYYY-MM-DD HH:MM:SS" 를 주면 #base 헤더로 먼저 보냄
+    """
+    import socket
+
+    if unix_path:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(unix_path)
+    else:
+        sock = socket.create_connection((host, port), timeout=timeout)
+    with sock:
+        if base_time:
+            sock.sendall(f"{BASE_HEADER}{base_time}\n".encode("utf-8"))
+        for line in lines:
+            sock.sendall(line.encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+        reply = b""
+        while not reply.endswith(b"\n"):
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            reply += chunk
+    return reply.decode("utf-8").strip()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="소켓으로 흘려 넣는 덤프를 바로 파싱해 대시보드 재생성")
+    parser.add_argument("-o", "--output", default=OUTPUT_HTML, help="출력 HTML (기본: %(default)s)")
+    parser.add_argument("--host", default=STREAM_HOST, help="리슨 주소 (기본: %(default)s)")
+    parser.add_argument("--port", type=int, default=STREAM_PORT, help="리슨 포트 (기본: %(default)s)")
+    parser.add_argument("--unix", metavar="PATH", help="TCP 대신 유닉스 소켓")
+    parser.add_argument("--tz", default=BASE_TZ, help="시간대 (기본: %(default)s)")
+    parser.add_argument("--production", action="store_true", help="프로덕션 빌드 (인라인 CSS + 압축 산출물)")
+    parser.add_argument("--send", metavar="TXT", help="서버 대신 이 덤프를 엔드포인트로 보냄 (- 이면 표준입력)")
+    parser.add_argument("-t", "--base-time", help="--send 때 #base 헤더로 보낼 기준 시각")
+    args = parser.parse_args(argv)
+
+    if args.send:
+        if args.send == "-":
+            import io
+            lines = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+        else:
+            lines = open(args.send, "r", encoding="utf-8")
+        with lines:
+            reply = send_dump(lines, args.host, args.port, args.unix, args.base_time)
+        print(reply)
+        if not reply.startswith("OK"):
+            sys.exit(1)
+        return
+
+    try:
+        asyncio.run(serve(args.output, args.host, args.port, args.unix, args.tz, production=args.production))
+    except KeyboardInterrupt:
+        print("중단됨", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+연맹원별 가까운 타겟 (공간 조인)
+
+우리 연맹원 한 명 한 명에 대해 쉴드가 없거나 곧 풀리는 다른 연맹 커맨더 중 가장 가까운 k 명.
+  - 타겟을 격자 칸에 나눠 담음 (칸마다 인덱스/x/y 를 나란히 둔 리스트 -> 칸 단위로 거리를 한 번에 계산)
+  - 칸 크기는 타겟 밀도에 맞춰 한 칸에 평균 JOIN_PER_CELL 명 정도가 되게 잡음
+  - 연맹원 좌표 칸에서 바깥쪽으로 한 겹씩 넓히다가, 다음 겹의 최소 거리가 현재 k 번째보다 멀면 멈춤
+  - 연맹원을 JOIN_CHUNK 명씩 나눠 프로세스 풀에서 동시에 처리 (격자는 워커마다 한 번만 만듦)
+
+사용 예:
+    python targets.py -i ./new.txt --alliance RlRS -k 5 -o targets.csv
+    python targets.py -i ./new.txt --alliance RlRS -o targets.json -j 4
+"""
+import heapq
+import json
+import math
+import os
+import sys
+
+from main import (BASE_TIME_STR, BASE_TZ, MAP_SIZE, PLAN_HORIZON_MIN, TEXT_FILE, coord_int, parse_base_time,
+                  parse_txt_lines, read_input_lines, write_atomic)
+
+########################################
+# 설정값
+########################################
+
+TARGET_K = 5  # 연맹원마다 뽑는 타겟 수
+TARGET_HORIZON_MIN = PLAN_HORIZON_MIN  # 이 시간 안에 쉴드가 풀리면 타겟에 넣음 (분)
+JOIN_PER_CELL = 8  # 격자 한 칸에 들어갈 평균 타겟 수
+JOIN_CHUNK = 500  # 워커 작업 하나에 넣는 연맹원 수
+JOIN_PARALLEL_MIN = 2000  # 연맹원이 이보다 적으면 현재 프로세스에서 처리
+
+
+########################################
+# 연맹원 / 타겟 고르기
+########################################
+
+def _xy(row):
+    x, y = coord_int(row["x"]), coord_int(row["y"])
+    if x is None or y is None:
+        return None
+    return x, y
+
+
+def split_rows(rows, alliance, now_ts, horizon_sec=TARGET_HORIZON_MIN * 60):
+    """
+    rows -> (연맹원 rows, 타겟 rows)
+    연맹원: alliance 가 같은 커맨더 (대소문자 무시)
+    타겟: 다른 연맹 중 이미 만료이거나 now_ts + horizon_sec 안에 쉴드가 풀리는 커맨더
+    좌표가 깨진 행은 양쪽 다 뺌
+    """
+    ours = alliance.casefold()
+    deadline = now_ts + horizon_sec
+    members, targets = [], []
+    for row in rows:
+        if _xy(row) is None:
+            continue
+        if (row.get("alliance") or "").casefold() == ours:
+            members.append(row)
+        elif row["is_expired"] or row["expire_ts"] <= deadline:
+            targets.append(row)
+    return members, targets
+
+
+########################################
+# 격자 + k 최근접
+########################################
+
+class TargetGrid:
+    """
+    타겟 좌표 -> 격자 칸. 칸마다 (인덱스, xs, ys) 를 나란히 들고 있어서
+    한 칸의 거리 계산이 리스트 컴프리헨션 한 번으로 끝남
+    """
+
+    def __init__(self, points, cell=None):
+        if cell is None:
+            cell = max(2.0, math.sqrt(MAP_SIZE * MAP_SIZE * JOIN_PER_CELL / max(1, len(points))))
+        self.cell = cell
+        cells = {}
+        for idx, (x, y) in enumerate(points):
+            bucket = cells.get((int(x // cell), int(y // cell)))
+            if bucket is None:
+                bucket = cells[(int(x // cell), int(y // cell))] = ([], [], [])
+            bucket[0].append(idx)
+            bucket[1].append(x)
+            bucket[2].append(y)
+        self.cells = cells
+        if cells:
+            self.x_range = (min(k[0] for k in cells), max(k[0] for k in cells))
+            self.y_range = (min(k[1] for k in cells), max(k[1] for k in cells))
+
+    def _ring_keys(self, cx, cy, r):
+        if r == 0:
+            yield cx, cy
+            return
+        for dx in range(-r, r + 1):
+            yield cx + dx, cy - r
+            yield cx + dx, cy + r
+        for dy in range(-r + 1, r):
+            yield cx - r, cy + dy
+            yield cx + r, cy + dy
+
+    def nearest(self, px, py, k):
+        """(px, py) 에서 가까운 타겟 k 개 -> [(거리, 인덱스), ...] 가까운 순"""
+        if not self.cells or k <= 0:
+            return []
+        cell = self.cell
+        cells = self.cells
+        cx, cy = int(px // cell), int(py // cell)
+        # 이 반경을 넘으면 더 볼 칸이 없음
+        last_ring = max(cx - self.x_range[0], self.x_range[1] - cx, cy - self.y_range[0], self.y_range[1] - cy)
+        heap = []  # (-거리², 인덱스) 최대 힙, 크기 k
+        r = 0
+        while r <= last_ring:
+            if r and len(heap) == k:
+                # 겹 r 의 칸은 적어도 자기 칸 경계 + (r-1) 칸만큼 떨어져 있음
+                reach = min(px - (cx - r + 1) * cell, (cx + r) * cell - px,
+                            py - (cy - r + 1) * cell, (cy + r) * cell - py)
+                if reach * reach >= -heap[0][0]:
+                    break
+            for key in self._ring_keys(cx, cy, r):
+                bucket = cells.get(key)
+                if bucket is None:
+                    continue
+                idxs, xs, ys = bucket
+                d2s = [(x - px) * (x - px) + (y - py) * (y - py) for x, y in zip(xs, ys)]
+                for d2, idx in zip(d2s, idxs):
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-d2, idx))
+                    elif d2 < -heap[0][0]:
+                        heapq.heapreplace(heap, (-d2, idx))
+            r += 1
+        return sorted((math.sqrt(-neg), idx) for neg, idx in heap)
+
+    def nearest_many(self, points, k):
+        return [self.nearest(px, py, k) for px, py in points]
+
+
+# 워커 프로세스마다 한 번 만드는 격자
+_worker_grid = None
+
+
+def _init_worker(target_points, cell):
+    global _worker_grid
+    _worker_grid = TargetGrid(target_points, cell)
+
+
+def _join_chunk(args):
+    member_points, k = args
+    return _worker_grid.nearest_many(member_points, k)
+
+
+def spatial_join(member_points, target_points, k=TARGET_K, workers=None, chunk=JOIN_CHUNK):
+    """
+    member_points / target_points: [(x, y), ...]
+    return: 연맹원 순서대로 [[(거리, 타겟 인덱스), ...], ...]
+    연맹원이 JOIN_PARALLEL_MIN 명 이상이고 workers != 1 이면 프로세스 풀에서 chunk 명씩 나눠 처리
+    """
+    grid = TargetGrid(target_points)
+    if workers == 1 or len(member_points) < JOIN_PARALLEL_MIN:
+        return grid.nearest_many(member_points, k)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = [(member_points[i:i + chunk], k) for i in range(0, len(member_points), chunk)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(target_points, grid.cell)) as pool:
+        results = []
+        for part in pool.map(_join_chunk, chunks):
+            results.extend(part)
+    return results
+
+
+def find_targets(rows, alliance, now_ts, k=TARGET_K, horizon_sec=TARGET_HORIZON_MIN * 60, workers=None):
+    """
+    rows: parse_txt_lines 결과
+    return: 연맹원마다
+        {"member": 식별 ID (없으면 이름), "name", "x", "y",
+         "targets": [{"id", "name", "alliance", "x", "y", "hq", "dist", "open"(쉴드 풀리는 시각, 이미 없으면 None)}, ...]}
+    이름이 같은 연맹원/타겟이 있어도 ID 로 구분함
+    """
+    members, targets = split_rows(rows, alliance, now_ts, horizon_sec)
+    member_points = [_xy(r) for r in members]
+    target_points = [_xy(r) for r in targets]
+    joined = spatial_join(member_points, target_points, k, workers)
+
+    result = []
+    for row, (mx, my), near in zip(members, member_points, joined):
+        result.append({
+            "member": row.get("id", row["name"]),
+            "name": row["name"],
+            "x": mx,
+            "y": my,
+            "targets": [{
+                "id": targets[idx].get("id", targets[idx]["name"]),
+                "name": targets[idx]["name"],
+                "alliance": targets[idx]["alliance"],
+                "x": target_points[idx][0],
+                "y": target_points[idx][1],
+                "hq": targets[idx]["hq"],
+                "dist": round(dist, 1),
+                "open": targets[idx]["expire_ts"],
+            } for dist, idx in near],
+        })
+    return result
+
+
+########################################
+# 내보내기
+########################################
+
+TARGET_CSV_COLUMNS = ("member_id", "member", "member_x", "member_y", "rank", "target_id", "target", "alliance", "x",
+                      "y", "hq", "dist", "open_ts")
+
+
+def write_targets(result, path):
+    """find_targets 결과 -> 파일 (.csv 면 연맹원 x 순위 한 줄씩, 그 외에는 연맹원 ID -> {이름, 좌표, 타겟 목록} JSON)"""
+    if path.lower().endswith(".csv"):
+        import csv
+        import io
+
+        buf = io.StringIO(newline="")
+        writer = csv.writer(buf)
+        writer.writerow(TARGET_CSV_COLUMNS)
+        for m in result:
+            for rank, t in enumerate(m["targets"], 1):
+                writer.writerow((m["member"], m["name"], m["x"], m["y"], rank, t["id"], t["name"], t["alliance"],
+                                 t["x"], t["y"], t["hq"], t["dist"], t["open"]))
+        write_atomic(path, buf.getvalue())
+        return
+    data = {m["member"]: {"name": m["name"], "x": m["x"], "y": m["y"], "targets": m["targets"]} for m in result}
+    write_atomic(path, json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+
+
+def targets_page_data(result):
+    """
+    페이지 "내 타겟" 패널용 압축 데이터 (같은 타겟을 여러 연맹원이 공유하므로 타겟 표를 따로 둠)
+        {"members": [[ID, 이름표, x, y, [타겟 번호...], [거리...]], ...],
+         "targets": [[이름, x, y, hq, 열림 시각 or null], ...]}
+    이름표: 보통은 이름, 같은 이름의 연맹원이 여럿이면 "이름 (x, y)" (입력칸에서 골라 쓰는 값)
+    """
+    name_count = {}
+    for m in result:
+        name_count[m["name"]] = name_count.get(m["name"], 0) + 1
+    table = []
+    numbers = {}
+    members = []
+    for m in result:
+        picks = []
+        for t in m["targets"]:
+            num = numbers.get(t["id"])
+            if num is None:
+                num = numbers[t["id"]] = len(table)
+                table.append([t["name"], t["x"], t["y"], t["hq"], t["open"]])
+            picks.append(num)
+        label = m["name"] if name_count[m["name"]] == 1 else f"{m['name']} ({m['x']}, {m['y']})"
+        members.append([m["member"], label, m["x"], m["y"], picks, [t["dist"] for t in m["targets"]]])
+    return {"members": members, "targets": table}
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="연맹원마다 가장 가까운 쉴드 없는/곧 풀리는 타겟 k 명")
+    parser.add_argument("-i", "--input", default=TEXT_FILE, help="덤프 txt (- 이면 표준입력, 기본: %(default)s)")
+    parser.add_argument("--alliance", required=True, help="우리 연맹 이름 (덤프의 연맹 칸)")
+    parser.add_argument("-k", type=int, default=TARGET_K, help="연맹원마다 뽑는 타겟 수 (기본: %(default)s)")
+    parser.add_argument("--horizon", type=int, default=TARGET_HORIZON_MIN,
+                        help="이 시간(분) 안에 쉴드가 풀리는 커맨더까지 타겟 (기본: %(default)s)")
+    parser.add_argument("-o", "--output", default="./baad_shield_targets.csv",
+                        help="결과 파일 (.csv 또는 .json, 기본: %(default)s)")
+    parser.add_argument("-t", "--base-time", default=BASE_TIME_STR, help="기준 시각 (기본: %(default)s)")
+    parser.add_argument("--tz", default=BASE_TZ, help="기준 시각의 시간대 (기본: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="워커 프로세스 수 (1 이면 현재 프로세스)")
+    args = parser.parse_args(argv)
+
+    if args.k <= 0:
+        sys.exit("오류: -k 는 1 이상이어야 함")
+    base_time = parse_base_time(args.base_time, args.tz)
+    rows = parse_txt_lines(read_input_lines(args.input), base_time)
+
+    started = time.perf_counter()
+    result = find_targets(rows, args.alliance, int(base_time.timestamp()), args.k, args.horizon * 60, args.workers)
+    elapsed = time.perf_counter() - started
+    if not result:
+        print(f"경고: 연맹 '{args.alliance}' 커맨더가 덤프에 없음", file=sys.stderr)
+    write_targets(result, args.output)
+    print(f"완료: 연맹원 {len(result)}명 x 타겟 {args.k} -> {os.path.abspath(args.output)} ({elapsed:.2f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import os
+import sys
+
+# 저장소 루트 모듈(main, alerts, ...)을 그대로 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def dump_text(entries):
+    """[(이름, 연맹, hq, x, y, 남은시간 or None), ...] -> 덤프 txt (None 이면 쉴드 없음)"""
+    out = []
+    for name, alliance, hq, x, y, remaining in entries:
+        if remaining is None:
+            out.append(f"{name}\t{alliance}\t{hq}\t({x}, {y})\t-\n")
+        else:
+            out.append(f"{name}\t{alliance}\t{hq}\t({x}, {y})\t\n🛡️\n{remaining}\n")
+    return "".join(out)
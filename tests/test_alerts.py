@@ -0,0 +1,65 @@
+import os
+
+from alerts import AlertScheduler, load_dump, parse_rule
+from conftest import dump_text
+from identity import IdentityIndex
+
+T0 = 1762300000
+ENTRIES = [
+    ("Pemason", "RlRS", 30, 209, 401, "5m"),  # 알림 시각이 이미 지남 -> 바로 발송
+    ("Dafungi", "RlRS", 29, 213, 401, "8m"),
+    ("Snick", "RlRS", 30, 217, 401, "3h 0m"),
+    ("Anarchist Sheep", "RlRS", 30, 914, 137, None),
+]
+
+
+def _dump(path, entries, mtime):
+    path.write_text(dump_text(entries), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def _apply(path, scheduler, identity, now_ts):
+    scheduler.update(load_dump(str(path), identity=identity), now_ts)
+    return scheduler.fire_due(now_ts)
+
+
+def test_redump_with_moved_mtime_sends_no_duplicates(tmp_path):
+    path = tmp_path / "dump.txt"
+    scheduler = AlertScheduler([parse_rule("10")], [])
+    identity = IdentityIndex()
+
+    _dump(path, ENTRIES, T0)
+    first = _apply(path, scheduler, identity, T0)
+    assert sorted(a["name"] for a in first) == ["Dafungi", "Pemason"]
+
+    # 같은 내용을 30초 뒤에 다시 덤프 -> 계산된 만료 시각이 30초씩 밀림
+    _dump(path, ENTRIES, T0 + 30)
+    assert _apply(path, scheduler, identity, T0 + 30) == []
+    assert scheduler.update(load_dump(str(path), identity=identity), T0 + 31) == 0
+
+
+def test_rename_keeps_alert_key(tmp_path):
+    path = tmp_path / "dump.txt"
+    scheduler = AlertScheduler([parse_rule("10")], [])
+    identity = IdentityIndex()
+
+    _dump(path, ENTRIES, T0)
+    _apply(path, scheduler, identity, T0)
+
+    renamed = [("Pemason2",) + e[1:] if e[0] == "Pemason" else e for e in ENTRIES]
+    _dump(path, renamed, T0 + 30)
+    assert _apply(path, scheduler, identity, T0 + 30) == []
+
+
+def test_reshield_schedules_again(tmp_path):
+    path = tmp_path / "dump.txt"
+    scheduler = AlertScheduler([parse_rule("10")], [])
+    identity = IdentityIndex()
+
+    _dump(path, ENTRIES, T0)
+    _apply(path, scheduler, identity, T0)
+
+    # Snick 이 쉴드를 새로 걸어서 해제가 10분 뒤로 당겨짐 -> 새 쉴드 알림은 보냄
+    reshield = [e[:5] + ("9m",) if e[0] == "Snick" else e for e in ENTRIES]
+    _dump(path, reshield, T0 + 60)
+    assert [a["name"] for a in _apply(path, scheduler, identity, T0 + 60)] == ["Snick"]
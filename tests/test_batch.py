@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+import main
+from conftest import dump_text
+
+DUMP = dump_text([("Pemason", "RlRS", 30, 209, 401, "13h 53m"), ("Edge", "RlRS", 29, -3, -12, None)])
+
+
+def _batch(tmp_path, specs):
+    (tmp_path / "new.txt").write_text(DUMP, encoding="utf-8")
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps(specs), encoding="utf-8")
+    return str(path)
+
+
+def test_jobs_without_output_are_rejected(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    jobs = _batch(tmp_path, [{"input": "new.txt", "title": "A"}, {"input": "new.txt", "title": "B"}])
+    with pytest.raises(SystemExit) as exc:
+        main.main(["--batch", jobs, "--no-offline"])
+    assert exc.value.code == 2
+    assert "1번과 2번" in capsys.readouterr().err
+    assert not (tmp_path / "baad_shield_output.html").exists()  # 아무것도 안 씀
+
+
+def test_derived_state_paths_collide(tmp_path):
+    jobs = [{"output_path": str(tmp_path / "a.html")}, {"output_path": str(tmp_path / "a.htm")}]
+    with pytest.raises(ValueError, match="a.state.json"):
+        main.check_batch_outputs(jobs)
+    jobs = [{"output_path": str(tmp_path / "a.html")},
+            {"output_path": str(tmp_path / "b.html"), "identity_path": str(tmp_path / "a.identity.json")}]
+    with pytest.raises(ValueError, match="a.identity.json"):
+        main.check_batch_outputs(jobs)
+
+
+def test_distinct_outputs_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    jobs = _batch(tmp_path, [{"input": "new.txt", "output": "a.html"}, {"input": "new.txt", "output": "b.html"}])
+    main.main(["--batch", jobs, "-j", "1", "--no-offline"])
+    assert (tmp_path / "a.html").exists() and (tmp_path / "b.html").exists()
+    assert (tmp_path / "a.identity.json").exists() and (tmp_path / "b.identity.json").exists()
@@ -0,0 +1,85 @@
+import io
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from conftest import dump_text
+from main import build_density_grids, build_map_tree, build_sort_permutations, parse_base_time, parse_txt_lines
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_negative_coords_are_counted():
+    text = dump_text([
+        ("Pemason", "RlRS", 30, 209, 401, "13h 53m"),
+        ("Edge", "RlRS", 29, -3, -12, None),
+    ])
+    rows = parse_txt_lines(io.StringIO(text), parse_base_time("2025-11-05 09:52:30"))
+    grids = build_density_grids(rows, bins=4)
+    assert sum(grids["count"]) == 2
+    assert grids["count"][0] == 1  # 음수 좌표는 (0, 0) 가장자리 칸
+    assert grids["unshielded"][0] == 29
+
+
+def test_map_tree_and_coord_sort_keep_negative_coords():
+    import base64
+
+    text = dump_text([
+        ("Pemason", "RlRS", 30, 209, 401, "13h 53m"),
+        ("Edge", "RlRS", 29, -3, -12, None),
+        ("Zero", "RlRS", 28, 0, 5, None),
+    ])
+    rows = parse_txt_lines(io.StringIO(text), parse_base_time("2025-11-05 09:52:30"))
+    tree = build_map_tree(rows, leaf_cap=1)
+    assert sorted(tree["order"]) == [0, 1, 2]
+    assert tree["nodes"][0][5:8] == [1, 0, 2]  # 활성 / 긴급 / 만료
+
+    perms = build_sort_permutations(rows)
+    coord = list(base64.b64decode(perms["coord"])[::perms["width"]])
+    assert [rows[i]["name"] for i in coord] == ["Edge", "Zero", "Pemason"]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node 없음")
+def test_descending_sort_keeps_ties_in_expire_order():
+    import base64
+
+    text = dump_text([
+        ("B", "RlRS", 30, 5, 5, "10m"),
+        ("A", "RlRS", 29, 1, 1, "20m"),
+        ("C", "RlRS", 30, 5, 5, "30m"),
+        ("D", "RlRS", 29, 9, 9, "40m"),
+        ("E", "RlRS", 30, 2, 2, None),
+        ("F", "RlRS", 28, 2, 2, None),
+    ])
+    rows = parse_txt_lines(io.StringIO(text), parse_base_time("2025-11-05 09:52:30"))
+    rows.sort(key=lambda r: r["total_seconds"])  # 테이블 순서 (만료 순: E F B A C D)
+    perms = build_sort_permutations(rows)
+
+    with open(os.path.join(ROOT, "dashboard_template.html"), encoding="utf-8") as f:
+        template = f.read()
+    start = template.index("    function descendingOrder(")
+    func = template[start:template.index("\n    }\n", start) + len("\n    }")]
+    harness = "const sortGroupCache = {};\nconst SORT_PERMS = JSON.parse(require('fs').readFileSync(0, 'utf8'));\n" + func + """
+const n = SORT_PERMS.n;
+const out = {};
+for (const key of ['expire', 'name', 'hq', 'coord']) {
+  const perm = key === 'expire' ? null : Uint8Array.from(atob(SORT_PERMS[key]), c => c.charCodeAt(0));
+  const idx = perm ? Array.from({length: n}, (_, k) => perm[k * SORT_PERMS.width]) : null;
+  out[key] = descendingOrder(key, idx, n);
+}
+console.log(JSON.stringify(out));
+"""
+    proc = subprocess.run(["node", "-e", harness], input=json.dumps(dict(perms, n=len(rows))),
+                          capture_output=True, text=True, timeout=30)
+    assert proc.returncode == 0, proc.stderr
+    names = {key: [rows[i]["name"] for i in order] for key, order in json.loads(proc.stdout).items()}
+
+    # 같은 값끼리는 내림차순에서도 만료 순 (그냥 뒤집으면 E/F, B/C 순서가 뒤바뀜)
+    assert names["expire"] == ["D", "C", "A", "B", "E", "F"]
+    assert names["hq"] == ["E", "B", "C", "A", "D", "F"]
+    assert names["coord"] == ["D", "B", "C", "E", "F", "A"]
+    assert names["name"] == ["F", "E", "D", "C", "B", "A"]
+    assert base64.b64decode(perms["groups"]["hq"])[0] == 0b001011  # 28 | 29 29 | 30 30 30
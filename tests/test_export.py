@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+
+from conftest import dump_text
+from export import COLUMNS, export_dump, export_rows, rows_to_export
+from main import CRITICAL_SEC, parse_base_time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE_TIME = "2025-11-05 09:52:30"
+BASE_TS = int(parse_base_time(BASE_TIME).timestamp())
+ENTRIES = [
+    ("Pemason", "RlRS", 30, 209, 401, "13h 53m"),
+    ("Edge", "RlRS", 29, -3, -12, "5m"),
+    ("Anarchist Sheep", "OTHER", 30, 914, 137, None),
+]
+EXPECTED = [
+    ("Pemason", "RlRS", 30, 209, 401, BASE_TS + 13 * 3600 + 53 * 60, "active"),
+    ("Edge", "RlRS", 29, -3, -12, BASE_TS + 5 * 60, "critical"),
+    ("Anarchist Sheep", "OTHER", 30, 914, 137, None, "expired"),
+]
+
+
+def _export(tmp_path, name):
+    dump = tmp_path / "dump.txt"
+    dump.write_text(dump_text(ENTRIES), encoding="utf-8")
+    output = tmp_path / name
+    count, issues = export_dump(str(dump), str(output), BASE_TIME, batch_size=2)
+    assert (count, issues) == (len(ENTRIES), [])
+    return output.read_text(encoding="utf-8")
+
+
+def test_csv_header_columns_and_values(tmp_path):
+    rows = list(csv.reader(io.StringIO(_export(tmp_path, "out.csv"))))
+    assert tuple(rows[0]) == COLUMNS
+    # 만료(null) 는 빈칸, 음수 좌표는 부호 그대로
+    assert rows[1:] == [["" if v is None else str(v) for v in row] for row in EXPECTED]
+
+
+def test_ndjson_values_are_typed(tmp_path):
+    records = [json.loads(line) for line in _export(tmp_path, "out.ndjson").splitlines()]
+    assert [tuple(r) for r in records] == [COLUMNS] * len(EXPECTED)
+    assert [tuple(r.values()) for r in records] == EXPECTED
+    edge = records[1]
+    assert isinstance(edge["hq"], int) and isinstance(edge["expire_ts"], int)
+    assert (edge["x"], edge["y"]) == (-3, -12)
+    assert records[2]["expire_ts"] is None
+
+
+def test_broken_coords_and_missing_hq_come_out_empty(tmp_path):
+    rows = [{"name": "Broken", "alliance": "", "hq": None, "x": "?", "y": "", "is_expired": False,
+             "total_seconds": CRITICAL_SEC, "expire_ts": BASE_TS + CRITICAL_SEC}]
+    out = tmp_path / "out.csv"
+    assert export_rows(rows_to_export(rows), str(out)) == 1
+    assert out.read_text(encoding="utf-8").splitlines()[1] == f"Broken,,,,,{BASE_TS + CRITICAL_SEC},active"
+
+    out = tmp_path / "out.jsonl"
+    export_rows(rows_to_export(rows), str(out))
+    record = json.loads(out.read_text(encoding="utf-8"))
+    assert (record["hq"], record["x"], record["y"]) == (None, None, None)
+
+
+def test_closed_stdout_pipe_exits_quietly(tmp_path):
+    dump = tmp_path / "dump.txt"
+    dump.write_text(dump_text([(f"cmdr{i}", "RlRS", 30, i % 1000, i // 1000, "1h 0m") for i in range(50000)]),
+                    encoding="utf-8")
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "export.py"), "-i", str(dump), "--batch-rows", "100"],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    proc.stdout.readline()  # | head -1 처럼 한 줄만 읽고 닫음
+    proc.stdout.close()
+    stderr = proc.stderr.read().decode("utf-8")
+    proc.wait(timeout=60)
+    assert "Traceback" not in stderr
+    assert "BrokenPipeError" not in stderr
@@ -0,0 +1,37 @@
+import io
+
+from conftest import dump_text
+from export import iter_export_rows, rows_to_export
+from fanout import fan_out, format_report
+from main import parse_base_time, parse_txt_lines
+
+BASE_TIME = "2025-11-05 09:52:30"
+ENTRIES = [
+    ("Pemason", "RlRS", 30, 209, 401, "13h 53m"),
+    ("Edge", "RlRS", 29, -3, -12, "5m"),
+    ("Anarchist Sheep", "RlRS", 30, 914, 137, None),
+]
+
+
+def test_export_paths_agree_on_coords():
+    base = parse_base_time(BASE_TIME)
+    text = dump_text(ENTRIES)
+    streamed = list(iter_export_rows(io.StringIO(text), base))
+    from_rows = sorted(rows_to_export(parse_txt_lines(io.StringIO(text), base)))
+    assert sorted(streamed) == from_rows
+    assert ("Edge", "RlRS", 29, -3, -12) in [row[:5] for row in from_rows]
+
+
+def test_html_log_goes_into_report(tmp_path, capsys):
+    dump = tmp_path / "dump.txt"
+    dump.write_text(dump_text(ENTRIES), encoding="utf-8")
+    output = tmp_path / "out.html"
+
+    report = fan_out(str(dump), str(output), ["html", "csv"], BASE_TIME, workers=2, offline=False)
+
+    assert capsys.readouterr().out == ""  # 단계는 직접 찍지 않음
+    html = next(r for r in report["stages"] if r["stage"] == "html")
+    assert any(str(output) in message for message in html["log"])
+    text = format_report(report)
+    for message in html["log"]:
+        assert message in text
@@ -0,0 +1,91 @@
+from identity import IDENTITY_TTL_SEC, IdentityIndex, normalize_name
+
+T0 = 1762300000
+
+
+def _row(name, x, y, alliance="RlRS", hq=30):
+    return {"name": name, "alliance": alliance, "hq": hq, "x": str(x), "y": str(y)}
+
+
+def _resolve(index, *rows, ts=T0):
+    stats = index.resolve(list(rows), ts)
+    return [row["id"] for row in rows], stats
+
+
+def test_normalize_name():
+    assert normalize_name(" Pe ma-SON ") == normalize_name("pemason") == "pemason"
+
+
+def test_exact_match_survives_spelling_noise():
+    index = IdentityIndex()
+    (first,), _ = _resolve(index, _row("Pemason", 209, 401))
+    (second,), stats = _resolve(index, _row(" PEMASON ✨", 500, 500), ts=T0 + 60)
+    assert second == first
+    assert stats["exact"] == 1
+
+
+def test_fuzzy_match_near_same_alliance():
+    index = IdentityIndex()
+    (first,), _ = _resolve(index, _row("Sheep1", 100, 100))
+    (second,), stats = _resolve(index, _row("Sheep2", 110, 105), ts=T0 + 60)
+    assert second == first
+    assert stats["fuzzy"] == 1
+
+
+def test_fuzzy_match_far_needs_near_exact_name():
+    index = IdentityIndex()
+    (first,), _ = _resolve(index, _row("Anarchist Sheep", 914, 137))
+    (second,), stats = _resolve(index, _row("Anarchist Sheep1", 100, 100), ts=T0 + 60)
+    assert second == first  # 이사 + 이름 끝 한 글자
+    assert stats["fuzzy"] == 1
+
+
+def test_similar_names_far_apart_stay_separate():
+    index = IdentityIndex()
+    (first,), _ = _resolve(index, _row("Sheep1", 100, 100))
+    (second,), stats = _resolve(index, _row("Sheep2", 900, 900), ts=T0 + 60)
+    assert second != first
+    assert stats["new"] == 1
+
+
+def test_fuzzy_match_requires_same_alliance():
+    index = IdentityIndex()
+    (first,), _ = _resolve(index, _row("Dragon Slayer", 100, 100, "RlRS", 30))
+    (second,), stats = _resolve(index, _row("Dragon Slayers", 800, 800, "OTHER", 25), ts=T0 + 60)
+    assert second != first
+    (third,), _ = _resolve(index, _row("Dragon Slayerz", 101, 100, "OTHER", 25), ts=T0 + 120)
+    assert third == second  # 같은 연맹 + 가까움 (RlRS 쪽이 아니라)
+
+
+def test_coord_match_is_rename_in_place():
+    index = IdentityIndex()
+    (first,), _ = _resolve(index, _row("Pemason", 209, 401))
+    (second,), stats = _resolve(index, _row("Zorro", 209, 401), ts=T0 + 60)
+    assert second == first
+    assert stats["coord"] == 1
+    (third,), stats = _resolve(index, _row("Quux", 209, 401, hq=25), ts=T0 + 120)
+    assert third != first  # HQ 가 다르면 다른 사람
+    assert stats["new"] == 1
+
+
+def test_same_dump_rows_never_share_an_id():
+    index = IdentityIndex()
+    ids, stats = _resolve(index, _row("Sheep1", 100, 100), _row("Sheep2", 101, 100))
+    assert len(set(ids)) == 2
+    assert stats["new"] == 2
+
+
+def test_ttl_prunes_unseen_entries(tmp_path):
+    index = IdentityIndex()
+    (old,), _ = _resolve(index, _row("Pemason", 209, 401))
+    _resolve(index, _row("Dafungi", 213, 401), ts=T0 + IDENTITY_TTL_SEC)
+    assert old in index.entries  # 경계는 아직 유지
+    _, stats = _resolve(index, _row("Dafungi", 213, 401), ts=T0 + IDENTITY_TTL_SEC + 1)
+    assert stats["pruned"] == 1
+    assert old not in index.entries
+
+    path = tmp_path / "identity.json"
+    index.save(str(path))
+    loaded = IdentityIndex.load(str(path))
+    assert loaded.entries == index.entries
+    assert loaded.next_id == index.next_id
@@ -0,0 +1,51 @@
+import json
+import os
+
+from conftest import dump_text
+from ingest import _move_into, run_ingest
+
+T0 = 1762300000
+
+
+def _drop(spool, name, entries, mtime):
+    path = spool / name
+    path.write_text(dump_text(entries), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_merge_uses_identity_ids(tmp_path):
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    _drop(spool, "a.txt", [("Pemason", "RlRS", 30, 209, 401, "2h 0m"), ("Dafungi", "RlRS", 29, 213, 401, "1h 0m")],
+          T0)
+    # 나중 덤프: Pemason 이 같은 자리에서 개명 -> 같은 커맨더로 합쳐져야 함
+    _drop(spool, "b.txt", [("Pemason Reborn", "RlRS", 30, 209, 401, "3h 0m")], T0 + 600)
+
+    output = tmp_path / "out.html"
+    run_ingest(str(spool), output_path=str(output), workers=1, poll_sec=0.1, once=True, log=lambda msg: None,
+               offline=False)
+
+    merged = json.loads((tmp_path / "out.merged.json").read_text(encoding="utf-8"))["entries"]
+    names = sorted(row["name"] for _, row in merged.values())
+    assert names == ["Dafungi", "Pemason Reborn"]
+    assert sorted(os.listdir(spool / "done")) == ["a.txt", "b.txt"]
+
+
+def test_move_of_vanished_file_is_skipped(tmp_path):
+    assert _move_into(str(tmp_path / "gone.txt"), "failed") is False
+
+
+def test_partial_dumps_keep_similar_names_far_apart(tmp_path):
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    # 정찰병 둘이 각자 다른 구역만 덤프: 이름은 비슷하지만 멀리 떨어진 다른 커맨더
+    _drop(spool, "a.txt", [("Sheep1", "RlRS", 30, 100, 100, "2h 0m")], T0)
+    _drop(spool, "b.txt", [("Sheep2", "RlRS", 30, 900, 900, "3h 0m")], T0 + 60)
+
+    output = tmp_path / "out.html"
+    run_ingest(str(spool), output_path=str(output), workers=1, poll_sec=0.1, once=True, log=lambda msg: None,
+               offline=False)
+
+    merged = json.loads((tmp_path / "out.merged.json").read_text(encoding="utf-8"))["entries"]
+    assert sorted(row["name"] for _, row in merged.values()) == ["Sheep1", "Sheep2"]
+    assert len(merged) == 2
@@ -0,0 +1,79 @@
+import json
+import os
+import re
+
+import main
+from conftest import dump_text
+
+ENTRIES = [
+    ("Pemason", "RlRS", 30, 209, 401, "13h 53m"),
+    ("Anarchist Sheep", "RlRS", 30, 914, 137, None),
+]
+
+
+def _generate(tmp_path, entries, **options):
+    options.setdefault("offline", True)
+    dump = tmp_path / "dump.txt"
+    dump.write_text(dump_text(entries), encoding="utf-8")
+    output = tmp_path / "site" / "out.html"
+    output.parent.mkdir(exist_ok=True)
+    main.generate_dashboard(str(dump), str(output), **options)
+    return output
+
+
+def _cache_name(sw_path):
+    return re.search(r"const CACHE_NAME = (\"[^\"]*\");", sw_path.read_text(encoding="utf-8")).group(1)
+
+
+def test_shell_files_are_relative_to_output(tmp_path):
+    output = _generate(tmp_path, ENTRIES)
+    site = output.parent
+    sw = (site / "out.sw.js").read_text(encoding="utf-8")
+    manifest = json.loads((site / "out.webmanifest").read_text(encoding="utf-8"))
+    page = output.read_text(encoding="utf-8")
+
+    assert manifest["start_url"] == "out.html" and manifest["scope"] == "./"
+    assert 'const PAGE_URL = new URL("out.html", self.location)' in sw
+    assert '["out.webmanifest", "https://cdn.tailwindcss.com"]' in sw
+    assert '<link rel="manifest" href="out.webmanifest">' in page
+    assert 'const SW_URL = "out.sw.js";' in page
+    assert not re.search(r"@@\w+@@", sw, re.ASCII)  # 채우지 않은 슬롯 없음
+    assert str(tmp_path) not in sw and str(tmp_path) not in json.dumps(manifest)
+
+
+def test_cache_version_follows_page(tmp_path):
+    output = _generate(tmp_path, ENTRIES)
+    sw_path = output.parent / "out.sw.js"
+    first = _cache_name(sw_path)
+    mtime = os.path.getmtime(sw_path)
+
+    _generate(tmp_path, ENTRIES)  # 같은 페이지 -> 워커 그대로 (다시 쓰지도 않음)
+    assert _cache_name(sw_path) == first and os.path.getmtime(sw_path) == mtime
+
+    _generate(tmp_path, ENTRIES[:1])  # 페이지가 바뀜 -> 캐시 버전도 바뀜
+    assert _cache_name(sw_path) != first
+
+
+def test_production_precaches_no_cdn(tmp_path):
+    output = _generate(tmp_path, ENTRIES, production=True)
+    assert "cdn.tailwindcss.com" not in (output.parent / "out.sw.js").read_text(encoding="utf-8")
+
+
+def test_offline_is_opt_in(tmp_path):
+    dump = tmp_path / "dump.txt"
+    dump.write_text(dump_text(ENTRIES), encoding="utf-8")
+    output = tmp_path / "site" / "out.html"
+    output.parent.mkdir()
+    main.main(["-i", str(dump), "-o", str(output)])  # 플래그 없이 돌리는 cron 은 예전처럼 워커 / 매니페스트 없음
+    assert not (output.parent / "out.sw.js").exists() and not (output.parent / "out.webmanifest").exists()
+    assert 'const SW_URL = "";' in output.read_text(encoding="utf-8")
+    main.main(["-i", str(dump), "-o", str(output), "--offline"])
+    assert (output.parent / "out.sw.js").exists() and (output.parent / "out.webmanifest").exists()
+
+
+def test_no_offline(tmp_path):
+    output = _generate(tmp_path, ENTRIES, offline=False)
+    assert not (output.parent / "out.sw.js").exists()
+    assert not (output.parent / "out.webmanifest").exists()
+    page = output.read_text(encoding="utf-8")
+    assert 'const SW_URL = "";' in page and 'rel="manifest"' not in page
@@ -0,0 +1,68 @@
+import io
+
+from main import coord_int, iter_records, parse_base_time, parse_txt_lines
+
+DUMP = [
+    "﻿A\tRlRS\t30\t(1, 2)\t",
+    "🛡️",
+    "garbage line",  # 레코드 중간의 알 수 없는 줄: 보고만
+    "1h 2m",
+    "B\tRlRS\t\t(-3, -4)\t",  # 남은시간 없이 다음 레코드 -> 버리고 재동기화
+    "C\tRlRS\t29\t(5,6)\t-",
+    "🛡️",
+    "5m",
+    "",
+    "D\tRlRS\t28\t(7, 8)\t",
+    "26m",  # 🛡️ 줄 없이 남은시간
+    "not a record",  # 레코드 밖: 조용히 무시
+    "E\tOTHER\t27\t(-9, 9)\t",
+    "🛡️",
+    "🛡️",
+    "2d 3h",
+    "F\tRlRS\t1\t(0, 0)\t",  # 입력 끝까지 남은시간 없음
+]
+
+
+def _records(lines):
+    issues = []
+    records = list(iter_records(io.StringIO("\n".join(lines) + "\n"), issues))
+    return records, issues
+
+
+def test_tokenizer_resyncs_and_reports():
+    records, issues = _records(DUMP)
+    assert records == [
+        (1, "A", "RlRS", 30, "1", "2", "1h 2m"),
+        (6, "C", "RlRS", 29, "5", "6", None),
+        (10, "D", "RlRS", 28, "7", "8", "26m"),
+        (13, "E", "OTHER", 27, "-9", "9", "2d 3h"),
+    ]
+    assert issues == [
+        (3, "A: 알 수 없는 줄 'garbage line'"),
+        (5, "B: 남은시간 줄 없이 다음 레코드 시작 (건너뜀)"),
+        (7, "레코드 없는 🛡️ 줄 (무시)"),
+        (8, "레코드 없는 남은시간 줄 '5m' (무시)"),
+        (10, "D: 🛡️ 줄 없음 (남은시간으로 복구)"),
+        (15, "E: 🛡️ 줄 중복 (무시)"),
+        (17, "F: 남은시간 줄 없이 입력 끝 (건너뜀)"),
+    ]
+
+
+def test_clean_dump_has_no_issues():
+    records, issues = _records(["A\tRlRS\t30\t(1, 2)\t", "🛡️", "13h 53m", "B\tRlRS\t29\t(-5, 7)\t-"])
+    assert [r[1] for r in records] == ["A", "B"]
+    assert issues == []
+
+
+def test_rows_keep_negative_coords():
+    rows = parse_txt_lines(io.StringIO("\n".join(DUMP)), parse_base_time("2025-11-05 09:52:30"))
+    assert [(row["name"], coord_int(row["x"]), coord_int(row["y"])) for row in rows] == [
+        ("A", 1, 2), ("C", 5, 6), ("D", 7, 8), ("E", -9, 9)]
+
+
+def test_coord_int():
+    assert coord_int("-12") == -12
+    assert coord_int("0") == 0
+    assert coord_int("") is None
+    assert coord_int("--1") is None
+    assert coord_int("1.5") is None
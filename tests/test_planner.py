@@ -0,0 +1,100 @@
+import io
+import math
+import random
+import time
+
+import pytest
+
+from conftest import dump_text
+from main import parse_base_time, parse_txt_lines
+from planner import _greedy_route, _schedule, _two_opt, collect_targets, plan_route
+
+BASE = parse_base_time("2025-11-05 09:52:30")
+NOW = int(BASE.timestamp())
+SPEED = 20.0  # 좌표 단위 / 분
+SEC_PER_UNIT = 60.0 / SPEED
+
+
+def _rows(n, seed, spread=1000):
+    rnd = random.Random(seed)
+    entries = []
+    for i in range(n):
+        remaining = None if rnd.random() < 0.4 else f"{rnd.randint(0, 2)}h {rnd.randint(0, 59)}m"
+        entries.append((f"t{i}", "OTHER", rnd.randint(1, 30), rnd.randint(-20, spread), rnd.randint(-20, spread),
+                        remaining))
+    return parse_txt_lines(io.StringIO(dump_text(entries)), BASE)
+
+
+def _naive_greedy(targets, start, start_ts, deadline, hit_sec):
+    """격자 없이 남은 타겟 전부를 보는 탐욕 (비교용)"""
+    left = set(range(len(targets)))
+    route = []
+    (px, py), t = start, start_ts
+    while left:
+        def key(idx):
+            tgt = targets[idx]
+            dist = math.hypot(tgt["x"] - px, tgt["y"] - py)
+            return max(t + dist * SEC_PER_UNIT, tgt["open"]), dist
+        best = min(left, key=key)
+        ready = key(best)[0]
+        if ready > deadline:
+            break
+        route.append(best)
+        left.discard(best)
+        px, py, t = targets[best]["x"], targets[best]["y"], ready + hit_sec
+    return route
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_greedy_grid_matches_full_scan(seed):
+    targets = collect_targets(_rows(150, seed, spread=300), NOW, 3600)
+    start, deadline = (150, 150), NOW + 3600
+    assert _greedy_route(targets, start, NOW, deadline, SEC_PER_UNIT, 30) == \
+        _naive_greedy(targets, start, NOW, deadline, 30)
+
+
+@pytest.mark.parametrize("seed", [4, 5, 6])
+def test_two_opt_is_feasible_and_never_worse(seed):
+    targets = collect_targets(_rows(400, seed, spread=400), NOW, 3600)
+    start, deadline = (200, 200), NOW + 3600
+    greedy = _greedy_route(targets, start, NOW, deadline, SEC_PER_UNIT, 20)
+    improved = _two_opt(list(greedy), targets, start, NOW, deadline, SEC_PER_UNIT, 20)
+
+    assert sorted(improved) == sorted(greedy)  # 같은 타겟을 한 번씩
+    assert len(set(improved)) == len(improved)
+    finish = lambda route: _schedule(route, targets, start, NOW, SEC_PER_UNIT, 20)[-1][1]
+    assert finish(improved) <= finish(greedy) + 1e-6
+    for idx, (arrive, ready) in zip(improved, _schedule(improved, targets, start, NOW, SEC_PER_UNIT, 20)):
+        assert ready >= targets[idx]["open"]
+        assert ready >= arrive
+        assert ready <= deadline
+
+
+def test_plan_rows_are_consistent():
+    rows = _rows(300, 7, spread=300)
+    plan = plan_route(rows, (100, 100), SPEED, NOW, horizon_sec=3600, hit_sec=30)
+    assert plan
+    assert [p["order"] for p in plan] == list(range(1, len(plan) + 1))
+    assert len({(p["name"], p["x"], p["y"]) for p in plan}) == len(plan)
+    prev_free = NOW
+    px, py = 100, 100
+    for p in plan:
+        assert p["arrive"] >= int(prev_free + math.hypot(p["x"] - px, p["y"] - py) * SEC_PER_UNIT) - 1
+        assert p["ready"] >= p["open"] and p["ready"] <= NOW + 3600
+        assert abs(p["wait"] - (p["ready"] - p["arrive"])) <= 1  # 각각 초 단위로 내림
+        prev_free, px, py = p["ready"] + 30, p["x"], p["y"]
+
+
+def test_rejects_non_positive_speed():
+    with pytest.raises(ValueError):
+        plan_route(_rows(5, 8), (0, 0), 0, NOW)
+
+
+def test_thousands_of_candidates_under_a_second():
+    rows = _rows(5000, 9)
+    assert len(collect_targets(rows, NOW, 3 * 3600)) >= 3000
+    started = time.perf_counter()
+    plan = plan_route(rows, (500, 500), 200.0, NOW, horizon_sec=3 * 3600, hit_sec=5)
+    elapsed = time.perf_counter() - started
+    assert plan
+    assert elapsed < 1.0, f"{elapsed:.2f}초"
@@ -0,0 +1,46 @@
+import gzip
+import hashlib
+import re
+
+import main
+from conftest import dump_text
+
+
+def test_inline_css_keeps_only_used_classes_in_tailwind_order():
+    css = main.build_inline_css('<div class="md:flex hover:text-white no-such-class flex"></div>')
+    assert css.startswith(main.PREFLIGHT_CSS)
+    rules = css[len(main.PREFLIGHT_CSS):]
+    # 기본 -> 변형(hover) -> 반응형(md), 모르는 클래스는 버림
+    assert rules == ".flex{display:flex}.hover\\:text-white:hover{color:#fff}@media (min-width:768px){.md\\:flex{display:flex}}"
+    assert ".grid{" not in css
+
+
+def test_hashed_outputs_match_content(tmp_path):
+    html = "<!DOCTYPE html><html><body>쉴드</body></html>"
+    data = html.encode("utf-8")
+    output = tmp_path / "out.html"
+    sizes = main.write_production_assets(html, str(output), log=lambda msg: None)
+
+    hashed = tmp_path / f"out.{hashlib.sha256(data).hexdigest()[:10]}.html"
+    assert output.read_bytes() == hashed.read_bytes() == data
+    gz = tmp_path / (hashed.name + ".gz")
+    assert gzip.decompress(gz.read_bytes()) == data
+    assert sizes[str(output)] == sizes[str(hashed)] == len(data)
+    assert sizes[str(gz)] == gz.stat().st_size
+
+    first = gz.read_bytes()
+    main.write_production_assets(html, str(output), log=lambda msg: None)
+    assert gz.read_bytes() == first  # 같은 내용이면 .gz 바이트도 같음 (mtime 고정)
+
+
+def test_production_page_inlines_css(tmp_path):
+    dump = tmp_path / "dump.txt"
+    dump.write_text(dump_text([("Pemason", "RlRS", 30, 209, 401, "13h 53m")]), encoding="utf-8")
+    output = tmp_path / "out.html"
+    main.generate_dashboard(str(dump), str(output), production=True)
+
+    page = output.read_bytes()
+    assert b"cdn.tailwindcss.com" not in page
+    assert re.search(rb"<style>\*,::before,::after\{", page)
+    digest = hashlib.sha256(page).hexdigest()[:10]
+    assert gzip.decompress((tmp_path / f"out.{digest}.html.gz").read_bytes()) == page
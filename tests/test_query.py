@@ -0,0 +1,126 @@
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from conftest import dump_text
+from main import CRITICAL_SEC, parse_base_time, parse_txt_lines
+from query import Query, RowIndex, select
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NOW = 1762300000
+
+QUERIES = [
+    "x<0",
+    "y>=0 and x<=-5",
+    "hq>=29",
+    "hq!=30",
+    "hq<5",
+    "near(0,0,20)",
+    "near(-10,-10,15) or name~shee",
+    "status=critical",
+    "status=active and not status=critical",
+    "status=expired and alliance=rlrs",
+    "status!=active",
+    "expires<45m and not hq=30",
+    "expires>=2h",
+    'alliance="other" or x=914',
+]
+
+ROWS = [
+    {"name": "Pemason", "alliance": "RlRS", "hq": 30, "x": "209", "y": "401", "expire_ts": NOW + 13 * 3600},
+    {"name": "Edge", "alliance": "RlRS", "hq": 29, "x": "-3", "y": "-12", "expire_ts": NOW + 300},
+    {"name": "Sheep", "alliance": "OTHER", "hq": 0, "x": "-20", "y": "5", "expire_ts": None},
+    {"name": "Nohq", "alliance": "", "hq": None, "x": "0", "y": "0", "expire_ts": NOW + 1860},
+    {"name": "Broken", "alliance": "RlRS", "hq": 3, "x": "?", "y": "12", "expire_ts": NOW + 1859},
+    {"name": "Anarchist Sheep", "alliance": "RlRS", "hq": 30, "x": "914", "y": "137", "expire_ts": NOW},
+    {"name": "Dafungi", "alliance": "OTHER", "hq": 25, "x": "7", "y": "-7", "expire_ts": NOW + 7200},
+]
+
+
+def _template_function(src, name):
+    start = src.index(f"    function {name}(")
+    return src[start:src.index("\n    }\n", start) + len("\n    }")]
+
+
+def _run_page_engine(rows, queries, now):
+    """페이지 템플릿의 rowEngine / coordValue 를 node 로 돌려 질의마다 보이는 행 인덱스"""
+    with open(os.path.join(ROOT, "dashboard_template.html"), encoding="utf-8") as f:
+        template = f.read().replace("@@critical_sec@@", str(CRITICAL_SEC))
+    harness = _template_function(template, "rowEngine") + "\n" + _template_function(template, "coordValue") + """
+const data = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const rows = data.rows;
+const out = data.queries.map(src => {
+  let last = null;
+  const scope = { postMessage: m => { last = m; } };
+  rowEngine(scope);
+  scope.onmessage({ data: {
+    type: 'init',
+    expire: Float64Array.from(rows, r => r.expire_ts || 0),
+    hq: Int16Array.from(rows, r => r.hq || 0),
+    xs: Int32Array.from(rows, r => coordValue(r.x)),
+    ys: Int32Array.from(rows, r => coordValue(r.y)),
+    names: rows.map(r => r.name.toLowerCase()),
+    alliances: rows.map(r => (r.alliance || '').toLowerCase()),
+    queries: [src],
+    now: data.now
+  } });
+  const visible = new Set(last.shown);
+  scope.onmessage({ data: { type: 'query', filter: 'q0', term: '', now: data.now } });
+  last.hidden.forEach(i => visible.delete(i));
+  last.shown.forEach(i => visible.add(i));
+  return [...visible].sort((a, b) => a - b);
+});
+console.log(JSON.stringify(out));
+"""
+    proc = subprocess.run(["node", "-e", harness], input=json.dumps({"rows": rows, "queries": queries, "now": now}),
+                          capture_output=True, text=True, timeout=30)
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node 없음")
+def test_python_and_page_predicates_agree():
+    queries = [Query(text) for text in QUERIES]
+    page = _run_page_engine(ROWS, [q.js for q in queries], NOW)
+    for query, js_hits in zip(queries, page):
+        py_hits = [i for i, row in enumerate(ROWS) if query.matches(row, NOW)]
+        assert py_hits == js_hits, query.text
+
+
+def test_negative_coords_and_unknown_hq():
+    hits = lambda text: [row["name"] for row in ROWS if Query(text).matches(row, NOW)]
+    assert hits("x<0") == ["Edge", "Sheep"]
+    assert hits("hq<5") == ["Broken"]  # HQ 0 / 빈칸은 모름
+    assert "Broken" not in hits("y=12 and x<1000")  # 깨진 좌표는 비교가 거짓
+
+
+def test_negative_near_radius_is_rejected():
+    with pytest.raises(ValueError, match="반경"):
+        Query("near(1,2,-5)")
+    with pytest.raises(ValueError, match="정수"):
+        Query("x<--5")
+
+
+def test_select_matches_full_scan():
+    rnd = random.Random(7)
+    entries = []
+    for i in range(600):
+        remaining = None if rnd.random() < 0.3 else f"{rnd.randint(0, 20)}h {rnd.randint(0, 59)}m"
+        entries.append((f"cmdr{i}", rnd.choice(["RlRS", "OTHER"]), rnd.randint(1, 30), rnd.randint(-60, 60),
+                        rnd.randint(-60, 60), remaining))
+    base = parse_base_time("2025-11-05 09:52:30")
+    now = int(base.timestamp())
+    rows = parse_txt_lines(io.StringIO(dump_text(entries)), base)
+    index = RowIndex(rows)
+    for text in QUERIES + ["near(-30,25,12) and hq>=10", "near(0,0,0)", "status=critical and near(5,-5,40)"]:
+        query = Query(text)
+        expected = sorted(id(row) for row in rows if query.matches(row, now))
+        got = select(rows, query, now, index)
+        assert sorted(id(row) for row in got) == expected, text
+        ends = [float("-inf") if r["expire_ts"] is None else r["expire_ts"] for r in got]
+        assert ends == sorted(ends)
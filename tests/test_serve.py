@@ -0,0 +1,78 @@
+import os
+import re
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from conftest import dump_text
+from serve import make_server
+
+T0 = 1762300000
+ENTRIES = [
+    ("Pemason", "RlRS", 30, 209, 401, "13h 53m"),
+    ("Dafungi", "RlRS", 30, 213, 401, "11h 3m"),
+    ("Anarchist Sheep", "RlRS", 30, 914, 137, None),
+]
+
+
+@pytest.fixture
+def served(tmp_path):
+    path = tmp_path / "dump.txt"
+    path.write_text(dump_text(ENTRIES), encoding="utf-8")
+    os.utime(path, (T0, T0))
+    server = make_server(str(path), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield path, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url, etag=None):
+    req = urllib.request.Request(url, headers={"If-None-Match": etag} if etag else {})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as res:
+            return res.status, res.headers, res.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, b""
+
+
+def _base_ts(body):
+    return int(re.search(rb"const BASE_TS = (\d+);", body).group(1))
+
+
+def test_revalidation_returns_304(served):
+    _, base = served
+    status, headers, body = _get(base + "/")
+    assert status == 200 and headers["X-Cache"] == "miss"
+    etag = headers["ETag"]
+    assert _get(base + "/")[1]["X-Cache"] == "hit"
+
+    status, headers, body = _get(base + "/", etag)
+    assert status == 304 and body == b"" and headers["ETag"] == etag
+
+
+def test_content_edit_changes_etag(served):
+    path, base = served
+    _, headers, _ = _get(base + "/data.json")
+    etag = headers["ETag"]
+
+    path.write_text(dump_text(ENTRIES[:2]), encoding="utf-8")
+    os.utime(path, (T0, T0))
+    status, headers, body = _get(base + "/data.json", etag)
+    assert status == 200 and headers["ETag"] != etag
+    assert b"Anarchist Sheep" not in body
+
+
+def test_mtime_only_change_rebases_page(served):
+    path, base = served
+    _, headers, body = _get(base + "/")
+    etag = headers["ETag"]
+    assert _base_ts(body) == T0
+
+    os.utime(path, (T0 + 600, T0 + 600))  # touch: 내용은 그대로, 기준 시각만 바뀜
+    status, headers, body = _get(base + "/", etag)
+    assert status == 200 and headers["ETag"] != etag and headers["X-Cache"] == "miss"
+    assert _base_ts(body) == T0 + 600
@@ -0,0 +1,56 @@
+import io
+
+from conftest import dump_text
+from export import rows_to_export
+from main import CRITICAL_SEC, parse_base_time, parse_txt_lines
+from query import Query
+from snapshot import STATUS_ACTIVE, STATUS_CRITICAL, STATUS_EXPIRED, ShieldIndex, build_slider
+
+BASE = parse_base_time("2025-11-05 09:52:30")
+T = int(BASE.timestamp())
+
+
+def _rows():
+    text = dump_text([
+        ("Edge", "RlRS", 30, 1, 1, "31m"),  # 남은 초 = CRITICAL_SEC -> 아직 활성
+        ("Inside", "RlRS", 30, 2, 2, "30m 59s"),  # CRITICAL_SEC - 1 -> 긴급
+        ("Half", "RlRS", 30, 3, 3, "30m"),
+        ("Later", "RlRS", 30, 4, 4, "2h"),
+        ("Gone", "RlRS", 30, 5, 5, None),
+    ])
+    return parse_txt_lines(io.StringIO(text), BASE)
+
+
+def test_critical_boundary_second():
+    assert CRITICAL_SEC == 31 * 60
+    index = ShieldIndex(_rows())
+    assert sorted(r["name"] for r in index.critical_at(T)) == ["Half", "Inside"]
+    assert index.counts_at(T) == (2, 2, 1)
+    # 1초 뒤 Edge 의 남은 초가 CRITICAL_SEC - 1 이 되면서 긴급
+    assert sorted(r["name"] for r in index.critical_at(T + 1)) == ["Edge", "Half", "Inside"]
+    assert index.counts_at(T + 1) == (1, 3, 1)
+
+
+def test_critical_agrees_across_modules():
+    rows = _rows()
+    snapshot = sorted(r["name"] for r in ShieldIndex(rows).critical_at(T))
+    table = sorted(r["name"] for r in rows if not r["is_expired"] and r["total_seconds"] < CRITICAL_SEC)
+    query = sorted(r["name"] for r in rows if Query("status=critical").matches(r, T))
+    export = sorted(row[0] for row in rows_to_export(rows) if row[6] == "critical")
+    assert snapshot == table == query == export
+
+
+def test_slider_critical_transition_at_boundary():
+    index = ShieldIndex(_rows())
+    data = build_slider(index, T, T + 6000, step_sec=60)
+    names = [r["name"] for r in index.rows]
+    initial = dict(zip(names, data["initial"]))
+    assert initial == {"Gone": STATUS_EXPIRED, "Half": STATUS_CRITICAL, "Inside": STATUS_CRITICAL,
+                       "Edge": STATUS_ACTIVE, "Later": STATUS_ACTIVE}
+    edge = names.index("Edge")
+    assert [T + 1, edge, STATUS_CRITICAL] in data["transitions"]
+    assert [T + CRITICAL_SEC, edge, STATUS_EXPIRED] in data["transitions"]
+    later = names.index("Later")
+    assert [T + 7200 - CRITICAL_SEC + 1, later, STATUS_CRITICAL] in data["transitions"]
+    # 눈금 집계도 같은 기준
+    assert data["steps"][0][1:] == list(index.counts_at(T))
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+import main
+from conftest import dump_text
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# import main 만으로는 불러오면 안 되는 모듈 (필요한 함수 안에서 늦게 불러옴)
+LAZY_MODULES = {
+    "json", "html", "html.entities", "argparse", "_strptime", "locale", "hashlib", "gzip", "zoneinfo",
+    "tempfile", "concurrent.futures", "asyncio", "urllib.request", "http.server", "csv", "unicodedata",
+    "identity", "planner", "targets", "query", "snapshot", "alerts", "export", "ingest", "brotli", "pyarrow",
+}
+COLD_IMPORT_BUDGET_US = 150_000  # import main 누적 시간 상한 (느린 CI 도 넉넉히)
+
+
+def _importtime(code):
+    """python -X importtime -c code -> {모듈 이름: 누적 마이크로초}"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=REPO, capture_output=True,
+                          text=True, check=True)
+    out = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        out[name.strip()] = int(cumulative)
+    return out
+
+
+def test_import_main_is_lazy():
+    loaded = _importtime("import main")
+    assert "main" in loaded
+    assert not LAZY_MODULES & loaded.keys()
+    assert loaded["main"] < COLD_IMPORT_BUDGET_US
+
+
+def test_template_segments_round_trip():
+    with open(main.TEMPLATE_PATH, "rb") as f:
+        source = f.read()
+    segments = main.load_compiled_template()
+    assert segments == main.compile_template(source)
+    # 슬롯 자리에 이름을 그대로 되돌려 넣으면 템플릿 원문과 바이트 단위로 같아야 함
+    assert main.render_template({name: f"@@{name}@@" for name in segments[1::2]}) == source
+
+
+def test_disk_cache_renders_same_bytes(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "TEMPLATE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "_compiled_templates", {})
+    base_time = main.parse_base_time("2025-11-05 09:52:30")
+    rows = main.parse_txt_lines(dump_text([
+        ("Pemason", "RlRS", 30, 209, 401, "13h 53m"),
+        ("Anarchist Sheep", "RlRS", 30, 914, 137, None),
+    ]).splitlines(), base_time)
+
+    fresh = main.build_html_bytes(rows, base_time)  # 컴파일 + 디스크 캐시 저장
+    assert [p for p in os.listdir(tmp_path) if p.endswith(".marshal")]
+    monkeypatch.setattr(main, "_compiled_templates", {})
+    assert main.build_html_bytes(rows, base_time) == fresh  # 디스크 캐시에서
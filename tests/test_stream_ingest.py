@@ -0,0 +1,64 @@
+import asyncio
+import functools
+import socket
+
+import stream_ingest
+from conftest import dump_text
+from stream_ingest import STREAM_LINE_LIMIT, handle_client, make_context, send_dump
+
+ENTRIES = [
+    ("Pemason", "RlRS", 30, 209, 401, "13h 53m"),
+    ("Anarchist Sheep", "RlRS", 30, 914, 137, None),
+]
+
+
+def _upload(tmp_path, send, idle_sec=5):
+    """127.0.0.1:0 에 엔드포인트를 띄우고 send(port) 를 스레드에서 돌린 결과"""
+    async def run():
+        ctx = make_context(str(tmp_path / "out.html"), idle_sec=idle_sec, log=lambda msg: None, offline=False)
+        server = await asyncio.start_server(functools.partial(handle_client, ctx=ctx), "127.0.0.1", 0,
+                                            limit=STREAM_LINE_LIMIT)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await asyncio.wait_for(asyncio.to_thread(send, port), 30)
+
+    return asyncio.run(run())
+
+
+def test_ok_upload(tmp_path):
+    lines = dump_text(ENTRIES).splitlines(keepends=True)
+    reply = _upload(tmp_path, lambda port: send_dump(lines, port=port, base_time="2025-11-05 09:52:30"))
+    assert reply.startswith("OK 2 0 ")
+    assert (tmp_path / "out.html").exists()
+
+
+def test_overlong_line(tmp_path):
+    lines = ["x" * (STREAM_LINE_LIMIT + 100) + "\n"]
+    reply = _upload(tmp_path, lambda port: send_dump(lines, port=port))
+    assert reply.startswith("ERR ") and str(STREAM_LINE_LIMIT) in reply
+
+
+def test_bad_base_header(tmp_path):
+    lines = dump_text(ENTRIES).splitlines(keepends=True)
+    reply = _upload(tmp_path, lambda port: send_dump(lines, port=port, base_time="어제 저녁"))
+    assert reply.startswith("ERR ") and "#base" in reply
+
+
+def test_idle_timeout(tmp_path):
+    def send(port):
+        with socket.create_connection(("127.0.0.1", port), timeout=10) as sock:
+            sock.sendall(b"Pemason\tRlRS\t30\t(209, 401)\t\n")  # 보내다 멈춤 (EOF 없음)
+            return sock.makefile("rb").readline().decode("utf-8").strip()
+
+    reply = _upload(tmp_path, send, idle_sec=0.2)
+    assert reply == "ERR 0.2초 동안 입력 없음"
+
+
+def test_publish_error_still_replies(tmp_path, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("깨진 행")
+
+    monkeypatch.setattr(stream_ingest, "publish_dashboard", broken)
+    lines = dump_text(ENTRIES).splitlines(keepends=True)
+    reply = _upload(tmp_path, lambda port: send_dump(lines, port=port, timeout=10))
+    assert reply == "ERR 대시보드 생성 실패: RuntimeError: 깨진 행"
@@ -0,0 +1,91 @@
+import io
+import json
+import math
+import random
+
+from conftest import dump_text
+from identity import assign_ids
+from main import parse_base_time, parse_txt_lines
+from targets import TargetGrid, find_targets, spatial_join, split_rows, targets_page_data, write_targets
+
+BASE = parse_base_time("2025-11-05 09:52:30")
+NOW = int(BASE.timestamp())
+
+
+def _brute(members, targets, k):
+    out = []
+    for px, py in members:
+        dists = sorted((math.hypot(x - px, y - py), idx) for idx, (x, y) in enumerate(targets))
+        out.append([round(d, 6) for d, _ in dists[:k]])
+    return out
+
+
+def _points(rnd, n, lo=-50, hi=1000):
+    return [(rnd.randint(lo, hi), rnd.randint(lo, hi)) for _ in range(n)]
+
+
+def test_grid_nearest_matches_brute_force():
+    rnd = random.Random(3)
+    targets = _points(rnd, 400)
+    members = _points(rnd, 150) + [(-500, -500), (2000, 2000)]  # 격자 밖에서 시작
+    for cell in (None, 7.0, 300.0):
+        grid = TargetGrid(targets, cell)
+        got = [[round(d, 6) for d, _ in near] for near in grid.nearest_many(members, 5)]
+        assert got == _brute(members, targets, 5)
+    assert TargetGrid([]).nearest(1, 2, 3) == []
+    assert len(TargetGrid(targets[:2]).nearest(0, 0, 5)) == 2  # k 보다 타겟이 적을 때
+
+
+def test_parallel_join_matches_serial():
+    rnd = random.Random(5)
+    targets = _points(rnd, 300)
+    members = _points(rnd, 2100)
+    assert spatial_join(members, targets, 3, workers=2, chunk=700) == spatial_join(members, targets, 3, workers=1)
+
+
+def _rows(entries):
+    rows = parse_txt_lines(io.StringIO(dump_text(entries)), BASE)
+    assign_ids(rows, NOW)
+    return rows
+
+
+def test_split_rows_alliance_and_horizon():
+    rows = _rows([
+        ("Me", "rlrs", 30, 0, 0, "5h"),
+        ("Open", "OTHER", 30, 5, 5, None),
+        ("Soon", "OTHER", 30, 6, 6, "20m"),
+        ("Later", "OTHER", 30, 7, 7, "9h"),
+    ])
+    members, targets = split_rows(rows, "RlRS", NOW, horizon_sec=3600)
+    assert [r["name"] for r in members] == ["Me"]
+    assert sorted(r["name"] for r in targets) == ["Open", "Soon"]
+
+
+def test_same_named_members_stay_separate(tmp_path):
+    rows = _rows([
+        ("Twin", "RlRS", 30, 10, 10, "5h"),
+        ("Twin", "RlRS", 28, 900, 900, "5h"),
+        ("Near A", "OTHER", 25, 12, 10, None),
+        ("Near B", "OTHER", 25, 905, 900, None),
+    ])
+    result = find_targets(rows, "RlRS", NOW, k=1, workers=1)
+    assert len(result) == 2
+    assert len({m["member"] for m in result}) == 2
+    by_pos = {(m["x"], m["y"]): m["targets"][0]["name"] for m in result}
+    assert by_pos == {(10, 10): "Near A", (900, 900): "Near B"}
+
+    path = tmp_path / "targets.json"
+    write_targets(result, str(path))
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert sorted(data) == sorted(m["member"] for m in result)
+    assert [v["name"] for v in data.values()] == ["Twin", "Twin"]
+
+    page = targets_page_data(result)
+    assert sorted(m[1] for m in page["members"]) == ["Twin (10, 10)", "Twin (900, 900)"]
+    assert len(page["targets"]) == 2
+
+    csv_path = tmp_path / "targets.csv"
+    write_targets(result, str(csv_path))
+    lines = csv_path.read_text(encoding="utf-8").splitlines()
+    assert lines[0].startswith("member_id,member,")
+    assert len(lines) == 3